@@ -1,140 +1,86 @@
-﻿from flask import Flask, render_template, request, redirect, url_for, session, flash, send_file, jsonify
+﻿from flask import Flask, render_template, request, redirect, url_for, session, flash, send_file, jsonify, Response
 import sqlite3
 import hashlib
+import hmac
 import os
-import requests
 import json
+import time
 from werkzeug.utils import secure_filename
-from translations import get_all_texts
+import translations
+import chat_sessions
+import metrics
+from database import get_db, close_db, write, write_call, writer, Lease
+from migrate import migrate
+from cache import LRUCache
+from catalog import catalog
+from page_cache import PageCache
+from youtube_client import YouTubeClient, YouTubeCache, DAILY_QUOTA
+from video_feed import CareerVideoFeed, PREFETCH_LEASE
+from video_index import VideoIndex
+from career_matcher import CareerMatcher
 
 # YouTube Data API Configuration
 YOUTUBE_API_KEY = os.environ.get('YOUTUBE_API_KEY', '')
-YOUTUBE_API_BASE_URL = 'https://www.googleapis.com/youtube/v3'
+YOUTUBE_API_BASE_URL = os.environ.get('YOUTUBE_API_BASE_URL', 'https://www.googleapis.com/youtube/v3')
 
-def search_youtube_videos(query, max_results=8):
-    """Search YouTube videos using the YouTube Data API"""
-    if not YOUTUBE_API_KEY:
-        return None  # Return None if no API key is configured
-    
-    try:
-        search_url = f"{YOUTUBE_API_BASE_URL}/search"
-        params = {
-            'part': 'snippet',
-            'q': query,
-            'type': 'video',
-            'maxResults': max_results,
-            'key': YOUTUBE_API_KEY
-        }
-        
-        response = requests.get(search_url, params=params, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            videos = []
-            
-            for item in data.get('items', []):
-                video_id = item['id']['videoId']
-                snippet = item['snippet']
-                
-                videos.append({
-                    'title': snippet['title'],
-                    'channel': snippet['channelTitle'],
-                    'video_id': video_id,
-                    'description': snippet.get('description', '')[:100],
-                    'thumbnail': snippet['thumbnails']['high']['url'] if 'high' in snippet['thumbnails'] else snippet['thumbnails']['medium']['url']
-                })
-            
-            return videos
-        else:
-            print(f"YouTube API Error: {response.status_code}")
-            return None
-            
-    except Exception as e:
-        print(f"YouTube API Error: {str(e)}")
-        return None
-
-def get_video_details(video_ids):
-    """Get detailed information about YouTube videos including duration"""
-    if not YOUTUBE_API_KEY or not video_ids:
-        return []
-    
-    try:
-        videos_url = f"{YOUTUBE_API_BASE_URL}/videos"
-        params = {
-            'part': 'contentDetails,snippet',
-            'id': ','.join(video_ids),
-            'key': YOUTUBE_API_KEY
-        }
-        
-        response = requests.get(videos_url, params=params, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            videos = []
-            
-            for item in data.get('items', []):
-                snippet = item['snippet']
-                content = item['contentDetails']
-                
-                # Parse ISO 8601 duration
-                duration_iso = content.get('duration', 'PT0M0S')
-                duration = parse_youtube_duration(duration_iso)
-                
-                videos.append({
-                    'title': snippet['title'],
-                    'channel': snippet['channelTitle'],
-                    'video_id': item['id'],
-                    'duration': duration,
-                    'link': f"https://www.youtube.com/watch?v={item['id']}"
-                })
-            
-            return videos
-        else:
-            return []
-            
-    except Exception as e:
-        print(f"YouTube API Error: {str(e)}")
-        return []
-
-def parse_youtube_duration(iso_duration):
-    """Parse YouTube ISO 8601 duration to human readable format"""
-    import re
-    
-    match = re.match(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?', iso_duration)
-    if not match:
-        return '0:00'
-    
-    hours, minutes, seconds = match.groups()
-    hours = int(hours) if hours else 0
-    minutes = int(minutes) if minutes else 0
-    seconds = int(seconds) if seconds else 0
-    
-    if hours > 0:
-        return f"{hours}:{minutes:02d}:{seconds:02d}"
-    else:
-        return f"{minutes}:{seconds:02d}"
+# Pooled, retrying client with a persistent result cache and quota ledger
+youtube = YouTubeClient(YOUTUBE_API_KEY, base_url=YOUTUBE_API_BASE_URL, cache=YouTubeCache(),
+                        daily_quota=int(os.environ.get('YOUTUBE_DAILY_QUOTA', DAILY_QUOTA)))
 
 app = Flask(__name__)
 app.secret_key = 'career_guidance_secret_key_2024'
 app.config['UPLOAD_FOLDER'] = 'static/uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max
 
+# Chatbot retrieval settings
+app.config['CHAT_MIN_SCORE'] = float(os.environ.get('CHAT_MIN_SCORE', '0.05'))  # min TF-IDF cosine to use a match
+app.config['CHAT_TOP_K'] = int(os.environ.get('CHAT_TOP_K', '3'))  # candidates reported per query
+app.config['CHAT_CACHE_SIZE'] = int(os.environ.get('CHAT_CACHE_SIZE', '2048'))  # cached chatbot answers
+app.config['CHAT_CACHE_TTL'] = int(os.environ.get('CHAT_CACHE_TTL', '3600'))  # seconds
+app.config['CHAT_STREAM_CHUNK'] = int(os.environ.get('CHAT_STREAM_CHUNK', '512'))  # characters per streamed event
+app.config['CHAT_PAGE_SIZE'] = int(os.environ.get('CHAT_PAGE_SIZE', '30'))  # chat history rows per page
+app.config['CHAT_WARMUP'] = os.environ.get('CHAT_WARMUP', '1') == '1'  # load the TF-IDF model in the background
+
+# Full-page cache for pages that only vary by language
+app.config['PAGE_CACHE_SIZE'] = int(os.environ.get('PAGE_CACHE_SIZE', '256'))  # cached rendered pages
+app.config['MENTORS_PAGE_TTL'] = int(os.environ.get('MENTORS_PAGE_TTL', '60'))  # seconds; mentors come from the database
+
+# Videos per page from /api/recommend-videos
+app.config['RECOMMEND_PAGE_SIZE'] = int(os.environ.get('RECOMMEND_PAGE_SIZE', '12'))
+
+# Keep each career's YouTube videos warm in the background (needs an API key)
+app.config['VIDEO_PREFETCH'] = os.environ.get('VIDEO_PREFETCH', '1') == '1'
+# Seconds /courses may wait for YouTube videos that aren't cached yet; all its searches share this
+app.config['COURSES_VIDEO_TIMEOUT'] = float(os.environ.get('COURSES_VIDEO_TIMEOUT', '2'))
+
+# Request metrics at /metrics, for logged-in admins and for scrapers sending
+# "Authorization: Bearer <token>"; with no token set only admins can read them
+app.config['METRICS_TOKEN'] = os.environ.get('METRICS_TOKEN', '')
+
+# Return pooled database connections when each request/app context ends
+app.teardown_appcontext(close_db)
+
+# Per-endpoint latency, SQL per request and template render times
+metrics.init_app(app)
+
 # Language context processor - makes translations available to all templates
 @app.context_processor
 def inject_translations():
     lang = session.get('lang', 'en')
-    return dict(t=get_all_texts(lang), current_lang=lang)
+    return dict(t=translations.get_all_texts(lang), current_lang=lang)
 
 # Language switching route
 @app.route('/set_language/<lang>')
 def set_language(lang):
-    if lang in ['en', 'mr', 'hi']:
+    if lang in translations.languages():
         session['lang'] = lang
     else:
         session['lang'] = 'en'
     # Redirect back to the previous page
     return redirect(request.referrer or url_for('index'))
 
+page_cache = PageCache(maxsize=app.config['PAGE_CACHE_SIZE'])
+
 # Create uploads directory if not exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
@@ -143,90 +89,12 @@ ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-# Database setup
+# Database setup - the schema is defined by the versioned files in
+# migrations/ and applied with `python migrate.py` at deploy time. Running
+# it here as well keeps `python app.py` working on a fresh checkout; it is a
+# single SELECT once the schema is current.
 def init_db():
-    conn = sqlite3.connect('database.db')
-    c = conn.cursor()
-    c.execute('''CREATE TABLE IF NOT EXISTS users 
-                (id INTEGER PRIMARY KEY AUTOINCREMENT, 
-                 name TEXT NOT NULL, 
-                 email TEXT UNIQUE NOT NULL, 
-                 password TEXT NOT NULL)''')
-    c.execute('''CREATE TABLE IF NOT EXISTS results 
-                (id INTEGER PRIMARY KEY AUTOINCREMENT, 
-                 user_id INTEGER, 
-                 career TEXT, 
-                 skills TEXT, 
-                 courses TEXT, 
-                 salary TEXT, 
-                 future_scope TEXT,
-                 FOREIGN KEY(user_id) REFERENCES users(id))''')
-    
-    # Create resumes table with photo column
-    c.execute('''CREATE TABLE IF NOT EXISTS resumes 
-                (id INTEGER PRIMARY KEY AUTOINCREMENT, 
-                 user_id INTEGER, 
-                 resume_data TEXT, 
-                 career_target TEXT,
-                 photo TEXT,
-                 FOREIGN KEY(user_id) REFERENCES users(id))''')
-    
-    # Add photo column if it doesn't exist (for existing databases)
-    try:
-        c.execute("ALTER TABLE resumes ADD COLUMN photo TEXT")
-    except:
-        pass  # Column already exists
-    
-    # Create admins table for admin login
-    c.execute('''CREATE TABLE IF NOT EXISTS admins 
-                (id INTEGER PRIMARY KEY AUTOINCREMENT, 
-                 username TEXT UNIQUE NOT NULL, 
-                 password TEXT NOT NULL)''')
-    
-    # Create mentors table
-    c.execute('''CREATE TABLE IF NOT EXISTS mentors
-                (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                 name TEXT NOT NULL,
-                 expertise TEXT,
-                 available TEXT DEFAULT 'yes',
-                 contact TEXT)''')
-    
-    # Create certificates table
-    c.execute('''CREATE TABLE IF NOT EXISTS certificates
-                (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                 user_id INTEGER,
-                 course_name TEXT,
-                 issue_date DATE,
-                 certificate_id TEXT)''')
-    
-    # Create progress table
-    c.execute('''CREATE TABLE IF NOT EXISTS progress
-                (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                 user_id INTEGER,
-                 course_name TEXT,
-                 completion_percentage INTEGER,
-                 date_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
-    
-    # Check if admin exists, if not create default admin
-    c.execute("SELECT COUNT(*) FROM admins")
-    if c.fetchone()[0] == 0:
-        # Create default admin (username: admin, password: admin123)
-        default_password = hashlib.sha256('admin123'.encode()).hexdigest()
-        c.execute("INSERT INTO admins (username, password) VALUES (?, ?)", ('admin', default_password))
-    
-    # Add sample mentors if not exist
-    c.execute("SELECT COUNT(*) FROM mentors")
-    if c.fetchone()[0] == 0:
-        mentors_data = [
-            ('Dr. Priya Sharma', 'Career Counseling', 'yes', 'priya@carrerai.com'),
-            ('Prof. Rajesh Kumar', 'Engineering Admissions', 'yes', 'rajesh@carrerai.com'),
-            ('Ms. Anita Desai', 'Medical Career Guide', 'yes', 'anita@carrerai.com'),
-            ('Mr. Suresh Jadhav', 'MPSC/UPSC Expert', 'yes', 'suresh@carrerai.com'),
-        ]
-        c.executemany('INSERT INTO mentors (name, expertise, available, contact) VALUES (?, ?, ?, ?)', mentors_data)
-    
-    conn.commit()
-    conn.close()
+    migrate()
 
 # Initialize database on startup
 init_db()
@@ -355,6 +223,16 @@ CAREER_DATA = {
     }
 }
 
+# Career shown on /courses to visitors without a test result
+DEFAULT_COURSES_CAREER = "Software Developer"
+
+# YouTube videos per career for /courses: served from cache, refreshed in
+# the background, so the page never waits on the YouTube API. Every worker
+# runs the scheduler, but only the holder of the lease prefetches.
+career_videos = CareerVideoFeed(
+    youtube, lambda: sorted({info['career'] for info in CAREER_DATA.values()} | {DEFAULT_COURSES_CAREER}),
+    lease=Lease('video-prefetch', PREFETCH_LEASE))
+
 # Career responses in different languages
 CAREER_RESPONSES = {
     'en': {
@@ -523,45 +401,91 @@ Year 2: Optional + Current Affairs, Answer writing
 
 # Import Knowledge Base
 from knowledge_base import KNOWLEDGE_BASE, analyze_conflict
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
-
-# Initialize TF-IDF vectorizer for ML-based matching
-vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1, 2))
-knowledge_texts = []
-knowledge_keys = []
-
-# Build knowledge base for ML matching
-for key, data in KNOWLEDGE_BASE.items():
-    keywords_text = ' '.join(data.get('keywords', []))
-    response_text = data.get('en', '')[:500]  # Use first 500 chars
-    combined = keywords_text + ' ' + response_text
-    knowledge_texts.append(combined)
-    knowledge_keys.append(key)
-
-# Fit vectorizer
-if knowledge_texts:
-    tfidf_matrix = vectorizer.fit_transform(knowledge_texts)
-
-# Smart response using TF-IDF
-def smart_response(user_message, language='en'):
-    """ML-based response matching using TF-IDF"""
-    user_vec = vectorizer.transform([user_message])
-    similarities = cosine_similarity(user_vec, tfidf_matrix)[0]
-    
-    # Get best match
-    best_idx = np.argmax(similarities)
-    best_score = similarities[best_idx]
-    
-    if best_score > 0.05:  # Lower threshold for better matching
-        best_key = knowledge_keys[best_idx]
-        data = KNOWLEDGE_BASE.get(best_key, {})
-        return data.get(language, data.get('en', ''))
-    
-    # Default response - handle general questions
-    default_responses = {
-        'en': """<h3>🤖 I'm here to help with career guidance!</h3>
+from keyword_matcher import KeywordMatcher
+from language_detect import detect_language
+import tfidf_model
+
+# Keyword matcher over every knowledge base entry, built once at import
+keyword_matcher = KeywordMatcher.from_knowledge_base(KNOWLEDGE_BASE)
+
+# Answers to recently asked questions, keyed by (normalized message, language)
+chat_cache = LRUCache(maxsize=app.config['CHAT_CACHE_SIZE'], ttl=app.config['CHAT_CACHE_TTL'])
+
+# TF-IDF model for ML-based matching. It is loaded from the prebuilt
+# artifact (python tfidf_model.py) on first use, or fitted if none matches.
+# Importing the app stays cheap; the worker's first request starts a
+# background warm-up so the model is usually ready before the first chat.
+_warmup_started = False
+
+@app.before_request
+def start_chat_warmup():
+    global _warmup_started
+    if not _warmup_started:
+        _warmup_started = True
+        if app.config['CHAT_WARMUP']:
+            tfidf_model.warm_up(KNOWLEDGE_BASE)
+
+@app.before_request
+def start_video_prefetch():
+    if app.config['VIDEO_PREFETCH']:
+        career_videos.start()  # no-op once the scheduler is running
+
+@metrics.register_collector
+def collect_queue_and_cache_metrics():
+    """Database writer and cache counters for /metrics"""
+    writes = writer.stats()
+    collected = [
+        ('app_db_writes_total', 'counter', 'Database writer jobs by outcome',
+         [({'outcome': 'committed'}, writes['committed']), ({'outcome': 'failed'}, writes['failed'])]),
+        ('app_db_writes_pending', 'gauge', 'Jobs waiting for the database writer', [({}, writes['pending'])]),
+    ]
+    for name, cache in (('chat', chat_cache), ('page', page_cache)):
+        stats = cache.stats()
+        collected.append((f'app_{name}_cache_requests_total', 'counter', f'{name.title()} cache lookups by result',
+                          [({'result': 'hit'}, stats['hits']), ({'result': 'miss'}, stats['misses'])]))
+    videos = youtube.stats()
+    collected += [
+        ('app_youtube_api_calls_total', 'counter', 'YouTube API calls by outcome',
+         [({'outcome': 'ok'}, videos['api_calls'] - videos['api_errors']), ({'outcome': 'error'}, videos['api_errors']),
+          ({'outcome': 'refused_quota'}, videos['quota_refusals'])]),
+        ('app_youtube_cache_requests_total', 'counter', 'YouTube result cache lookups by result',
+         [({'result': 'hit'}, videos['cache_hits']), ({'result': 'miss'}, videos['cache_misses'])]),
+        ('app_youtube_quota_units', 'gauge', 'YouTube API quota units spent today (Pacific time)',
+         [({}, videos['quota_used_today'])]),
+    ]
+    feed = career_videos.stats()
+    collected.append(('app_career_videos_requests_total', 'counter', 'Career video lists served, by cache state',
+                      [({'state': state}, feed[state]) for state in ('fresh', 'stale', 'missing')]))
+    collected.append(('app_career_videos_prefetch_total', 'counter',
+                      'Scheduled prefetch runs, by whether this process held the lease',
+                      [({'lease': 'held'}, feed['prefetch_runs']), ({'lease': 'elsewhere'}, feed['prefetch_skipped'])]))
+    return collected
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus scrape target (admins, or scrapers with METRICS_TOKEN)"""
+    token = app.config['METRICS_TOKEN']
+    authorized = 'admin_id' in session or (
+        token and hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'))
+    if not authorized:
+        return 'Unauthorized\n', 401
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/healthz')
+def healthz():
+    """Liveness probe; answers before the chat model has finished loading"""
+    return jsonify({'status': 'ok', 'chat_model_loaded': tfidf_model.is_loaded(),
+                    'pending_writes': writer.stats()['pending']})
+
+# Largest number of messages accepted by /api/chat/batch
+CHAT_BATCH_LIMIT = 500
+
+# URL key used for the default (no match) answer in /api/answer/<key>
+DEFAULT_ANSWER_KEY = '_default'
+
+# Default response - handle general questions
+DEFAULT_RESPONSES = {
+    'en': """<h3>🤖 I'm here to help with career guidance!</h3>
 
 I can answer questions about:
 
@@ -586,7 +510,7 @@ Just ask me anything! Examples:
 • How to prepare for UPSC?
 • Salary of software engineer
 • Best colleges for MBA""",        
-        'mr': """<h3>🤖 मी करिअर मार्गदर्शनासाठी मदत करायला आलो आहे!</h3>
+    'mr': """<h3>🤖 मी करिअर मार्गदर्शनासाठी मदत करायला आलो आहे!</h3>
 
 मी खालील विषयाबद्दल उत्तर देऊ शकतो:
 
@@ -601,8 +525,8 @@ Just ask me anything! Examples:
 <b>🎓 महाविद्यालये:</b> Top colleges, Fees
 
 फक्त विचारा!""",
-        
-        'hi': """<h3>🤖 Main career guidance ke liye yahan hoon!</h3>
+    
+    'hi': """<h3>🤖 Main career guidance ke liye yahan hoon!</h3>
 
 Main in topics ke baare mein bata sakta hoon:
 
@@ -613,60 +537,59 @@ Main in topics ke baare mein bata sakta hoon:
 <b>Colleges:</b> Top institutes
 
 Bas poochho!"""
-    }
-    return default_responses.get(language, default_responses['en'])
-
-# Language detection function for Marathi/Hindi/English
-def detect_language(text):
-    """Detect if the user message is in Marathi, Hindi, or English"""
-    if not text:
-        return 'en'
-    
-    text = text.strip()
-    
-    # Marathi characters (Devanagari script for Marathi)
-    # Marathi specific: ०-९ (Marathi digits), क-ह (basic), ् (virama), etc.
-    marathi_chars = len([c for c in text if '\u0900' <= c <= '\u097F'])
-    
-    # Check for Marathi-specific characters and common Marathi words
-    marathi_indicators = ['आहे', 'आहेत', 'मी', 'तू', 'का', 'कसा', 'काय', 'शी', 'ला', 'मध्ये', 
-                         'वर', 'खाली', 'पासून', 'पर्यंत', 'हा', 'हे', 'ती', 'ते', 'कोण',
-                         'कुठे', 'किती', 'केव्हा', 'मग', 'पण', 'किंवा', 'आणि', 'नाही',
-                         'असे', 'अशी', 'जसे', 'जसा', 'करू', 'होऊ', 'द्यावे', 'घ्यावे',
-                         'बाबत', 'संबंधी', 'कारण', 'साठी', 'नंतर', 'आधी', 'वेळेला']
-    
-    # Hindi common words
-    hindi_indicators = ['है', 'हैं', 'मैं', 'तू', 'क्या', 'कैसा', 'कौन', 'कहाँ', 'कितना', 
-                       'कब', 'फिर', 'लेकिन', 'या', 'और', 'नहीं', 'इस', 'उस', 'जो', 'वो',
-                       'होगा', 'करूंगा', 'दूंगा', 'लेना', 'देना', 'के लिए', 'में', 'पर',
-                       'से', 'तक', 'बाद', 'पहले', 'समय']
-    
-    # Calculate Marathi score
-    marathi_score = 0
-    for word in marathi_indicators:
-        if word in text:
-            marathi_score += 1
-    marathi_score += marathi_chars // 3  # Weight for Devanagari characters
-    
-    # Calculate Hindi score
-    hindi_score = 0
-    for word in hindi_indicators:
-        if word in text:
-            hindi_score += 1
-    hindi_score += marathi_chars // 4  # Some overlap with Devanagari
-    
-    # Decision logic
-    if marathi_score > hindi_score and marathi_score > 0:
-        return 'mr'
-    elif hindi_score > marathi_score and hindi_score > 0:
-        return 'hi'
-    elif marathi_chars > len(text) * 0.3:  # More than 30% Devanagari
-        return 'mr'
-    else:
-        return 'en'
+}
 
-# Mock AI responses for career guidance
-def get_career_response(user_message, language='en'):
+def answer_html(key, language='en'):
+    """Answer text for a knowledge base key (None gives the default answer)"""
+    if key is None:
+        return DEFAULT_RESPONSES.get(language, DEFAULT_RESPONSES['en'])
+    data = KNOWLEDGE_BASE.get(key, {})
+    return data.get(language, data.get('en', ''))
+
+def answer_etag(html):
+    """Strong validator for an answer body"""
+    return hashlib.sha1(html.encode('utf-8')).hexdigest()
+
+def tfidf_candidates(messages, k=1):
+    """Top-k TF-IDF matches per message as [{'key', 'score'}] lists"""
+    model = tfidf_model.get_model(KNOWLEDGE_BASE)
+    indices, scores = model.top_k(messages, k)
+    return [[{'key': model.keys[i], 'score': round(score, 4)} for i, score in zip(row, row_scores)]
+            for row, row_scores in zip(indices.tolist(), scores.tolist())]
+
+# Smart response using TF-IDF
+def smart_response(user_message, language='en'):
+    """ML-based response matching using TF-IDF"""
+    best = tfidf_candidates([user_message])[0][0]
+    if best['score'] > app.config['CHAT_MIN_SCORE']:
+        return answer_html(best['key'], language)
+    return answer_html(None, language)
+
+def smart_response_batch(messages, language='en', k=3):
+    """Score many messages at once; returns top-k matches per message"""
+    if not messages:
+        return []
+    
+    results = []
+    for message, matches in zip(messages, tfidf_candidates(messages, k)):
+        response = None
+        if matches[0]['score'] > app.config['CHAT_MIN_SCORE']:
+            response = answer_html(matches[0]['key'], language)
+        results.append({'message': message, 'matches': matches, 'response': response})
+    return results
+
+# Chatbot retrieval pipeline: keyword match, then TF-IDF, then default answer
+def retrieve(user_message, language='en', k=None):
+    """Pick an answer and report how it was chosen
+    
+    Returns a dict with the chosen knowledge key (None for the default
+    answer), the stage that decided it ('keyword', 'tfidf' or 'default'),
+    the top-k TF-IDF candidates with cosine scores, per-stage timings in
+    milliseconds, the language used and the answer HTML.
+    """
+    k = k or app.config['CHAT_TOP_K']
+    timings = {}
+    started = time.perf_counter()
     user_message = user_message.lower()
     
     # Auto-detect language if not provided or if user wants auto-detection
@@ -674,18 +597,59 @@ def get_career_response(user_message, language='en'):
         detected_lang = detect_language(user_message)
         if detected_lang != 'en':
             language = detected_lang
+    timings['detect_language'] = (time.perf_counter() - started) * 1000
+    
+    # First, try exact keyword match (earliest knowledge base entry wins)
+    stage_start = time.perf_counter()
+    key = keyword_matcher.match(user_message)
+    timings['keyword'] = (time.perf_counter() - stage_start) * 1000
     
-    # Get responses for selected language
-    responses = KNOWLEDGE_BASE.copy()
+    if key is not None:
+        stage = 'keyword'
+        candidates = [{'key': key, 'score': None}]
+    else:
+        # Try TF-IDF semantic matching
+        stage_start = time.perf_counter()
+        candidates = tfidf_candidates([user_message], k)[0]
+        timings['tfidf'] = (time.perf_counter() - stage_start) * 1000
+        if candidates[0]['score'] > app.config['CHAT_MIN_SCORE']:
+            stage = 'tfidf'
+            key = candidates[0]['key']
+        else:
+            stage = 'default'
+    
+    timings['total'] = (time.perf_counter() - started) * 1000
+    return {
+        'key': key,
+        'stage': stage,
+        'candidates': candidates,
+        'language': language,
+        'timing_ms': {name: round(ms, 3) for name, ms in timings.items()},
+        'response': answer_html(key, language),
+    }
+
+def normalize_message(text):
+    """Lowercase and collapse whitespace so equivalent questions share a cache entry"""
+    return ' '.join(text.lower().split())
+
+def cached_retrieve(user_message, language='en'):
+    """retrieve() behind the chat response cache; adds a 'cached' flag"""
+    message = normalize_message(user_message)
+    cache_key = (message, language)
     
-    # First, try exact keyword match
-    for key, data in responses.items():
-        for keyword in data.get('keywords', []):
-            if keyword in user_message:
-                return data.get(language, data.get('en', ''))
+    result = chat_cache.get(cache_key)
+    if result is not None:
+        return dict(result, cached=True)
     
-    # Try TF-IDF semantic matching
-    return smart_response(user_message, language)
+    result = retrieve(message, language)
+    chat_cache.set(cache_key, result)
+    for stage, ms in result['timing_ms'].items():
+        metrics.observe_stage(stage, ms / 1000)
+    return dict(result, cached=False)
+
+# Mock AI responses for career guidance
+def get_career_response(user_message, language='en'):
+    return cached_retrieve(user_message, language)['response']
 
 
 @app.route('/')
@@ -700,11 +664,10 @@ def login():
         email = request.form['email']
         password = hashlib.sha256(request.form['password'].encode()).hexdigest()
         
-        conn = sqlite3.connect('database.db')
+        conn = get_db()
         c = conn.cursor()
         c.execute("SELECT id, name FROM users WHERE email = ? AND password = ?", (email, password))
         user = c.fetchone()
-        conn.close()
         
         if user:
             session['user_id'] = user[0]
@@ -723,12 +686,8 @@ def register():
         password = hashlib.sha256(request.form['password'].encode()).hexdigest()
         
         try:
-            conn = sqlite3.connect('database.db')
-            c = conn.cursor()
-            c.execute("INSERT INTO users (name, email, password) VALUES (?, ?, ?)", 
-                     (name, email, password))
-            conn.commit()
-            conn.close()
+            write("INSERT INTO users (name, email, password) VALUES (?, ?, ?)", 
+                  (name, email, password))
             flash('Registration successful! Please login.', 'success')
             return redirect(url_for('login'))
         except sqlite3.IntegrityError:
@@ -833,13 +792,9 @@ def test():
         career_info = CAREER_DATA.get(result, CAREER_DATA['technology'])
         
         # Save result to database
-        conn = sqlite3.connect('database.db')
-        c = conn.cursor()
-        c.execute("INSERT INTO results (user_id, career, skills, courses, salary, future_scope) VALUES (?, ?, ?, ?, ?, ?)",
-                  (session['user_id'], career_info['career'], career_info['skills'], 
-                   career_info['courses'], career_info['salary'], career_info['future_scope']))
-        conn.commit()
-        conn.close()
+        write("INSERT INTO results (user_id, career, skills, courses, salary, future_scope) VALUES (?, ?, ?, ?, ?, ?)",
+              (session['user_id'], career_info['career'], career_info['skills'], 
+               career_info['courses'], career_info['salary'], career_info['future_scope']))
         
         return render_template('result.html', career=career_info['career'], 
                                skills=career_info['skills'], courses=career_info['courses'],
@@ -853,12 +808,11 @@ def result():
         return redirect(url_for('login'))
     
     # Get user's last result
-    conn = sqlite3.connect('database.db')
+    conn = get_db()
     c = conn.cursor()
     c.execute("SELECT career, skills, courses, salary, future_scope FROM results WHERE user_id = ? ORDER BY id DESC LIMIT 1",
               (session['user_id'],))
     result = c.fetchone()
-    conn.close()
     
     if result:
         # Find matching career data to get study plan
@@ -878,40 +832,79 @@ def chat():
     if 'user_id' not in session:
         return redirect(url_for('login'))
     
+    # Check for clear parameter: removes the sessions along with their messages
+    if request.args.get('clear') == 'true':
+        write_call(chat_sessions.clear_sessions, session['user_id'])
+        return redirect(url_for('chat'))
+    
     # Get chat history from database
     chat_history = []
     messages = []
     
-    conn = sqlite3.connect('database.db')
-    c = conn.cursor()
-    
-    # Check for clear parameter
-    if request.args.get('clear') == 'true':
-        c.execute('DELETE FROM chat_messages WHERE user_id = ?', (session['user_id'],))
-        conn.commit()
+    conn = get_db()
     
-    # Get chat sessions
+    # Sidebar: most recently active sessions, with their message counts
     try:
-        c.execute('SELECT id, title FROM chat_sessions WHERE user_id = ? ORDER BY id DESC LIMIT 10', (session['user_id'],))
-        chat_history = c.fetchall()
+        chat_history = chat_sessions.list_sessions(conn, session['user_id'])
     except:
         pass
     
-    # Get current chat messages
-    chat_id = request.args.get('chat_id')
+    # Get the latest page of the current chat; older pages load on scroll
+    chat_id = request.args.get('chat_id', type=int)
+    page = {'messages': [], 'has_more': False, 'next_before': None}
     if chat_id:
         try:
-            c.execute('SELECT message, response, created_at FROM chat_messages WHERE user_id = ? AND session_id = ? ORDER BY id ASC', (session['user_id'], chat_id))
-            rows = c.fetchall()
-            for row in rows:
-                messages.append({'type': 'user', 'text': row[0]})
-                messages.append({'type': 'bot', 'text': row[1]})
+            page = load_chat_page(conn, session['user_id'], chat_id)
+            for row in page['messages']:
+                messages.append({'type': 'user', 'text': row['message']})
+                messages.append({'type': 'bot', 'text': row['response']})
         except:
             pass
     
-    conn.close()
+    return render_template('chat.html', chat_history=chat_history, messages=messages, name=session['name'],
+                          chat_id=chat_id, has_more=page['has_more'], next_before=page['next_before'])
+
+def load_chat_page(conn, user_id, session_id, before=None, limit=None):
+    """One page of a chat session, oldest first, ending just before message id `before`
     
-    return render_template('chat.html', chat_history=chat_history, messages=messages, name=session['name'])
+    Keyset pagination on (user_id, session_id, id): every page is a bounded
+    index range scan, no matter how long the session's history is.
+    """
+    limit = limit or app.config['CHAT_PAGE_SIZE']
+    c = conn.cursor()
+    if before is None:
+        c.execute('SELECT id, message, response, created_at FROM chat_messages WHERE user_id = ? AND session_id = ? ORDER BY id DESC LIMIT ?',
+                 (user_id, session_id, limit + 1))
+    else:
+        c.execute('SELECT id, message, response, created_at FROM chat_messages WHERE user_id = ? AND session_id = ? AND id < ? ORDER BY id DESC LIMIT ?',
+                 (user_id, session_id, before, limit + 1))
+    rows = c.fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit][::-1]
+    return {
+        'messages': [{'id': r[0], 'message': r[1], 'response': r[2], 'created_at': r[3]} for r in rows],
+        'has_more': has_more,
+        'next_before': rows[0][0] if has_more else None,
+    }
+
+@app.route('/api/chat/<int:session_id>/messages')
+def chat_messages_page(session_id):
+    """Older messages of a chat session for infinite scroll (?before=<id>&limit=)"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Login required'}), 401
+    
+    before = request.args.get('before', type=int)
+    limit = min(max(request.args.get('limit', app.config['CHAT_PAGE_SIZE'], type=int), 1), 200)
+    return jsonify(load_chat_page(get_db(), session['user_id'], session_id, before, limit))
+
+@app.route('/api/chat/sessions', methods=['POST'])
+def new_chat_session():
+    """Start a new conversation; /get then takes its id as session_id"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Login required'}), 401
+    
+    session_id = write_call(chat_sessions.create_session, session['user_id'])
+    return jsonify({'session_id': session_id}), 201
 
 @app.route('/get', methods=['POST'])
 def get_chat_response():
@@ -920,39 +913,123 @@ def get_chat_response():
     
     user_message = request.form.get('message', '')
     language = request.form.get('language', 'en')
-    response = get_career_response(user_message, language)
+    # Without a session_id the message continues the most recent conversation
+    chat_id = request.form.get('session_id', type=int)
+    if chat_id is not None and not chat_sessions.session_exists(get_db(), session['user_id'], chat_id):
+        return jsonify({'error': 'Unknown chat session'}), 404
+    
+    result = cached_retrieve(user_message, language)
+    response = result['response']
+    
+    # Save chat to database without holding up the answer
+    save_chat_later(session['user_id'], chat_id, user_message, response)
+    
+    # JSON mode: clients that send Accept: application/json get the retrieval
+    # details. With omit_response=1 the answer body is left out and can be
+    # fetched (and cached by key) from answer_url instead.
+    if request.accept_mimetypes.best_match(['text/html', 'application/json']) == 'application/json':
+        payload = dict(result)
+        payload['answer_url'] = url_for('chat_answer', key=result['key'] or DEFAULT_ANSWER_KEY, lang=result['language'])
+        payload['answer_etag'] = answer_etag(response)
+        if request.form.get('omit_response') == '1':
+            payload.pop('response')
+        return jsonify(payload)
     
-    # Save chat to database
-    try:
-        conn = sqlite3.connect('database.db')
-        c = conn.cursor()
-        
-        # Create tables if not exist
-        c.execute('''CREATE TABLE IF NOT EXISTS chat_sessions 
-                     (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, title TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
-        c.execute('''CREATE TABLE IF NOT EXISTS chat_messages 
-                     (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, session_id INTEGER, message TEXT, response TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
-        
-        # Get or create chat session
-        c.execute('SELECT id FROM chat_sessions WHERE user_id = ? ORDER BY id DESC LIMIT 1', (session['user_id'],))
-        session_row = c.fetchone()
-        
-        if session_row:
-            session_id = session_row[0]
-        else:
-            c.execute('INSERT INTO chat_sessions (user_id, title) VALUES (?, ?)', (session['user_id'], user_message[:50]))
-            session_id = c.lastrowid
-        
-        # Save message and response
-        c.execute('INSERT INTO chat_messages (user_id, session_id, message, response) VALUES (?, ?, ?, ?)',
-                 (session['user_id'], session_id, user_message, response))
-        conn.commit()
-        conn.close()
-    except:
-        pass
+    return response
+
+def sse_event(data, event=None):
+    """One Server-Sent Events frame; data is JSON-encoded so it stays on one line"""
+    frame = f"event: {event}\n" if event else ''
+    return frame + f"data: {json.dumps(data)}\n\n"
+
+@app.route('/get/stream', methods=['POST'])
+def stream_chat_response():
+    """Like /get, but sends the answer as Server-Sent Events while it is written out
+    
+    Events: `meta` (key, language, cached, session_id), then unnamed events
+    each carrying the next chunk of the answer HTML, then `done`. The
+    exchange is saved once the stream has closed, so only POST is accepted
+    (read it with fetch() and the response body stream, not EventSource).
+    """
+    if 'user_id' not in session:
+        return jsonify({'error': 'Login required'}), 401
     
+    user_id = session['user_id']
+    user_message = request.form.get('message', '')
+    language = request.form.get('language', 'en')
+    chat_id = request.form.get('session_id', type=int)
+    if chat_id is not None and not chat_sessions.session_exists(get_db(), user_id, chat_id):
+        return jsonify({'error': 'Unknown chat session'}), 404
+    
+    result = cached_retrieve(user_message, language)
+    answer = result['response']
+    size = app.config['CHAT_STREAM_CHUNK']
+    
+    def events():
+        yield sse_event({'key': result['key'], 'language': result['language'],
+                         'cached': result['cached'], 'session_id': chat_id}, 'meta')
+        for start in range(0, len(answer), size):
+            yield sse_event(answer[start:start + size])
+        yield sse_event({'length': len(answer)}, 'done')
+    
+    response = Response(events(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # stop nginx holding the events back
+    response.call_on_close(lambda: save_chat_later(user_id, chat_id, user_message, answer))
     return response
 
+def save_chat_later(user_id, chat_id, user_message, response):
+    """Queue a chat exchange on the database writer and return without waiting
+    
+    The writer group-commits queued exchanges, and failures are counted in
+    writer.stats() (see /admin-db-writer) and logged, not raised.
+    """
+    queued_at = time.perf_counter()
+    
+    def saved(future):
+        metrics.observe_stage('persistence', time.perf_counter() - queued_at)
+        if future.exception() is not None:
+            print(f"Saving chat message failed: {future.exception()}")
+    
+    future = writer.submit_call(chat_sessions.add_message, user_id, chat_id, user_message, response)
+    future.add_done_callback(saved)
+    return future
+
+@app.route('/api/answer/<key>')
+def chat_answer(key):
+    """Cacheable answer HTML for one knowledge base entry"""
+    if key != DEFAULT_ANSWER_KEY and key not in KNOWLEDGE_BASE:
+        return jsonify({'error': 'Unknown answer key'}), 404
+    
+    lang = request.args.get('lang', 'en')
+    html = answer_html(None if key == DEFAULT_ANSWER_KEY else key, lang)
+    response = app.make_response(html)
+    response.set_etag(answer_etag(html))
+    response.cache_control.public = True
+    response.cache_control.max_age = 3600
+    return response.make_conditional(request)
+
+@app.route('/api/chat/batch', methods=['POST'])
+def chat_batch():
+    """Answer a batch of chatbot questions (e.g. an uploaded FAQ list)"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Login required'}), 401
+    
+    data = request.get_json(silent=True) or {}
+    messages = data.get('messages', [])
+    language = data.get('language', 'en')
+    k = data.get('k', 3)
+    
+    if not isinstance(messages, list) or not all(isinstance(m, str) for m in messages):
+        return jsonify({'error': 'messages must be a list of strings'}), 400
+    if len(messages) > CHAT_BATCH_LIMIT:
+        return jsonify({'error': f'At most {CHAT_BATCH_LIMIT} messages per batch'}), 400
+    # bool is an int subclass, so "k": true would otherwise pass as 1
+    if not isinstance(k, int) or isinstance(k, bool) or k < 1:
+        return jsonify({'error': 'k must be a positive integer'}), 400
+    
+    return jsonify({'results': smart_response_batch(messages, language, k)})
+
 @app.route('/logout')
 def logout():
     session.clear()
@@ -971,6 +1048,27 @@ CAREER_CATEGORIES = {
     'Marketing': ['marketing']
 }
 
+# Suggestion form interests and skills -> careers they point to
+CAREER_INTERESTS = {
+    'tech': ['technology', 'data', 'bca'],
+    'medical': ['biology', 'healthcare'],
+    'business': ['business', 'bcom', 'banking'],
+    'creative': ['drawing', 'singing', 'dancing'],
+    'science': ['science', 'technology'],
+    'teaching': ['teacher'],
+    'law': ['law'],
+    'marketing': ['marketing']
+}
+
+CAREER_SKILLS = {
+    'coding': ['technology', 'data', 'bca'],
+    'creative': ['drawing', 'singing', 'dancing'],
+    'communication': ['business', 'marketing', 'teacher'],
+    'analytical': ['data', 'science', 'business'],
+    'medical': ['biology', 'healthcare'],
+    'legal': ['law']
+}
+
 # Salary expectations mapping
 SALARY_EXPECTATIONS = {
     'low': ['teacher', 'drawing', 'ba'],
@@ -988,6 +1086,9 @@ DIFFICULTY_MAP = {
 
 # ==================== CAREER SUGGESTION ROUTES ====================
 
+# Career x answer weight matrix for the suggestion form (see career_matcher.py)
+career_matcher = CareerMatcher(CAREER_DATA, CAREER_INTERESTS, CAREER_SKILLS, SALARY_EXPECTATIONS, DIFFICULTY_MAP)
+
 @app.route('/career-suggestions', methods=['GET', 'POST'])
 def career_suggestions():
     """Smart Career Suggestion Feature - Most Important!"""
@@ -995,97 +1096,38 @@ def career_suggestions():
         return redirect(url_for('login'))
     
     suggestions = []
-    selected_interest = ''
-    selected_skills = ''
+    selected_interests = []
+    selected_skills = []
     selected_salary = ''
     selected_difficulty = ''
     
     if request.method == 'POST':
-        selected_interest = request.form.get('interest', '')
-        selected_skills = request.form.get('skills', '')
+        # Interests and skills are multi-select
+        selected_interests = request.form.getlist('interest')
+        selected_skills = request.form.getlist('skills')
         selected_salary = request.form.get('salary_expectation', '')
         selected_difficulty = request.form.get('difficulty', '')
         
-        # Calculate career scores based on preferences
-        career_scores = {}
+        # Score every career against the answers at once and keep the best five
+        matches = career_matcher.top(selected_interests, selected_skills, [selected_salary], [selected_difficulty])
         
-        for key, career in CAREER_DATA.items():
-            score = 0
-            
-            # Interest matching
-            if selected_interest:
-                interest_map = {
-                    'tech': ['technology', 'data', 'bca'],
-                    'medical': ['biology', 'healthcare'],
-                    'business': ['business', 'bcom', 'banking'],
-                    'creative': ['drawing', 'singing', 'dancing'],
-                    'science': ['science', 'technology'],
-                    'teaching': ['teacher'],
-                    'law': ['law'],
-                    'marketing': ['marketing']
-                }
-                if selected_interest in interest_map:
-                    if key in interest_map[selected_interest]:
-                        score += 5
-            
-            # Skills matching
-            if selected_skills:
-                skills_map = {
-                    'coding': ['technology', 'data', 'bca'],
-                    'creative': ['drawing', 'singing', 'dancing'],
-                    'communication': ['business', 'marketing', 'teacher'],
-                    'analytical': ['data', 'science', 'business'],
-                    'medical': ['biology', 'healthcare'],
-                    'legal': ['law']
-                }
-                if selected_skills in skills_map:
-                    if key in skills_map[selected_skills]:
-                        score += 4
-            
-            # Salary expectation matching
-            if selected_salary:
-                if selected_salary == 'low' and key in ['teacher', 'drawing', 'ba', 'beauty']:
-                    score += 3
-                elif selected_salary == 'medium' and key in ['business', 'marketing', 'bca', 'bcom', 'healthcare']:
-                    score += 3
-                elif selected_salary == 'high' and key in ['technology', 'data', 'biology', 'science']:
-                    score += 3
-            
-            # Difficulty matching
-            if selected_difficulty:
-                if selected_difficulty == 'easy' and key in ['teacher', 'drawing', 'marketing', 'beauty', 'ba']:
-                    score += 2
-                elif selected_difficulty == 'medium' and key in ['business', 'bca', 'bcom', 'healthcare', 'banking']:
-                    score += 2
-                elif selected_difficulty == 'hard' and key in ['technology', 'data', 'science', 'law', 'engineering']:
-                    score += 2
-                elif selected_difficulty == 'very_hard' and key in ['biology']:
-                    score += 2
-            
-            if score > 0:
-                career_scores[key] = score
-        
-        # Sort by score and get top suggestions
-        sorted_careers = sorted(career_scores.items(), key=lambda x: x[1], reverse=True)
-        
-        for career_key, score in sorted_careers[:5]:
+        for career_key, score in matches:
             career_info = CAREER_DATA[career_key].copy()
-            career_info['match_score'] = min(score * 10, 100)
+            career_info['match_score'] = min(int(score) * 10, 100)
             career_info['key'] = career_key
             suggestions.append(career_info)
         
         # If no suggestions based on filters, show all careers
         if not suggestions:
-            for key, career in CAREER_DATA.items():
+            for key, career in list(CAREER_DATA.items())[:5]:
                 career_info = career.copy()
                 career_info['match_score'] = 50
                 career_info['key'] = key
                 suggestions.append(career_info)
-            suggestions = suggestions[:5]
     
     return render_template('career_suggestions.html', 
                           suggestions=suggestions,
-                          selected_interest=selected_interest,
+                          selected_interests=selected_interests,
                           selected_skills=selected_skills,
                           selected_salary=selected_salary,
                           selected_difficulty=selected_difficulty)
@@ -1093,169 +1135,18 @@ def career_suggestions():
 # ==================== AFTER 10TH CAREER GUIDANCE ====================
 
 @app.route('/after-10th')
+@page_cache.cached()
 def after_10th():
     """Career guidance after 10th standard"""
-    # Career options after 10th
-    after_10th_options = [
-        {
-            'stream': 'Science ( विज्ञान )',
-            'icon': 'flask',
-            'description': 'Best for students interested in medical, engineering, and research fields',
-            'courses': [
-                {'name': 'Medical (PCB)', 'duration': '2 Years', 'after': 'MBBS, BAMS, BHMS, Nursing'},
-                {'name': 'Engineering (PCM)', 'duration': '2 Years', 'after': 'B.Tech, B.E., Diploma'},
-                {'name': 'Commerce with Maths', 'duration': '2 Years', 'after': 'B.Com, CA, BBA'},
-                {'name': 'Commerce without Maths', 'duration': '2 Years', 'after': 'B.Com, BBA, Banking'},
-                {'name': 'Arts/Humanities', 'duration': '2 Years', 'after': 'BA, Law, Journalism'},
-                {'name': 'Diploma in ITI', 'duration': '1-2 Years', 'after': 'Technical Jobs'},
-                {'name': 'Vocational Courses', 'duration': '1 Year', 'after': 'Skilled Jobs'},
-            ]
-        },
-        {
-            'stream': 'Commerce ( वाणिज्य )',
-            'icon': 'chart-line',
-            'description': 'For students interested in business, finance, and accounting',
-            'courses': [
-                {'name': 'Commerce with Mathematics', 'duration': '2 Years', 'after': 'CA, CS, B.Com (Hons)'},
-                {'name': 'Commerce without Mathematics', 'duration': '2 Years', 'after': 'B.Com, BBA, Banking'},
-                {'name': 'Commerce + Computer', 'duration': '2 Years', 'after': 'Tally, Accounting'},
-            ]
-        },
-        {
-            'stream': 'Arts ( कला )',
-            'icon': 'palette',
-            'description': 'For creative students interested in design, media, and humanities',
-            'courses': [
-                {'name': 'Arts with History', 'duration': '2 Years', 'after': 'BA History, Civil Services'},
-                {'name': 'Arts with Psychology', 'duration': '2 Years', 'after': 'Psychologist, Counselor'},
-                {'name': 'Arts with Economics', 'duration': '2 Years', 'after': 'Economist, Analyst'},
-                {'name': 'Fine Arts', 'duration': '2-4 Years', 'after': 'Artist, Designer'},
-                {'name': 'Fashion Design', 'duration': '2-4 Years', 'after': 'Fashion Designer'},
-            ]
-        },
-        {
-            'stream': 'Vocational ( व्यावसायिक )',
-            'icon': 'tools',
-            'description': 'Practical skills for immediate employment',
-            'courses': [
-                {'name': 'ITI - Electrician', 'duration': '2 Years', 'after': 'Electrician'},
-                {'name': 'ITI - Fitter', 'duration': '2 Years', 'after': 'Mechanic'},
-                {'name': 'ITI - Welder', 'duration': '1 Year', 'after': 'Welder'},
-                {'name': 'Polytechnic Diploma', 'duration': '3 Years', 'after': 'Engineer'},
-                {'name': 'Hospitality Management', 'duration': '1-2 Years', 'after': 'Hotel Jobs'},
-                {'name': 'Paramedical Courses', 'duration': '1-2 Years', 'after': 'Nurse, Technician'},
-            ]
-        }
-    ]
-    
-    return render_template('after_10th.html', options=after_10th_options)
+    return render_template('after_10th.html', options=catalog['after_10th'])
 
 # ==================== AFTER 12TH CAREER GUIDANCE ====================
 
 @app.route('/after-12th')
+@page_cache.cached()
 def after_12th():
     """Career guidance after 12th standard"""
-    # Career options after 12th
-    after_12th_options = [
-        {
-            'stream': 'Engineering ( अभियांत्रिकी )',
-            'icon': 'cogs',
-            'description': 'For students interested in technology and engineering',
-            'courses': [
-                {'name': 'B.Tech/B.E. in CSE', 'duration': '4 Years', 'salary': '3-20 LPA', 'jobs': 'Software Engineer, Developer'},
-                {'name': 'B.Tech in AI/ML', 'duration': '4 Years', 'salary': '4-25 LPA', 'jobs': 'AI Engineer, Data Scientist'},
-                {'name': 'B.Tech in Mechanical', 'duration': '4 Years', 'salary': '3-15 LPA', 'jobs': 'Mechanical Engineer'},
-                {'name': 'B.Tech in Civil', 'duration': '4 Years', 'salary': '3-12 LPA', 'jobs': 'Civil Engineer'},
-                {'name': 'B.Tech in Electrical', 'duration': '4 Years', 'salary': '3-15 LPA', 'jobs': 'Electrical Engineer'},
-                {'name': 'B.Tech in Electronics', 'duration': '4 Years', 'salary': '3-18 LPA', 'jobs': 'Electronics Engineer'},
-                {'name': 'B.Tech in Biotechnology', 'duration': '4 Years', 'salary': '3-12 LPA', 'jobs': 'Biotech Researcher'},
-                {'name': 'Diploma in Engineering', 'duration': '3 Years', 'salary': '2-8 LPA', 'jobs': 'Junior Engineer'},
-            ]
-        },
-        {
-            'stream': 'Medical ( वैद्यकीय )',
-            'icon': 'user-md',
-            'description': 'For students interested in healthcare and medicine',
-            'courses': [
-                {'name': 'MBBS', 'duration': '5.5 Years', 'salary': '5-30 LPA', 'jobs': 'Doctor, Surgeon'},
-                {'name': 'BAMS (Ayurvedic)', 'duration': '5.5 Years', 'salary': '3-15 LPA', 'jobs': 'Ayurvedic Doctor'},
-                {'name': 'BHMS (Homeopathy)', 'duration': '5.5 Years', 'salary': '3-12 LPA', 'jobs': 'Homeopathic Doctor'},
-                {'name': 'BDS (Dental)', 'duration': '5 Years', 'salary': '4-20 LPA', 'jobs': 'Dentist'},
-                {'name': 'B.Sc. Nursing', 'duration': '4 Years', 'salary': '3-10 LPA', 'jobs': 'Nurse, Healthcare'},
-                {'name': 'B.Pharma', 'duration': '4 Years', 'salary': '2-8 LPA', 'jobs': 'Pharmacist, Researcher'},
-                {'name': 'Paramedical Courses', 'duration': '2-4 Years', 'salary': '2-10 LPA', 'jobs': 'Technician, Therapist'},
-            ]
-        },
-        {
-            'stream': 'Commerce ( वाणिज्य )',
-            'icon': 'briefcase',
-            'description': 'For students interested in business and finance',
-            'courses': [
-                {'name': 'B.Com (Hons)', 'duration': '3 Years', 'salary': '3-12 LPA', 'jobs': 'Accountant, Analyst'},
-                {'name': 'BBA', 'duration': '3 Years', 'salary': '3-15 LPA', 'jobs': 'Manager, Entrepreneur'},
-                {'name': 'CA (Chartered Accountant)', 'duration': '4-5 Years', 'salary': '5-30 LPA', 'jobs': 'Chartered Accountant'},
-                {'name': 'CS (Company Secretary)', 'duration': '3-4 Years', 'salary': '4-20 LPA', 'jobs': 'Company Secretary'},
-                {'name': 'Banking & Insurance', 'duration': '3 Years', 'salary': '3-10 LPA', 'jobs': 'Bank Officer, PO'},
-                {'name': 'Actuarial Science', 'duration': '3-4 Years', 'salary': '5-25 LPA', 'jobs': 'Actuary'},
-            ]
-        },
-        {
-            'stream': 'Arts & Humanities ( कला व मानवविज्ञान )',
-            'icon': 'graduation-cap',
-            'description': 'For creative and socially inclined students',
-            'courses': [
-                {'name': 'BA in Economics', 'duration': '3 Years', 'salary': '3-12 LPA', 'jobs': 'Economist, Analyst'},
-                {'name': 'BA in Psychology', 'duration': '3 Years', 'salary': '3-10 LPA', 'jobs': 'Psychologist, Counselor'},
-                {'name': 'BA in Journalism', 'duration': '3 Years', 'salary': '3-15 LPA', 'jobs': 'Journalist, Reporter'},
-                {'name': 'LLB (Law)', 'duration': '3-5 Years', 'salary': '4-20 LPA', 'jobs': 'Lawyer, Advocate'},
-                {'name': 'Design (Fashion/Interior)', 'duration': '3-4 Years', 'salary': '3-15 LPA', 'jobs': 'Designer'},
-                {'name': 'Film & Media', 'duration': '3-4 Years', 'salary': '3-18 LPA', 'jobs': 'Filmmaker, Editor'},
-                {'name': 'Hotel Management', 'duration': '3-4 Years', 'salary': '3-12 LPA', 'jobs': 'Hotel Manager'},
-            ]
-        },
-        {
-            'stream': 'Science ( विज्ञान )',
-            'icon': 'flask',
-            'description': 'For students interested in pure sciences and research',
-            'courses': [
-                {'name': 'B.Sc. in Physics', 'duration': '3 Years', 'salary': '3-10 LPA', 'jobs': 'Researcher, Teacher'},
-                {'name': 'B.Sc. in Chemistry', 'duration': '3 Years', 'salary': '3-10 LPA', 'jobs': 'Chemist, Researcher'},
-                {'name': 'B.Sc. in Mathematics', 'duration': '3 Years', 'salary': '3-12 LPA', 'jobs': 'Analyst, Teacher'},
-                {'name': 'B.Sc. in Biology', 'duration': '3 Years', 'salary': '3-10 LPA', 'jobs': 'Biologist, Researcher'},
-                {'name': 'B.Sc. in Computer Science', 'duration': '3 Years', 'salary': '3-15 LPA', 'jobs': 'Programmer, Developer'},
-                {'name': 'Data Science', 'duration': '3 Years', 'salary': '4-20 LPA', 'jobs': 'Data Scientist, Analyst'},
-                {'name': 'Research (M.Sc/PhD)', 'duration': '5-6 Years', 'salary': '3-15 LPA', 'jobs': 'Research Scientist'},
-            ]
-        },
-        {
-            'stream': 'Computer & IT ( संगणक )',
-            'icon': 'laptop-code',
-            'description': 'For students interested in software and IT',
-            'courses': [
-                {'name': 'BCA', 'duration': '3 Years', 'salary': '3-12 LPA', 'jobs': 'Software Developer'},
-                {'name': 'B.Sc. IT', 'duration': '3 Years', 'salary': '3-12 LPA', 'jobs': 'IT Professional'},
-                {'name': 'Web Development', 'duration': '6 Months-1 Year', 'salary': '2-10 LPA', 'jobs': 'Web Developer'},
-                {'name': 'App Development', 'duration': '6 Months-1 Year', 'salary': '3-12 LPA', 'jobs': 'App Developer'},
-                {'name': 'Cloud Computing', 'duration': '1 Year', 'salary': '4-15 LPA', 'jobs': 'Cloud Engineer'},
-                {'name': 'Cybersecurity', 'duration': '1 Year', 'salary': '4-18 LPA', 'jobs': 'Security Analyst'},
-            ]
-        },
-        {
-            'stream': 'Government Jobs ( सरकारी नोकरी )',
-            'icon': 'landmark',
-            'description': 'For students seeking stable government careers',
-            'courses': [
-                {'name': 'UPSC Civil Services', 'duration': '1-2 Years', 'salary': '5-30 LPA', 'jobs': 'IAS, IPS, IRS'},
-                {'name': 'SSC CGL', 'duration': '6 Months-1 Year', 'salary': '3-12 LPA', 'jobs': 'Govt Officer'},
-                {'name': 'State Police', 'duration': '1 Year', 'salary': '4-8 LPA', 'jobs': 'Police Officer'},
-                {'name': 'Banking (PO/Clerk)', 'duration': '6 Months-1 Year', 'salary': '4-10 LPA', 'jobs': 'Bank PO, Clerk'},
-                {'name': 'Teaching (TET/CTET)', 'duration': '6 Months-1 Year', 'salary': '3-8 LPA', 'jobs': 'Teacher'},
-                {'name': 'Railway Jobs', 'duration': '1 Year', 'salary': '4-10 LPA', 'jobs': 'Railway Officer'},
-            ]
-        }
-    ]
-    
-    return render_template('after_12th.html', options=after_12th_options)
+    return render_template('after_12th.html', options=catalog['after_12th'])
 
 # ==================== PARENT-STUDENT CONFLICT ANALYZER ====================
 
@@ -1291,23 +1182,10 @@ def feedback():
         feedback_text = request.form.get('feedback', '')
         rating = request.form.get('rating', '5')
         
-        conn = sqlite3.connect('database.db')
-        c = conn.cursor()
-        
-        try:
-            c.execute('INSERT INTO feedback (user_id, feedback_text, rating) VALUES (?, ?, ?)',
-                     (session['user_id'], feedback_text, rating))
-            conn.commit()
-            message = 'Thank you for your feedback!'
-        except:
-            # Create table if not exists
-            c.execute('CREATE TABLE IF NOT EXISTS feedback (id INTEGER PRIMARY KEY, user_id INTEGER, feedback_text TEXT, rating INTEGER, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)')
-            c.execute('INSERT INTO feedback (user_id, feedback_text, rating) VALUES (?, ?, ?)',
-                     (session['user_id'], feedback_text, rating))
-            conn.commit()
-            message = 'Thank you for your feedback!'
+        write('INSERT INTO feedback (user_id, feedback_text, rating) VALUES (?, ?, ?)',
+              (session['user_id'], feedback_text, rating))
+        message = 'Thank you for your feedback!'
         
-        conn.close()
     
     return render_template('feedback.html', message=message)
 
@@ -1338,6 +1216,7 @@ def career_details(career_key):
                           related_careers=related_careers[:3])
 
 @app.route('/browse-careers')
+@page_cache.cached(bypass=lambda: 'user_id' not in session)
 def browse_careers():
     """Browse all careers by category"""
     if 'user_id' not in session:
@@ -1356,7 +1235,7 @@ def admin_login():
         username = request.form.get('username', '')
         password = hashlib.sha256(request.form.get('password', '').encode()).hexdigest()
         
-        conn = sqlite3.connect('database.db')
+        conn = get_db()
         c = conn.cursor()
         try:
             c.execute("SELECT id, username FROM admins WHERE username = ? AND password = ?", (username, password))
@@ -1370,11 +1249,15 @@ def admin_login():
                 flash('Invalid admin credentials', 'error')
         except sqlite3.Error as e:
             flash(f'Database error: {str(e)}', 'error')
-        finally:
-            conn.close()
     
     return render_template('admin_login.html')
 
+def insert_admin(conn, username, hashed_password):
+    """Add an admin (run on the writer); returns the new id, or None if the username is taken"""
+    if conn.execute("SELECT id FROM admins WHERE username = ?", (username,)).fetchone():
+        return None
+    return conn.execute("INSERT INTO admins (username, password) VALUES (?, ?)", (username, hashed_password)).lastrowid
+
 @app.route('/admin-register', methods=['GET', 'POST'])
 def admin_register():
     """Admin Registration - Create new admin account"""
@@ -1398,25 +1281,16 @@ def admin_register():
         # Hash password
         hashed_password = hashlib.sha256(password.encode()).hexdigest()
         
-        conn = sqlite3.connect('database.db')
-        c = conn.cursor()
         try:
-            # Check if username already exists
-            c.execute("SELECT id FROM admins WHERE username = ?", (username,))
-            if c.fetchone():
+            # Check and insert in one writer job, so two registrations can't both pass the check
+            if write_call(insert_admin, username, hashed_password) is None:
                 flash('Username already exists', 'error')
                 return render_template('admin_register.html')
             
-            # Insert new admin
-            c.execute("INSERT INTO admins (username, password) VALUES (?, ?)", (username, hashed_password))
-            conn.commit()
-            
             flash('Admin registered successfully! Please login.', 'success')
             return redirect(url_for('admin_login'))
-        except sqlite3.Error as e:
+        except (sqlite3.Error, TimeoutError) as e:
             flash(f'Database error: {str(e)}', 'error')
-        finally:
-            conn.close()
     
     return render_template('admin_register.html')
 
@@ -1426,7 +1300,7 @@ def admin_dashboard():
     if 'admin_id' not in session:
         return redirect(url_for('admin_login'))
     
-    conn = sqlite3.connect('database.db')
+    conn = get_db()
     c = conn.cursor()
     
     # Get all users
@@ -1449,14 +1323,14 @@ def admin_dashboard():
     c.execute("SELECT id, name, email FROM users ORDER BY id DESC LIMIT 10")
     recent_users = c.fetchall()
     
-    conn.close()
     
     return render_template('admin_dashboard.html',
                           users=users,
                           total_users=total_users,
                           total_results=total_results,
                           career_stats=career_stats,
-                          recent_users=recent_users)
+                          recent_users=recent_users,
+                          slowest_endpoints=metrics.slowest_endpoints())
 
 @app.route('/admin-users')
 def admin_users():
@@ -1464,7 +1338,7 @@ def admin_users():
     if 'admin_id' not in session:
         return redirect(url_for('admin_login'))
     
-    conn = sqlite3.connect('database.db')
+    conn = get_db()
     c = conn.cursor()
     
     # Get all users with their results - just basic columns
@@ -1477,7 +1351,6 @@ def admin_users():
     """)
     users = c.fetchall()
     
-    conn.close()
     
     return render_template('admin_users.html', users=users)
 
@@ -1487,7 +1360,7 @@ def admin_user_details(user_id):
     if 'admin_id' not in session:
         return redirect(url_for('admin_login'))
     
-    conn = sqlite3.connect('database.db')
+    conn = get_db()
     c = conn.cursor()
     
     # Get user info
@@ -1526,7 +1399,6 @@ def admin_user_details(user_id):
     c.execute("SELECT overall_score, recommendation, date_taken FROM aptitude_tests WHERE user_id = ? ORDER BY id DESC", (user_id,))
     aptitude_tests = c.fetchall()
     
-    conn.close()
     
     # Format results for template
     user_results = []
@@ -1544,33 +1416,33 @@ def admin_user_details(user_id):
                           course_count=course_count,
                           user_results=user_results)
 
+def delete_user_data(conn, user_id):
+    """Delete a user's data from all related tables, then the user (run on the writer)"""
+    c = conn.cursor()
+    c.execute("DELETE FROM results WHERE user_id = ?", (user_id,))
+    c.execute("DELETE FROM personality_tests WHERE user_id = ?", (user_id,))
+    c.execute("DELETE FROM aptitude_tests WHERE user_id = ?", (user_id,))
+    c.execute("DELETE FROM progress WHERE user_id = ?", (user_id,))
+    c.execute("DELETE FROM user_courses WHERE user_id = ?", (user_id,))
+    c.execute("DELETE FROM certificates WHERE user_id = ?", (user_id,))
+    c.execute("DELETE FROM resumes WHERE user_id = ?", (user_id,))
+    c.execute("DELETE FROM mentor_sessions WHERE user_id = ?", (user_id,))
+    c.execute("DELETE FROM chat_history WHERE user_id = ?", (user_id,))
+    c.execute("DELETE FROM users WHERE id = ?", (user_id,))
+
 @app.route('/admin-delete-user/<int:user_id>')
 def admin_delete_user(user_id):
     """Delete a user - Admin only"""
     if 'admin_id' not in session:
         return redirect(url_for('admin_login'))
     
-    conn = sqlite3.connect('database.db')
-    c = conn.cursor()
-    
     try:
-        # Delete user's data from all related tables
-        c.execute("DELETE FROM results WHERE user_id = ?", (user_id,))
-        c.execute("DELETE FROM personality_tests WHERE user_id = ?", (user_id,))
-        c.execute("DELETE FROM aptitude_tests WHERE user_id = ?", (user_id,))
-        c.execute("DELETE FROM progress WHERE user_id = ?", (user_id,))
-        c.execute("DELETE FROM user_courses WHERE user_id = ?", (user_id,))
-        c.execute("DELETE FROM certificates WHERE user_id = ?", (user_id,))
-        c.execute("DELETE FROM resumes WHERE user_id = ?", (user_id,))
-        c.execute("DELETE FROM mentor_sessions WHERE user_id = ?", (user_id,))
-        c.execute("DELETE FROM chat_history WHERE user_id = ?", (user_id,))
-        c.execute("DELETE FROM users WHERE id = ?", (user_id,))
-        conn.commit()
+        # One writer job: the user and all their data go together or not at all
+        write_call(delete_user_data, user_id)
         flash('User deleted successfully', 'success')
     except Exception as e:
         flash(f'Error deleting user: {str(e)}', 'error')
     
-    conn.close()
     return redirect(url_for('admin_users'))
 
 @app.route('/admin-logout')
@@ -1599,6 +1471,7 @@ def admin_youtube_api():
                     f.write(youtube_api_key)
                 # Update the global variable
                 YOUTUBE_API_KEY = youtube_api_key
+                youtube.api_key = youtube_api_key
                 flash('YouTube API Key saved successfully!', 'success')
             except Exception as e:
                 flash(f'Error saving API key: {str(e)}', 'error')
@@ -1618,10 +1491,35 @@ def admin_youtube_api():
                         api_key_status = "Configured"
                     # Also update global variable
                     YOUTUBE_API_KEY = saved_key
+                    youtube.api_key = saved_key
         except:
             api_key_status = "Error reading config"
     
-    return render_template('admin_youtube_api.html', api_key_status=api_key_status)
+    return render_template('admin_youtube_api.html', api_key_status=api_key_status, youtube_stats=youtube.stats())
+
+@app.route('/admin-chat-cache')
+def admin_chat_cache():
+    """Chatbot response cache counters - Admin only"""
+    if 'admin_id' not in session:
+        return redirect(url_for('admin_login'))
+    
+    return jsonify(chat_cache.stats())
+
+@app.route('/admin-page-cache')
+def admin_page_cache():
+    """Full-page cache counters - Admin only"""
+    if 'admin_id' not in session:
+        return redirect(url_for('admin_login'))
+    
+    return jsonify(page_cache.stats())
+
+@app.route('/admin-db-writer')
+def admin_db_writer():
+    """Database writer queue counters (queued, committed, failed writes) - Admin only"""
+    if 'admin_id' not in session:
+        return redirect(url_for('admin_login'))
+    
+    return jsonify(writer.stats())
 
 @app.route('/admin-feedback')
 def admin_feedback():
@@ -1630,7 +1528,7 @@ def admin_feedback():
     if 'admin_id' not in session:
         return redirect(url_for('admin_login'))
     
-    conn = sqlite3.connect('database.db')
+    conn = get_db()
     c = conn.cursor()
     
     # Get all feedback with user names
@@ -1643,7 +1541,6 @@ def admin_feedback():
     except:
         feedback_list = []
     
-    conn.close()
     
     return render_template('admin_feedback.html', feedback_list=feedback_list)
 
@@ -1657,6 +1554,7 @@ def load_youtube_api_key():
                 key = f.read().strip()
                 if key:
                     YOUTUBE_API_KEY = key
+                    youtube.api_key = key
                     print(f"YouTube API Key loaded successfully")
         except:
             pass
@@ -1712,12 +1610,8 @@ def personality_test():
             suitable_careers = "Business, Marketing, Management, Teaching, Healthcare"
         
         # Save to database
-        conn = sqlite3.connect('database.db')
-        c = conn.cursor()
-        c.execute("INSERT INTO personality_tests (user_id, personality_type, strengths, weaknesses, suitable_careers) VALUES (?, ?, ?, ?, ?)",
-                  (session['user_id'], personality_type, strengths, weaknesses, suitable_careers))
-        conn.commit()
-        conn.close()
+        write("INSERT INTO personality_tests (user_id, personality_type, strengths, weaknesses, suitable_careers) VALUES (?, ?, ?, ?, ?)",
+              (session['user_id'], personality_type, strengths, weaknesses, suitable_careers))
         
         return render_template('personality_result.html',
                               personality_type=personality_type,
@@ -1788,12 +1682,8 @@ def aptitude_test():
             recommendation = "Consider exploring careers based on your interests and passions rather than aptitude scores."
         
         # Save to database
-        conn = sqlite3.connect('database.db')
-        c = conn.cursor()
-        c.execute("INSERT INTO aptitude_tests (user_id, logical_score, verbal_score, numerical_score, overall_score, recommendation) VALUES (?, ?, ?, ?, ?, ?)",
-                  (session['user_id'], logical_score, verbal_score, numerical_score, overall_score, recommendation))
-        conn.commit()
-        conn.close()
+        write("INSERT INTO aptitude_tests (user_id, logical_score, verbal_score, numerical_score, overall_score, recommendation) VALUES (?, ?, ?, ?, ?, ?)",
+              (session['user_id'], logical_score, verbal_score, numerical_score, overall_score, recommendation))
         
         return render_template('aptitude_result.html',
                               logical_score=logical_score,
@@ -1805,14 +1695,14 @@ def aptitude_test():
     return render_template('aptitude_test.html', questions=questions)
 
 @app.route('/mentors')
+@page_cache.cached(ttl=app.config['MENTORS_PAGE_TTL'])
 def mentors():
     """Mentor listing page"""
     # Removed login requirement - mentors should be publicly accessible
-    conn = sqlite3.connect('database.db')
+    conn = get_db()
     c = conn.cursor()
     c.execute("SELECT * FROM mentors WHERE available = 'yes'")
     mentors = c.fetchall()
-    conn.close()
     
     return render_template('mentors.html', mentors=mentors)
 
@@ -1820,7 +1710,7 @@ def mentors():
 def certificates():
     """User certificates"""
     # Removed login requirement - certificates page shows info to all users
-    conn = sqlite3.connect('database.db')
+    conn = get_db()
     c = conn.cursor()
     
     # Check if user is logged in
@@ -1830,7 +1720,6 @@ def certificates():
     else:
         certificates = []
     
-    conn.close()
     
     return render_template('certificates.html', certificates=certificates)
 
@@ -1840,7 +1729,7 @@ def progress():
     if 'user_id' not in session:
         return redirect(url_for('login'))
     
-    conn = sqlite3.connect('database.db')
+    conn = get_db()
     c = conn.cursor()
     
     # Get personality test result
@@ -1874,7 +1763,6 @@ def progress():
     except:
         progress_data = []
     
-    conn.close()
     
     return render_template('progress.html', 
                           progress=progress_data,
@@ -1921,12 +1809,8 @@ def resume_builder():
         career_target = request.form.get('career_target', '')
         
         # Save resume with photo filename
-        conn = sqlite3.connect('database.db')
-        c = conn.cursor()
-        c.execute("INSERT INTO resumes (user_id, resume_data, career_target, photo) VALUES (?, ?, ?, ?)",
-                  (session['user_id'], str(resume_data), career_target, photo_filename))
-        conn.commit()
-        conn.close()
+        write("INSERT INTO resumes (user_id, resume_data, career_target, photo) VALUES (?, ?, ?, ?)",
+              (session['user_id'], str(resume_data), career_target, photo_filename))
         
         flash('Resume saved successfully!', 'success')
         return redirect(url_for('resume_preview'))
@@ -1939,11 +1823,10 @@ def resume_preview():
     if 'user_id' not in session:
         return redirect(url_for('login'))
     
-    conn = sqlite3.connect('database.db')
+    conn = get_db()
     c = conn.cursor()
     c.execute("SELECT * FROM resumes WHERE user_id = ? ORDER BY id DESC LIMIT 1", (session['user_id'],))
     resume = c.fetchone()
-    conn.close()
     
     if resume:
         import ast
@@ -1961,42 +1844,21 @@ def salary_predict():
         return redirect(url_for('login'))
     
     # Get user's recommended career
-    conn = sqlite3.connect('database.db')
+    conn = get_db()
     c = conn.cursor()
     c.execute("SELECT career FROM results WHERE user_id = ? ORDER BY id DESC LIMIT 1", (session['user_id'],))
     result = c.fetchone()
     
     career = result[0] if result else "Software Developer"
     
-    # Detailed salary data for each career
-    salary_data = {
-        'entry': '₹3-5 LPA',
-        'mid': '₹8-15 LPA',
-        'senior': '₹20-40 LPA',
-        'growth_rate': '15-20% annually'
-    }
-    
     # Map career to detailed salary data
-    career_salary_map = {
-        'Software Developer': {'entry': '₹4-8 LPA', 'mid': '₹12-25 LPA', 'senior': '₹30-50+ LPA', 'growth_rate': '20-25% annually'},
-        'Graphic Designer': {'entry': '₹2-4 LPA', 'mid': '₹6-12 LPA', 'senior': '₹15-25 LPA', 'growth_rate': '12-18% annually'},
-        'Singer': {'entry': '₹2-5 LPA', 'mid': '₹8-15 LPA', 'senior': '₹20-50+ LPA', 'growth_rate': 'Variable'},
-        'Dancer': {'entry': '₹2-5 LPA', 'mid': '₹8-18 LPA', 'senior': '₹20-40+ LPA', 'growth_rate': '15-20% annually'},
-        'Doctor': {'entry': '₹6-12 LPA', 'mid': '₹15-30 LPA', 'senior': '₹40-100+ LPA', 'growth_rate': '18-25% annually'},
-        'Research Scientist': {'entry': '₹4-8 LPA', 'mid': '₹12-20 LPA', 'senior': '₹25-45 LPA', 'growth_rate': '12-18% annually'},
-        'Business Analyst': {'entry': '₹4-8 LPA', 'mid': '₹10-20 LPA', 'senior': '₹25-40 LPA', 'growth_rate': '15-20% annually'},
-        'Data Scientist': {'entry': '₹6-12 LPA', 'mid': '₹15-30 LPA', 'senior': '₹35-60+ LPA', 'growth_rate': '22-28% annually'},
-        'Digital Marketing Manager': {'entry': '₹3-6 LPA', 'mid': '₹8-15 LPA', 'senior': '₹20-35 LPA', 'growth_rate': '18-22% annually'},
-        'Healthcare Administrator': {'entry': '₹4-8 LPA', 'mid': '₹10-18 LPA', 'senior': '₹22-40 LPA', 'growth_rate': '14-18% annually'}
-    }
-    
-    for key, data in career_salary_map.items():
+    salaries = catalog['salaries']
+    salary_data = salaries['default']
+    for key, data in salaries['careers'].items():
         if key.lower() in career.lower():
             salary_data = data
             break
     
-    conn.close()
-    
     return render_template('salary_predict.html', career=career, salary_data=salary_data)
 
 # ==================== COLLEGES ROUTE ====================
@@ -2008,7 +1870,7 @@ def colleges():
         return redirect(url_for('login'))
     
     # Get user's recommended career
-    conn = sqlite3.connect('database.db')
+    conn = get_db()
     c = conn.cursor()
     c.execute("SELECT career FROM results WHERE user_id = ? ORDER BY id DESC LIMIT 1", (session['user_id'],))
     result = c.fetchone()
@@ -2016,59 +1878,14 @@ def colleges():
     career = result[0] if result else "Software Developer"
     
     # Colleges data for each career
-    colleges_map = {
-        'Software Developer': {
-            'colleges': ['IIT Bombay', 'IIT Delhi', 'IIT Bangalore', 'NIT Trichy', 'BITS Pilani', 'VIT Vellore', 'COEP Pune'],
-            'entrance_exams': 'JEE Main, JEE Advanced, BITSAT, VITEEE'
-        },
-        'Graphic Designer': {
-            'colleges': ['National Institute of Design', 'MIT Institute of Design', 'Pearl Academy', 'Shrishti School of Design', 'JD Institute'],
-            'entrance_exams': 'NID DAT, UCEED, NIFT'
-        },
-        'Singer': {
-            'colleges': ['Berklee College of Music', 'Bhatkhande Music Institute', 'Shankar Mahadevan Academy', 'KM Music Conservatory'],
-            'entrance_exams': 'Audition Based'
-        },
-        'Dancer': {
-            'colleges': ['Kalakshetra Foundation', 'National School of Drama', 'Pingal Khan Academy', 'Mudra Institute'],
-            'entrance_exams': 'Audition Based'
-        },
-        'Doctor': {
-            'colleges': ['AIIMS Delhi', 'PGIMER Chandigarh', 'CMC Vellore', 'SGPGI Lucknow', 'KEM Mumbai', 'Grant Medical College'],
-            'entrance_exams': 'NEET PG, NEET UG'
-        },
-        'Research Scientist': {
-            'colleges': ['IISc Bangalore', 'IIT Delhi', 'IIT Bombay', 'TIFR Mumbai', 'IACS Kolkata', 'IITs'],
-            'entrance_exams': 'JEE Advanced, GATE, JEST'
-        },
-        'Business Analyst': {
-            'colleges': ['IIM Ahmedabad', 'IIM Bangalore', 'IIM Calcutta', 'ISB Hyderabad', 'JBIMS Mumbai', 'SP Jain'],
-            'entrance_exams': 'CAT, XAT, GMAT'
-        },
-        'Data Scientist': {
-            'colleges': ['IIT Bombay', 'IIT Delhi', 'IIIT Bangalore', 'BITS Pilani', 'Great Lakes', 'UpGrad'],
-            'entrance_exams': 'GATE, GRE, CAT'
-        },
-        'Digital Marketing Manager': {
-            'colleges': ['Digital Marketing Institute', 'IIDE Mumbai', 'Manipal ProLearn', 'Simplilearn', 'UpGrad'],
-            'entrance_exams': 'No specific exam required'
-        },
-        'Healthcare Administrator': {
-            'colleges': ['AIIMS', 'IIM Ahmedabad (Healthcare)', 'TISS Mumbai', 'NIHFW', 'Apollo Hospitals Training'],
-            'entrance_exams': 'CAT, TISSNET'
-        }
-    }
-    
-    colleges_list = ['IIT Bombay', 'IIT Delhi', 'NIT Trichy', 'BITS Pilani']
-    entrance_exams = 'JEE Main, JEE Advanced'
-    
-    for key, data in colleges_map.items():
+    colleges_data = catalog['colleges']
+    selected = colleges_data['default']
+    for key, data in colleges_data['careers'].items():
         if key.lower() in career.lower():
-            colleges_list = data['colleges']
-            entrance_exams = data['entrance_exams']
+            selected = data
             break
-    
-    conn.close()
+    colleges_list = selected['colleges']
+    entrance_exams = selected['entrance_exams']
     
     return render_template('colleges.html', career=career, colleges=colleges_list, entrance_exams=entrance_exams)
 
@@ -2081,194 +1898,28 @@ def courses():
     
     # Get user's recommended career (if logged in)
     user_id = session.get('user_id')
-    user_career = "Software Developer"  # Default career
+    user_career = DEFAULT_COURSES_CAREER
     
     if user_id:
-        conn = sqlite3.connect('database.db')
+        conn = get_db()
         c = conn.cursor()
         c.execute("SELECT career FROM results WHERE user_id = ? ORDER BY id DESC LIMIT 1", (user_id,))
         result = c.fetchone()
         if result:
             user_career = result[0]
-        conn.close()
     else:
-        user_career = "Software Developer"
+        user_career = DEFAULT_COURSES_CAREER
     
     # Get selected category
     selected_category = request.args.get('category', 'all')
     
     # All courses and videos data with real YouTube video links
-    COURSES_DATA = {
-        'Technology': {
-            'courses': [
-                {'name': 'Python Programming Masterclass', 'provider': 'Great Learning', 'link': 'https://www.greatlearning.com/python-programming', 'duration': '12 hours', 'level': 'Beginner', 'video_id': 'hT_nqWdeWV4'},
-                {'name': 'Full Stack Web Development', 'provider': 'Scaler Academy', 'link': 'https://www.scaler.com/topics/full-stack-development/', 'duration': '6 months', 'level': 'Intermediate', 'video_id': 'qdkbKkBQnpA'},
-                {'name': 'Data Science with Python', 'provider': 'Simplilearn', 'link': 'https://www.simplilearn.com/data-scientist-master-certificate-training', 'duration': '11 months', 'level': 'Advanced', 'video_id': 'ua-CiDNNj30'},
-                {'name': 'Machine Learning A-Z', 'provider': 'Udemy', 'link': 'https://www.udemy.com/course/machinelearning/', 'duration': '44 hours', 'level': 'All Levels', 'video_id': '0UnQnYhT4L0'},
-                {'name': 'Cloud Computing Fundamentals', 'provider': 'AWS Training', 'link': 'https://aws.amazon.com/training/', 'duration': '20 hours', 'level': 'Beginner', 'video_id': 'SSo_EIwHSd4'},
-                {'name': 'Java Programming Complete', 'provider': 'Coursera', 'link': 'https://www.coursera.org/specializations/java-programming', 'duration': '6 months', 'level': 'Beginner', 'video_id': 'DKlT8-lCZj0'},
-            ],
-            'videos': [
-    {
-        'title': 'Python Tutorial for Beginners',
-        'channel': 'Programming with Mosh',
-        'video_id': 'hT_nqWdeWV4',
-        'duration': '1:30:00',
-        'link': 'https://www.youtube.com/watch?v=hT_nqWdeWV4'
-    },
-    {
-        'title': 'Web Development Full Course',
-        'channel': 'Programming with Mosh',
-        'video_id': 'qdkbKkBQnpA',
-        'duration': '2:00:00',
-        'link': 'https://www.youtube.com/watch?v=qdkbKkBQnpA'
-    },
-    {
-        'title': 'Data Science Complete Guide',
-        'channel': 'Krish Naik',
-        'video_id': 'ua-CiDNNj30',
-        'duration': '8:00:00',
-        'link': 'https://www.youtube.com/watch?v=ua-CiDNNj30'
-    },
-    {
-        'title': 'Machine Learning Tutorial',
-        'channel': 'Simplilearn',
-        'video_id': '0UnQnYhT4L0',
-        'duration': '45:00',
-        'link': 'https://www.youtube.com/watch?v=0UnQnYhT4L0'
-    },
-    {
-        'title': 'AI Trends 2025 - Complete Guide',
-        'channel': 'Krish Naik',
-        'video_id': 'V2nKfjB5Lqw',
-        'duration': '30:00',
-        'link': 'https://www.youtube.com/watch?v=V2nKfjB5Lqw'
-    },
-    {
-        'title': 'Full Stack Development 2025',
-        'channel': 'Apna College',
-        'video_id': 'DKlT8-lCZj0',
-        'duration': '25:00',
-        'link': 'https://www.youtube.com/watch?v=DKlT8-lCZj0'
-    },
-    {
-        'title': 'Data Science Jobs 2026',
-        'channel': 'Simplilearn',
-        'video_id': 'Y7uZo8GgKF0',
-        'duration': '20:00',
-        'link': 'https://www.youtube.com/watch?v=Y7uZo8GgKF0'
-    },
-    {
-        'title': 'Web3 and Blockchain 2025',
-        'channel': 'Tech Lead',
-        'video_id': 'SSo_EIwHSd4',
-        'duration': '35:00',
-        'link': 'https://www.youtube.com/watch?v=SSo_EIwHSd4'
-    }
-]
-        },
-        'Healthcare': {
-            'courses': [
-                {'name': 'MBBS Preparation Course', 'provider': 'PrepLadder', 'link': 'https://www.prepladder.com/', 'duration': '2 years', 'level': 'Intermediate', 'video_id': 'YzKqjKfqE8I'},
-                {'name': 'Nursing Fundamentals', 'provider': 'Coursera', 'link': 'https://www.coursera.org/browse/health-science', 'duration': '6 months', 'level': 'Beginner', 'video_id': 'Y8V-GG9BzQ8'},
-                {'name': 'Healthcare Management MBA', 'provider': 'TISS', 'link': 'https://www.tiss.edu/', 'duration': '2 years', 'level': 'Advanced', 'video_id': 'O7GkX3TZ0pE'},
-                {'name': 'Pharmacy Degree Course', 'provider': 'B Pharmacy', 'link': 'https://www.pharmacy.gov.in/', 'duration': '4 years', 'level': 'Graduate', 'video_id': 'iLWTnMzWtj4'},
-                {'name': 'Medical Coding Training', 'provider': 'AAPC', 'link': 'https://www.aapc.com/', 'duration': '6 months', 'level': 'Beginner', 'video_id': 'PW3cq5wqRZ8'},
-                {'name': 'Hospital Administration', 'provider': 'Apollo MedSkills', 'link': 'https://www.apollomedskills.com/', 'duration': '1 year', 'level': 'Intermediate', 'video_id': 'Y6lUu5FqMw0'},
-            ],
-            'videos': [
-                {'title': 'How to Become a Doctor in India', 'channel': 'Motion Education', 'video_id': 'YzKqjKfqE8I', 'duration': '15:00'},
-                {'title': 'MBBS Full Details', 'channel': 'Gyan Tara', 'video_id': 'Y8V-GG9BzQ8', 'duration': '20:00'},
-                {'title': 'NEET Preparation Strategy', 'channel': 'Vedantu', 'video_id': 'O7GkX3TZ0pE', 'duration': '25:00'},
-                {'title': 'Healthcare Careers', 'channel': 'TED Talks', 'video_id': 'iCgDuz6U7j4', 'duration': '10:00'},
-                {'title': 'Medical Entrance Exam 2025', 'channel': 'Physics Wallah', 'video_id': 'PW3cq5wqRZ8', 'duration': '40:00'},
-                {'title': 'Healthcare Technology 2025', 'channel': 'Ninja Nerds', 'video_id': 'Y6lUu5FqMw0', 'duration': '30:00'},
-                {'title': 'Nursing Career Guide 2026', 'channel': 'MedCourse', 'video_id': 'L8KnAww6k0I', 'duration': '25:00'},
-                {'title': 'AIIMS Preparation 2026', 'channel': 'Vedantu', 'video_id': 'M7oT7jR6gZY', 'duration': '35:00'},
-            ]
-        },
-        'Business': {
-            'courses': [
-                {'name': 'Business Analytics with Excel', 'provider': 'Coursera', 'link': 'https://www.coursera.org/learn/excel-analytics', 'duration': '20 hours', 'level': 'Beginner', 'video_id': 'iLWTnMzWtj4'},
-                {'name': 'Digital Marketing Masterclass', 'provider': 'Udemy', 'link': 'https://www.udemy.com/course/digital-marketing-course/', 'duration': '40 hours', 'level': 'All Levels', 'video_id': 'd3Xj3oMT5v0'},
-                {'name': 'MBA Foundation Course', 'provider': 'IMS', 'link': 'https://www.imsindia.com/', 'duration': '1 year', 'level': 'Intermediate', 'video_id': 'QIlARzVynos'},
-                {'name': 'Financial Modeling Course', 'provider': 'Wall Street Mojo', 'link': 'https://www.wallstreetmojo.com/financial-modeling-course/', 'duration': '30 hours', 'level': 'Advanced', 'video_id': 'hY9mUZgZ2vU'},
-                {'name': 'Banking & Finance Course', 'provider': 'IBPS', 'link': 'https://www.ibps.in/', 'duration': '6 months', 'level': 'Beginner', 'video_id': 'vN26Z5c5k5w'},
-                {'name': 'Startup Entrepreneurship', 'provider': 'Startup India', 'link': 'https://www.startupindia.gov.in/', 'duration': '3 months', 'level': 'All Levels', 'video_id': 'E9oR8d2oN8U'},
-            ],
-            'videos': [
-                {'title': 'Business Analyst Full Course', 'channel': 'Simplilearn', 'video_id': 'iLWTnMzWtj4', 'duration': '3:00:00'},
-                {'title': 'Digital Marketing Tutorial', 'channel': 'Simplilearn', 'video_id': 'd3Xj3oMT5v0', 'duration': '2:30:00'},
-                {'title': 'How to Prepare for CAT', 'channel': 'Unacademy', 'video_id': 'QIlARzVynos', 'duration': '45:00'},
-                {'title': 'Startup Ideas for Students', 'channel': 'Ankur Warikoo', 'video_id': 'hY9mUZgZ2vU', 'duration': '20:00'},
-                {'title': 'Business Trends 2025', 'channel': 'UPSC Wallah', 'video_id': 'vN26Z5c5k5w', 'duration': '30:00'},
-                {'title': 'Marketing Strategy 2025', 'channel': 'Digital Deepak', 'video_id': 'E9oR8d2oN8U', 'duration': '25:00'},
-                {'title': 'Finance Careers 2026', 'channel': 'CA Parag Gupta', 'video_id': 'G8wK9wT7gZo', 'duration': '35:00'},
-                {'title': 'Entrepreneurship Guide 2026', 'channel': 'Ankur Warikoo', 'video_id': 'R4m7qsq1xXw', 'duration': '40:00'},
-            ]
-        },
-        'Creative Arts': {
-            'courses': [
-                {'name': 'Graphic Design Masterclass', 'provider': 'Udemy', 'link': 'https://www.udemy.com/course/graphic-design/', 'duration': '15 hours', 'level': 'Beginner', 'video_id': '9A-ysHr7O4E'},
-                {'name': 'UI/UX Design Complete', 'provider': 'Coursera', 'link': 'https://www.coursera.org/profional-certificate/google-ux-design', 'duration': '6 months', 'level': 'Beginner', 'video_id': 'c4ZtB4yF1Cw'},
-                {'name': 'Video Editing Pro Course', 'provider': 'Premiere Pro', 'link': 'https://www.adobe.com/education/expression-education/', 'duration': '20 hours', 'level': 'Intermediate', 'video_id': 'RtSm6Og1wmU'},
-                {'name': 'Animation & VFX Course', 'provider': 'MAAC', 'link': 'https://www.maacindia.com/', 'duration': '2 years', 'level': 'Advanced', 'video_id': '4Yq3PRd0jQw'},
-                {'name': 'Photography Masterclass', 'provider': 'National Geographic', 'link': 'https://www.nationalgeographic.com/education/', 'duration': '10 hours', 'level': 'All Levels', 'video_id': 'xK7PqhR8q5U'},
-                {'name': 'Music Production Course', 'provider': 'Berklee Online', 'link': 'https://online.berklee.edu/', 'duration': '1 year', 'level': 'Beginner', 'video_id': 'JUTJ5qVjPVw'},
-            ],
-            'videos': [
-                {'title': 'Graphic Design Tutorial', 'channel': 'GFXMentor', 'video_id': '9A-ysHr7O4E', 'duration': '1:00:00'},
-                {'title': 'UI/UX Design Complete', 'channel': 'Google Design', 'video_id': 'c4ZtB4yF1Cw', 'duration': '2:00:00'},
-                {'title': 'Photoshop Full Course', 'channel': 'Phlearn', 'video_id': 'RtSm6Og1wmU', 'duration': '3:00:00'},
-                {'title': 'Music Theory Basics', 'channel': 'Adam Neely', 'video_id': '4Yq3PRd0jQw', 'duration': '30:00'},
-                {'title': 'Design Trends 2025', 'channel': 'GFXMentor', 'video_id': 'xK7PqhR8q5U', 'duration': '25:00'},
-                {'title': 'Digital Art Tutorial 2025', 'channel': 'Ctrl+Paint', 'video_id': 'JUTJ5qVjPVw', 'duration': '30:00'},
-                {'title': 'Animation Career 2026', 'channel': 'Blender Guru', 'video_id': 'U1i8V4VZ3Kw', 'duration': '35:00'},
-                {'title': 'Content Creation 2026', 'channel': 'MrBeast', 'video_id': 'kJQP7kiw5Fk', 'duration': '20:00'},
-            ]
-        },
-        'Science': {
-            'courses': [
-                {'name': 'B.Sc Physics/Chemistry/Math', 'provider': 'IIT Coaching', 'link': 'https://www.vedantu.com/', 'duration': '2 years', 'level': 'Intermediate', 'video_id': '3CRmu8mBT_k'},
-                {'name': 'Research Methodology', 'provider': 'NPTEL', 'link': 'https://nptel.ac.in/', 'duration': '12 weeks', 'level': 'Advanced', 'video_id': 'N2Jax7vK3cM'},
-                {'name': 'Chemistry Olympiad Prep', 'provider': 'HBCSE', 'link': 'https://www.hbcse.tifr.res.in/', 'duration': '1 year', 'level': 'Advanced', 'video_id': 'V3WjGDU4Giw'},
-                {'name': 'Biotechnology Course', 'provider': 'BIONITY', 'link': 'https://www.biotecnika.org/', 'duration': '6 months', 'level': 'Intermediate', 'video_id': '8m66k-QXc6A'},
-                {'name': 'Environmental Science', 'provider': 'UGC', 'link': 'https://ugc.ac.in/', 'duration': '1 year', 'level': 'Graduate', 'video_id': 'Yb0cZ9HmZ7U'},
-                {'name': 'Forensic Science Course', 'provider': 'CBI', 'link': 'https://cbi.gov.in/', 'duration': '1 year', 'level': 'Advanced', 'video_id': 'M9vK6L5wX8Y'},
-            ],
-            'videos': [
-                {'title': 'Physics Complete Class 11-12', 'channel': 'Physics Wallah', 'video_id': '3CRmu8mBT_k', 'duration': '10:00:00'},
-                {'title': 'Chemistry Full Course', 'channel': 'Vedantu', 'video_id': 'N2Jax7vK3cM', 'duration': '8:00:00'},
-                {'title': 'Maths JEE Preparation', 'channel': 'Maths Wallah', 'video_id': 'V3WjGDU4Giw', 'duration': '15:00:00'},
-                {'title': 'Biology NEET Prep', 'channel': 'Vedantu', 'video_id': '8m66k-QXc6A', 'duration': '12:00:00'},
-                {'title': 'JEE Advanced 2025 Strategy', 'channel': 'Physics Wallah', 'video_id': 'Yb0cZ9HmZ7U', 'duration': '45:00'},
-                {'title': 'Science Careers After 12th 2025', 'channel': 'Vedantu', 'video_id': 'M9vK6L5wX8Y', 'duration': '30:00'},
-                {'title': 'Research Opportunities 2026', 'channel': 'IIT Delhi', 'video_id': 'N3wJP2LkqHo', 'duration': '35:00'},
-                {'title': 'BScIT Career Guide 2026', 'channel': 'Apna College', 'video_id': 'R5yK9jHwP2M', 'duration': '25:00'},
-            ]
-        }
-    }
+    courses_data = catalog['courses']
+    COURSES_DATA = courses_data['categories']
     
     # Default courses for all users
-    default_courses = [
-        {'name': 'Career Development Workshop', 'provider': 'LinkedIn Learning', 'link': 'https://www.linkedin.com/learning/', 'duration': '4 hours', 'level': 'Beginner', 'video_id': 'Cv5gR9tSSzw'},
-        {'name': 'Communication Skills', 'provider': 'Coursera', 'link': 'https://www.coursera.org/learn/communication-skills', 'duration': '8 hours', 'level': 'Beginner', 'video_id': '2L2lnxIcNts'},
-        {'name': 'Interview Preparation', 'provider': 'InterviewBit', 'link': 'https://www.interviewbit.com/', 'duration': '20 hours', 'level': 'Intermediate', 'video_id': 'iCgDuz6U7j4'},
-        {'name': 'Resume Writing Masterclass', 'provider': 'Udemy', 'link': 'https://www.udemy.com/course/resume-writing/', 'duration': '2 hours', 'level': 'Beginner', 'video_id': 'Y5Z9KlQhN0w'},
-        {'name': 'Time Management', 'provider': 'Great Learning', 'link': 'https://www.greatlearning.com/time-management', 'duration': '6 hours', 'level': 'Beginner', 'video_id': 'v2L3nVt4VZw'},
-        {'name': 'Leadership Skills', 'provider': 'EdX', 'link': 'https://www.edx.org/', 'duration': '12 hours', 'level': 'Intermediate', 'video_id': 'R4m7qsq1xXw'},
-    ]
-    
-    default_videos = [
-        {'title': 'How to Write a Resume', 'channel': 'Indeed', 'video_id': 'Cv5gR9tSSzw', 'duration': '5:00'},
-        {'title': 'Interview Tips 2024', 'channel': 'Hiration', 'video_id': '2L2lnxIcNts', 'duration': '10:00'},
-        {'title': 'Career Guidance for Students', 'channel': 'TED Talks', 'video_id': 'iCgDuz6U7j4', 'duration': '15:00'},
-        {'title': 'Resume Building 2025', 'channel': 'Hiration', 'video_id': 'Y5Z9KlQhN0w', 'duration': '12:00'},
-        {'title': 'Interview Preparation 2025', 'channel': 'Interview Bit', 'video_id': 'v2L3nVt4VZw', 'duration': '20:00'},
-        {'title': 'Career Planning 2026', 'channel': 'TEDx Talks', 'video_id': 'xK8PqhR8q5U', 'duration': '18:00'},
-        {'title': 'Job Search Strategies 2025', 'channel': 'LinkedIn', 'video_id': 'hT_nqWdeWV4', 'duration': '15:00'},
-        {'title': 'Future of Work 2026', 'channel': 'McKinsey', 'video_id': 'iCgDuz6U7j4', 'duration': '25:00'},
-    ]
+    default_courses = courses_data['default']['courses']
+    default_videos = courses_data['default']['videos']
     
     # Get courses based on career category
     def get_career_category(career):
@@ -2288,41 +1939,33 @@ def courses():
     
     category = get_career_category(user_career)
     
-    # YouTube API Video Search - Fetch dynamic videos if API key is configured
-    youtube_videos = None
-    use_youtube_api = False
-    
+    # Get selected data
+    if selected_category == 'all':
+        recommended_courses = COURSES_DATA.get(category, {}).get('courses', default_courses)
+        videos = COURSES_DATA.get(category, {}).get('videos', default_videos)
+    elif selected_category == 'courses':
+        recommended_courses = COURSES_DATA.get(category, {}).get('courses', default_courses)
+        videos = []
+    elif selected_category == 'videos':
+        recommended_courses = []
+        videos = COURSES_DATA.get(category, {}).get('videos', default_videos)
+    elif selected_category == 'default':
+        recommended_courses = default_courses
+        videos = default_videos
+    else:
+        recommended_courses = COURSES_DATA.get(selected_category, {}).get('courses', default_courses)
+        videos = COURSES_DATA.get(selected_category, {}).get('videos', default_videos)
+    
+    # YouTube videos for the user's career replace the catalog videos, and
+    # "all" adds a section per catalog category. Everything not cached is
+    # searched in parallel within COURSES_VIDEO_TIMEOUT; whatever misses the
+    # deadline keeps its catalog videos and is fetched in the background
+    category_videos = {}
     if YOUTUBE_API_KEY and selected_category in ['all', 'videos']:
-        # Try to get videos from YouTube API based on career
-        search_query = f"{user_career} career guide tutorial"
-        youtube_videos = search_youtube_videos(search_query, max_results=8)
-        
-        if youtube_videos:
-            # Get detailed video information including duration
-            video_ids = [v['video_id'] for v in youtube_videos]
-            detailed_videos = get_video_details(video_ids)
-            
-            if detailed_videos:
-                videos = detailed_videos
-                use_youtube_api = True
-    
-    # Get selected data (only if not using YouTube API)
-    if not use_youtube_api:
-        if selected_category == 'all':
-            recommended_courses = COURSES_DATA.get(category, {}).get('courses', default_courses)
-            videos = COURSES_DATA.get(category, {}).get('videos', default_videos)
-        elif selected_category == 'courses':
-            recommended_courses = COURSES_DATA.get(category, {}).get('courses', default_courses)
-            videos = []
-        elif selected_category == 'videos':
-            recommended_courses = []
-            videos = COURSES_DATA.get(category, {}).get('videos', default_videos)
-        elif selected_category == 'default':
-            recommended_courses = default_courses
-            videos = default_videos
-        else:
-            recommended_courses = COURSES_DATA.get(selected_category, {}).get('courses', default_courses)
-            videos = COURSES_DATA.get(selected_category, {}).get('videos', default_videos)
+        others = [cat for cat in COURSES_DATA if cat != category] if selected_category == 'all' else []
+        youtube_videos = career_videos.get_many([user_career] + others, timeout=app.config['COURSES_VIDEO_TIMEOUT'])
+        videos = youtube_videos.get(user_career) or videos
+        category_videos = {cat: youtube_videos.get(cat) or COURSES_DATA[cat].get('videos', []) for cat in others}
     
     # Get all available categories
     all_categories = list(COURSES_DATA.keys())
@@ -2331,6 +1974,7 @@ def courses():
                           career=user_career,
                           recommended_courses=recommended_courses,
                           videos=videos,
+                          category_videos=category_videos,
                           category=category,
                           all_categories=all_categories,
                           selected_category=selected_category)
@@ -2771,111 +2415,39 @@ INTEREST_CATEGORY_MAP = {
     "education": "education"
 }
 
+# Inverted index over the library's titles, keywords and categories (see video_index.py)
+video_index = VideoIndex(VIDEO_LIBRARY, INTEREST_CATEGORY_MAP)
+
 @app.route('/api/recommend-videos', methods=['POST'])
 def recommend_videos():
-    """Get video recommendations based on user interest and skills"""
-    data = request.get_json()
-    interest = data.get('interest', '').lower()
-    skills = data.get('skills', '').lower()
-    
-    # Combine interest and skills for matching
-    search_text = interest + " " + skills
-    
-    # Find matching category
-    matched_category = None
-    for key, category in INTEREST_CATEGORY_MAP.items():
-        if key in search_text:
-            matched_category = category
-            break
-    
-    # Filter videos
-    recommended = []
-    if matched_category:
-        # Get videos from matching category
-        for video in VIDEO_LIBRARY:
-            if video['category'] == matched_category:
-                recommended.append(video)
-    
-    # If no matches, return popular videos
-    if not recommended:
-        recommended = VIDEO_LIBRARY[:6]  # Return first 6 videos
+    """Get video recommendations based on user interest and skills, best match first
+    
+    JSON body: interest, skills, and optionally offset and limit for paging;
+    the response's next_offset is the offset of the following page, or null.
+    """
+    data = request.get_json(silent=True) or {}
+    interest = str(data.get('interest') or '')
+    skills = str(data.get('skills') or '')
+    try:
+        offset = max(int(data.get('offset') or 0), 0)
+        limit = min(max(int(data.get('limit') or app.config['RECOMMEND_PAGE_SIZE']), 1), 100)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'offset and limit must be integers'}), 400
     
-    return jsonify({
-        'videos': recommended,
-        'category': matched_category or 'general'
-    })
+    return jsonify(video_index.recommend(interest, skills, offset, limit))
 
 from flask import jsonify
 
 @app.route('/videos')
+@page_cache.cached()
 def videos():
     """Dedicated Videos Page - Educational Video Library"""
-    
-    # Static video library data as provided
-    video_library = [
-        {
-            "title": "Python Full Course for Beginners",
-            "channel": "freeCodeCamp",
-            "video_id": "rfscVS0vtbw",
-            "duration": "4:30:00",
-            "embed": "https://www.youtube.com/embed/rfscVS0vtbw"
-        },
-        {
-            "title": "Web Development Full Course",
-            "channel": "freeCodeCamp",
-            "video_id": "zJSY8tbf_ys",
-            "duration": "6:00:00",
-            "embed": "https://www.youtube.com/embed/zJSY8tbf_ys"
-        },
-        {
-            "title": "Machine Learning Basics",
-            "channel": "Simplilearn",
-            "video_id": "ukzFI9rgwfU",
-            "duration": "1:20:00",
-            "embed": "https://www.youtube.com/embed/ukzFI9rgwfU"
-        },
-        {
-            "title": "Data Science for Beginners",
-            "channel": "freeCodeCamp",
-            "video_id": "ua-CiDNNj30",
-            "duration": "8:00:00",
-            "embed": "https://www.youtube.com/embed/ua-CiDNNj30"
-        },
-        {
-            "title": "Python Django Tutorial",
-            "channel": "Programming with Mosh",
-            "video_id": "F5mRW0jo-U4",
-            "duration": "1:30:00",
-            "embed": "https://www.youtube.com/embed/F5mRW0jo-U4"
-        },
-        {
-            "title": "Full Stack Development Guide",
-            "channel": "Apna College",
-            "video_id": "zJSY8tbf_ys",
-            "duration": "2:00:00",
-            "embed": "https://www.youtube.com/embed/zJSY8tbf_ys"
-        },
-        {
-            "title": "Artificial Intelligence Basics",
-            "channel": "Simplilearn",
-            "video_id": "2ePf9rue1Ao",
-            "duration": "45:00",
-            "embed": "https://www.youtube.com/embed/2ePf9rue1Ao"
-        },
-        {
-            "title": "Career in Data Science",
-            "channel": "Krish Naik",
-            "video_id": "7eh4d6sabA0",
-            "duration": "30:00",
-            "embed": "https://www.youtube.com/embed/7eh4d6sabA0"
-        }
-    ]
-    
-    return render_template('videos.html', videos=video_library)
+    return render_template('videos.html', videos=catalog['videos'])
 
 # ==================== PARENTS CORNER ROUTE ====================
 
 @app.route('/parents-corner')
+@page_cache.cached()
 def parents_corner():
     """Parents Corner - Information for parents about career guidance"""
     return render_template('parents_corner.html')
@@ -2885,7 +2457,7 @@ def parents_corner():
 @app.route('/admin')
 def admin():
     """Simple Admin Page - Overview stats"""
-    conn = sqlite3.connect('database.db')
+    conn = get_db()
     c = conn.cursor()
     
     # Get counts
@@ -2911,7 +2483,6 @@ def admin():
     c.execute('SELECT id, name, email FROM users ORDER BY id DESC LIMIT 5')
     recent_users = c.fetchall()
     
-    conn.close()
     
     return render_template('admin.html', 
                           user_count=user_count,
@@ -2925,13 +2496,12 @@ def admin():
 @app.route('/certificate/<int:cert_id>')
 def certificate_view(cert_id):
     """View individual certificate"""
-    conn = sqlite3.connect('database.db')
+    conn = get_db()
     c = conn.cursor()
     
     c.execute('SELECT * FROM certificates WHERE id = ?', (cert_id,))
     certificate = c.fetchone()
     
-    conn.close()
     
     if certificate:
         return render_template('certificate_view.html', certificate=certificate)
@@ -2943,195 +2513,12 @@ def certificate_view(cert_id):
 @app.route('/interview', methods=['GET', 'POST'])
 def interview_practice():
     """Interview Practice with Real Company Questions"""
-    
     # Interview questions database organized by company
-    INTERVIEW_QUESTIONS = {
-        'Google': [
-            {'text': 'Tell me about a time when you had to deal with a difficult team member. How did you handle it?', 
-             'tips': 'Use STAR method. Focus on your approach and positive outcome.'},
-            {'text': 'Describe a situation where you had to meet a tight deadline. How did you prioritize your tasks?', 
-             'tips': 'Show your time management and organizational skills.'},
-            {'text': 'Tell me about a time when you failed. What did you learn from it?', 
-             'tips': 'Be honest about failure but emphasize growth and lessons learned.'},
-            {'text': 'Why do you want to work at Google?', 
-             'tips': 'Research Google\'s mission and values. Be specific about what attracts you.'},
-            {'text': 'Describe a complex technical problem you solved. What was your approach?', 
-             'tips': 'Explain the problem, your solution process, and the result.'}
-        ],
-        'Microsoft': [
-            {'text': 'Tell me about yourself and why you want to join Microsoft.', 
-             'tips': 'Connect your background to Microsoft\'s products and culture.'},
-            {'text': 'Describe a time when you had to learn something quickly. How did you do it?', 
-             'tips': 'Show your learning ability and adaptability.'},
-            {'text': 'Tell me about a project you\'re most proud of.', 
-             'tips': 'Choose a project that demonstrates relevant skills.'},
-            {'text': 'How do you handle disagreements with teammates?', 
-             'tips': 'Show conflict resolution and communication skills.'},
-            {'text': 'Where do you see yourself in 5 years?', 
-             'tips': 'Show ambition but also loyalty to the company.'}
-        ],
-        'Amazon': [
-            {'text': 'Tell me about a time when you had to make a decision without all the information you needed.', 
-             'tips': 'Show decision-making under uncertainty.'},
-            {'text': 'Describe a situation where you had to deliver bad news to a customer or team member.', 
-             'tips': 'Focus on transparency and empathy.'},
-            {'text': 'Tell me about a time when you went above and beyond for a customer.', 
-             'tips': 'Amazon is customer-centric. Show your customer obsession.'},
-            {'text': 'Describe a time when you had to work with a difficult stakeholder.', 
-             'tips': 'Show your stakeholder management skills.'},
-            {'text': 'Why Amazon?', 
-             'tips': 'Know Amazon\'s Leadership Principles. Be specific.'}
-        ],
-        'Meta': [
-            {'text': 'Tell me about a time you had to pivot your strategy quickly.', 
-             'tips': 'Show agility and adaptability.'},
-            {'text': 'Describe a time when you had to motivate a team.', 
-             'tips': 'Show leadership and people skills.'},
-            {'text': 'Why Meta? Which product do you like the most and why?', 
-             'tips': 'Be familiar with Meta\'s products and recent developments.'},
-            {'text': 'Tell me about a technical challenge you faced and how you solved it.', 
-             'tips': 'Be specific about the technical problem and your solution.'},
-            {'text': 'How do you stay updated with the latest technology trends?', 
-             'tips': 'Show curiosity and continuous learning.'}
-        ],
-        'Apple': [
-            {'text': 'Why Apple? What product has impacted you the most?', 
-             'tips': 'Show genuine passion for Apple\'s products and design philosophy.'},
-            {'text': 'Tell me about a time when you had to pay attention to detail.', 
-             'tips': 'Apple values perfection. Give a specific example.'},
-            {'text': 'Describe a time when you had to work on a project with minimal guidance.', 
-             'tips': 'Show self-motivation and independence.'},
-            {'text': 'How would you design a better user experience for a specific Apple product?', 
-             'tips': 'Think about simplicity and user-centric design.'},
-            {'text': 'Tell me about a time you disagreed with your manager.', 
-             'tips': 'Show professional disagreement and communication.'}
-        ],
-        'Netflix': [
-            {'text': 'Why Netflix? What do you think about their culture?', 
-             'tips': 'Know Netflix\'s culture memo. Be prepared to discuss freedom and responsibility.'},
-            {'text': 'Describe a time when you had to be creative to solve a problem.', 
-             'tips': 'Show innovative thinking.'},
-            {'text': 'Tell me about a time you had to handle high-pressure situations.', 
-             'tips': 'Show composure and stress management.'},
-            {'text': 'How would you improve Netflix\'s recommendation algorithm?', 
-             'tips': 'Show technical knowledge and business understanding.'},
-            {'text': 'Tell me about a time when you had to make a quick decision.', 
-             'tips': 'Show decision-making speed and accuracy.'}
-        ],
-        'TCS': [
-            {'text': 'Tell me about yourself.', 
-             'tips': 'Keep it professional and relevant to the job.'},
-            {'text': 'Why do you want to join TCS?', 
-             'tips': 'Show knowledge about TCS and its values.'},
-            {'text': 'What are your strengths and weaknesses?', 
-             'tips': 'Be honest but frame weaknesses positively.'},
-            {'text': 'Where do you see yourself in 5 years?', 
-             'tips': 'Show long-term commitment and career planning.'},
-            {'text': 'Are you willing to relocate?', 
-             'tips': 'Be positive and flexible.'}
-        ],
-        'Infosys': [
-            {'text': 'Tell me about your final year project.', 
-             'tips': 'Be thorough about your technical project.'},
-            {'text': 'Why Infosys?', 
-             'tips': 'Research Infosys training programs and culture.'},
-            {'text': 'What programming languages are you comfortable with?', 
-             'tips': 'Be honest about your technical skills.'},
-            {'text': 'Are you willing to work in any location?', 
-             'tips': 'Show flexibility and adaptability.'},
-            {'text': 'How do you keep yourself updated with technology?', 
-             'tips': 'Show continuous learning attitude.'}
-        ],
-        'Wipro': [
-            {'text': 'Tell me about yourself.', 
-             'tips': 'Give a concise professional summary.'},
-            {'text': 'Why Wipro?', 
-             'tips': 'Know about Wipro\'s values and projects.'},
-            {'text': 'What are your career goals?', 
-             'tips': 'Align with Wipro\'s growth opportunities.'},
-            {'text': 'How do you handle teamwork?', 
-             'tips': 'Show collaborative skills.'},
-            {'text': 'What are your technical strengths?', 
-             'tips': 'Be specific about your tech stack.'}
-        ],
-        'Accenture': [
-            {'text': 'Why Accenture?', 
-             'tips': 'Know about Accenture\'s global presence and diverse projects.'},
-            {'text': 'Tell me about a time you solved a problem creatively.', 
-             'tips': 'Show problem-solving and innovation.'},
-            {'text': 'How do you handle working under pressure?', 
-             'tips': 'Show stress management skills.'},
-            {'text': 'Describe your teamwork experience.', 
-             'tips': 'Give specific examples of collaboration.'},
-            {'text': 'What are your expectations from this role?', 
-             'tips': 'Show realistic expectations and enthusiasm.'}
-        ],
-        'Deloitte': [
-            {'text': 'Why Deloitte?', 
-             'tips': 'Show knowledge about consulting and Deloitte\'s services.'},
-            {'text': 'Tell me about a time you handled a difficult client.', 
-             'tips': 'Show client management skills.'},
-            {'text': 'How do you prioritize multiple deadlines?', 
-             'tips': 'Show organizational and time management skills.'},
-            {'text': 'Describe your analytical skills with an example.', 
-             'tips': 'Show data analysis and problem-solving.'},
-            {'text': 'What areas of consulting interest you most?', 
-             'tips': 'Show awareness of different consulting domains.'}
-        ],
-        'Goldman Sachs': [
-            {'text': 'Why Goldman Sachs?', 
-             'tips': 'Show knowledge about financial services and Goldman\'s culture.'},
-            {'text': 'Tell me about a time you demonstrated leadership.', 
-             'tips': 'Show leadership in academic or extracurricular activities.'},
-            {'text': 'How do you handle ethical dilemmas?', 
-             'tips': 'Show integrity and strong values.'},
-            {'text': 'Describe a time you had to work with numbers.', 
-             'tips': 'Show analytical and quantitative skills.'},
-            {'text': 'Where do you see yourself in finance?', 
-             'tips': 'Show career clarity in finance sector.'}
-        ],
-        'Flipkart': [
-            {'text': 'Why Flipkart?', 
-             'tips': 'Show knowledge about e-commerce and Flipkart\'s journey.'},
-            {'text': 'Tell me about a time you improved a process.', 
-             'tips': 'Show process improvement and efficiency.'},
-            {'text': 'How would you handle a customer complaint?', 
-             'tips': 'Show customer-centric problem solving.'},
-            {'text': 'Describe a technical project you worked on.', 
-             'tips': 'Be specific about your technical contributions.'},
-            {'text': 'What excites you about e-commerce?', 
-             'tips': 'Show passion for the industry.'}
-        ],
-        'Swiggy': [
-            {'text': 'Why Swiggy?', 
-             'tips': 'Show knowledge about food tech and Swiggy\'s operations.'},
-            {'text': 'Tell me about a time you worked in a fast-paced environment.', 
-             'tips': 'Show adaptability to quick changes.'},
-            {'text': 'How would you optimize food delivery routes?', 
-             'tips': 'Show problem-solving and logical thinking.'},
-            {'text': 'Describe your experience with teamwork.', 
-             'tips': 'Show collaborative skills.'},
-            {'text': 'What do you know about Swiggy\'s business model?', 
-             'tips': 'Research Swiggy\'s marketplace model.'}
-        ],
-        'Byju\'s': [
-            {'text': 'Why Byju\'s?', 
-             'tips': 'Show passion for education and Byju\'s mission.'},
-            {'text': 'How would you explain a complex concept to a student?', 
-             'tips': 'Show communication and teaching skills.'},
-            {'text': 'Tell me about a time you made learning fun.', 
-             'tips': 'Show creativity in education.'},
-            {'text': 'What teaching methods do you prefer?', 
-             'tips': 'Show understanding of modern education.'},
-            {'text': 'How do you handle students who are struggling?', 
-             'tips': 'Show patience and adaptive teaching.'}
-        ]
-    }
-    
+    interview_questions = catalog['interview_questions']
     selected_company = request.args.get('company', '')
     
-    if selected_company and selected_company in INTERVIEW_QUESTIONS:
-        questions = INTERVIEW_QUESTIONS[selected_company]
+    if selected_company and selected_company in interview_questions:
+        questions = interview_questions[selected_company]
         return render_template('interview_practice.html', 
                             selected_company=selected_company,
                             questions=questions)
@@ -3142,195 +2529,13 @@ def interview_practice():
 def interview_submit():
     """Submit interview practice answers"""
     company = request.form.get('company', '')
+    interview_questions = catalog['interview_questions']
     
-    INTERVIEW_QUESTIONS = {
-        'Google': [
-            {'text': 'Tell me about a time when you had to deal with a difficult team member. How did you handle it?', 
-             'tips': 'Use STAR method. Focus on your approach and positive outcome.'},
-            {'text': 'Describe a situation where you had to meet a tight deadline. How did you prioritize your tasks?', 
-             'tips': 'Show your time management and organizational skills.'},
-            {'text': 'Tell me about a time when you failed. What did you learn from it?', 
-             'tips': 'Be honest about failure but emphasize growth and lessons learned.'},
-            {'text': 'Why do you want to work at Google?', 
-             'tips': 'Research Google\'s mission and values. Be specific about what attracts you.'},
-            {'text': 'Describe a complex technical problem you solved. What was your approach?', 
-             'tips': 'Explain the problem, your solution process, and the result.'}
-        ],
-        'Microsoft': [
-            {'text': 'Tell me about yourself and why you want to join Microsoft.', 
-             'tips': 'Connect your background to Microsoft\'s products and culture.'},
-            {'text': 'Describe a time when you had to learn something quickly. How did you do it?', 
-             'tips': 'Show your learning ability and adaptability.'},
-            {'text': 'Tell me about a project you\'re most proud of.', 
-             'tips': 'Choose a project that demonstrates relevant skills.'},
-            {'text': 'How do you handle disagreements with teammates?', 
-             'tips': 'Show conflict resolution and communication skills.'},
-            {'text': 'Where do you see yourself in 5 years?', 
-             'tips': 'Show ambition but also loyalty to the company.'}
-        ],
-        'Amazon': [
-            {'text': 'Tell me about a time when you had to make a decision without all the information you needed.', 
-             'tips': 'Show decision-making under uncertainty.'},
-            {'text': 'Describe a situation where you had to deliver bad news to a customer or team member.', 
-             'tips': 'Focus on transparency and empathy.'},
-            {'text': 'Tell me about a time when you went above and beyond for a customer.', 
-             'tips': 'Amazon is customer-centric. Show your customer obsession.'},
-            {'text': 'Describe a time when you had to work with a difficult stakeholder.', 
-             'tips': 'Show your stakeholder management skills.'},
-            {'text': 'Why Amazon?', 
-             'tips': 'Know Amazon\'s Leadership Principles. Be specific.'}
-        ],
-        'Meta': [
-            {'text': 'Tell me about a time you had to pivot your strategy quickly.', 
-             'tips': 'Show agility and adaptability.'},
-            {'text': 'Describe a time when you had to motivate a team.', 
-             'tips': 'Show leadership and people skills.'},
-            {'text': 'Why Meta? Which product do you like the most and why?', 
-             'tips': 'Be familiar with Meta\'s products and recent developments.'},
-            {'text': 'Tell me about a technical challenge you faced and how you solved it.', 
-             'tips': 'Be specific about the technical problem and your solution.'},
-            {'text': 'How do you stay updated with the latest technology trends?', 
-             'tips': 'Show curiosity and continuous learning.'}
-        ],
-        'Apple': [
-            {'text': 'Why Apple? What product has impacted you the most?', 
-             'tips': 'Show genuine passion for Apple\'s products and design philosophy.'},
-            {'text': 'Tell me about a time you had to pay attention to detail.', 
-             'tips': 'Apple values perfection. Give a specific example.'},
-            {'text': 'Describe a time when you had to work on a project with minimal guidance.', 
-             'tips': 'Show self-motivation and independence.'},
-            {'text': 'How would you design a better user experience for a specific Apple product?', 
-             'tips': 'Think about simplicity and user-centric design.'},
-            {'text': 'Tell me about a time you disagreed with your manager.', 
-             'tips': 'Show professional disagreement and communication.'}
-        ],
-        'Netflix': [
-            {'text': 'Why Netflix? What do you think about their culture?', 
-             'tips': 'Know Netflix\'s culture memo. Be prepared to discuss freedom and responsibility.'},
-            {'text': 'Describe a time when you had to be creative to solve a problem.', 
-             'tips': 'Show innovative thinking.'},
-            {'text': 'Tell me about a time you had to handle high-pressure situations.', 
-             'tips': 'Show composure and stress management.'},
-            {'text': 'How would you improve Netflix\'s recommendation algorithm?', 
-             'tips': 'Show technical knowledge and business understanding.'},
-            {'text': 'Tell me about a time when you had to make a quick decision.', 
-             'tips': 'Show decision-making speed and accuracy.'}
-        ],
-        'TCS': [
-            {'text': 'Tell me about yourself.', 
-             'tips': 'Keep it professional and relevant to the job.'},
-            {'text': 'Why do you want to join TCS?', 
-             'tips': 'Show knowledge about TCS and its values.'},
-            {'text': 'What are your strengths and weaknesses?', 
-             'tips': 'Be honest but frame weaknesses positively.'},
-            {'text': 'Where do you see yourself in 5 years?', 
-             'tips': 'Show long-term commitment and career planning.'},
-            {'text': 'Are you willing to relocate?', 
-             'tips': 'Be positive and flexible.'}
-        ],
-        'Infosys': [
-            {'text': 'Tell me about your final year project.', 
-             'tips': 'Be thorough about your technical project.'},
-            {'text': 'Why Infosys?', 
-             'tips': 'Research Infosys training programs and culture.'},
-            {'text': 'What programming languages are you comfortable with?', 
-             'tips': 'Be honest about your technical skills.'},
-            {'text': 'Are you willing to work in any location?', 
-             'tips': 'Show flexibility and adaptability.'},
-            {'text': 'How do you keep yourself updated with technology?', 
-             'tips': 'Show continuous learning attitude.'}
-        ],
-        'Wipro': [
-            {'text': 'Tell me about yourself.', 
-             'tips': 'Give a concise professional summary.'},
-            {'text': 'Why Wipro?', 
-             'tips': 'Know about Wipro\'s values and projects.'},
-            {'text': 'What are your career goals?', 
-             'tips': 'Align with Wipro\'s growth opportunities.'},
-            {'text': 'How do you handle teamwork?', 
-             'tips': 'Show collaborative skills.'},
-            {'text': 'What are your technical strengths?', 
-             'tips': 'Be specific about your tech stack.'}
-        ],
-        'Accenture': [
-            {'text': 'Why Accenture?', 
-             'tips': 'Know about Accenture\'s global presence and diverse projects.'},
-            {'text': 'Tell me about a time you solved a problem creatively.', 
-             'tips': 'Show problem-solving and innovation.'},
-            {'text': 'How do you handle working under pressure?', 
-             'tips': 'Show stress management skills.'},
-            {'text': 'Describe your teamwork experience.', 
-             'tips': 'Give specific examples of collaboration.'},
-            {'text': 'What are your expectations from this role?', 
-             'tips': 'Show realistic expectations and enthusiasm.'}
-        ],
-        'Deloitte': [
-            {'text': 'Why Deloitte?', 
-             'tips': 'Show knowledge about consulting and Deloitte\'s services.'},
-            {'text': 'Tell me about a time you handled a difficult client.', 
-             'tips': 'Show client management skills.'},
-            {'text': 'How do you prioritize multiple deadlines?', 
-             'tips': 'Show organizational and time management skills.'},
-            {'text': 'Describe your analytical skills with an example.', 
-             'tips': 'Show data analysis and problem-solving.'},
-            {'text': 'What areas of consulting interest you most?', 
-             'tips': 'Show awareness of different consulting domains.'}
-        ],
-        'Goldman Sachs': [
-            {'text': 'Why Goldman Sachs?', 
-             'tips': 'Show knowledge about financial services and Goldman\'s culture.'},
-            {'text': 'Tell me about a time you demonstrated leadership.', 
-             'tips': 'Show leadership in academic or extracurricular activities.'},
-            {'text': 'How do you handle ethical dilemmas?', 
-             'tips': 'Show integrity and strong values.'},
-            {'text': 'Describe a time you had to work with numbers.', 
-             'tips': 'Show analytical and quantitative skills.'},
-            {'text': 'Where do you see yourself in finance?', 
-             'tips': 'Show career clarity in finance sector.'}
-        ],
-        'Flipkart': [
-            {'text': 'Why Flipkart?', 
-             'tips': 'Show knowledge about e-commerce and Flipkart\'s journey.'},
-            {'text': 'Tell me about a time you improved a process.', 
-             'tips': 'Show process improvement and efficiency.'},
-            {'text': 'How would you handle a customer complaint?', 
-             'tips': 'Show customer-centric problem solving.'},
-            {'text': 'Describe a technical project you worked on.', 
-             'tips': 'Be specific about your technical contributions.'},
-            {'text': 'What excites you about e-commerce?', 
-             'tips': 'Show passion for the industry.'}
-        ],
-        'Swiggy': [
-            {'text': 'Why Swiggy?', 
-             'tips': 'Show knowledge about food tech and Swiggy\'s operations.'},
-            {'text': 'Tell me about a time you worked in a fast-paced environment.', 
-             'tips': 'Show adaptability to quick changes.'},
-            {'text': 'How would you optimize food delivery routes?', 
-             'tips': 'Show problem-solving and logical thinking.'},
-            {'text': 'Describe your experience with teamwork.', 
-             'tips': 'Show collaborative skills.'},
-            {'text': 'What do you know about Swiggy\'s business model?', 
-             'tips': 'Research Swiggy\'s marketplace model.'}
-        ],
-        'Byju\'s': [
-            {'text': 'Why Byju\'s?', 
-             'tips': 'Show passion for education and Byju\'s mission.'},
-            {'text': 'How would you explain a complex concept to a student?', 
-             'tips': 'Show communication and teaching skills.'},
-            {'text': 'Tell me about a time you made learning fun.', 
-             'tips': 'Show creativity in education.'},
-            {'text': 'What teaching methods do you prefer?', 
-             'tips': 'Show understanding of modern education.'},
-            {'text': 'How do you handle students who are struggling?', 
-             'tips': 'Show patience and adaptive teaching.'}
-        ]
-    }
-    
-    if company not in INTERVIEW_QUESTIONS:
+    if company not in interview_questions:
         flash('Invalid company selection')
         return redirect(url_for('interview_practice'))
     
-    questions = INTERVIEW_QUESTIONS[company]
+    questions = interview_questions[company]
     total = len(questions)
     answered = 0
     
@@ -3381,12 +2586,11 @@ def certificate_download(cert_id):
         flash('PDF generation requires reportlab. Please install it: pip install reportlab')
         return redirect(url_for('certificates'))
     
-    conn = sqlite3.connect('database.db')
+    conn = get_db()
     c = conn.cursor()
     
     c.execute('SELECT * FROM certificates WHERE id = ?', (cert_id,))
     certificate = c.fetchone()
-    conn.close()
     
     if not certificate:
         flash('Certificate not found')
@@ -3396,12 +2600,9 @@ def certificate_download(cert_id):
     cert_id, user_id, career, title, date, score = certificate
     
     # Get user name
-    conn = sqlite3.connect('database.db')
-    c = conn.cursor()
     c.execute('SELECT name FROM users WHERE id = ?', (user_id,))
     user_result = c.fetchone()
     user_name = user_result[0] if user_result else 'Student'
-    conn.close()
     
     # Create PDF
     buffer = BytesIO()
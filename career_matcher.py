@@ -0,0 +1,85 @@
+# Career suggestion scoring for /career-suggestions
+# Tested against the per-career loop it replaced:  tests/test_career_matcher.py
+#
+# Every answer on the suggestion form (each interest, skill, salary range and
+# difficulty) is a column of a career x answer weight matrix built once at
+# startup. A user's answers become a 0/1 preference vector, so scoring every
+# career is one matrix-vector product and the best few are picked with
+# argpartition; several interests or skills are just several ones in the
+# vector. Route latency then stays flat as careers are added.
+#
+# NumPy is imported and the matrix filled on the first top() call, not when
+# the app is imported, so workers keep their fast cold start (see tfidf_model.py).
+
+import threading
+
+# Points a career earns for each answer it matches
+INTEREST_WEIGHT = 5
+SKILL_WEIGHT = 4
+SALARY_WEIGHT = 3
+DIFFICULTY_WEIGHT = 2
+
+# Suggestions shown
+TOP_K = 5
+
+
+class CareerMatcher:
+    """Scores careers against form answers with one dot product"""
+
+    def __init__(self, careers, interests, skills, salaries, difficulties):
+        """careers: career keys in display order; the rest map each answer to the careers it fits"""
+        self.careers = list(careers)
+        rows = {key: i for i, key in enumerate(self.careers)}
+
+        self.columns = {}  # (question, answer) -> column
+        self._cells = []
+        for question, options, weight in (('interest', interests, INTEREST_WEIGHT),
+                                          ('skill', skills, SKILL_WEIGHT),
+                                          ('salary', salaries, SALARY_WEIGHT),
+                                          ('difficulty', difficulties, DIFFICULTY_WEIGHT)):
+            for answer, keys in options.items():
+                column = self.columns.setdefault((question, answer), len(self.columns))
+                self._cells.extend((rows[key], column, weight) for key in keys if key in rows)
+
+        self._weights = None
+        self._lock = threading.Lock()
+
+    @property
+    def weights(self):
+        """The career x answer matrix, filled on first use"""
+        if self._weights is None:
+            with self._lock:
+                if self._weights is None:
+                    import numpy as np
+                    weights = np.zeros((len(self.careers), len(self.columns)), dtype=np.float64)
+                    for row, column, weight in self._cells:
+                        weights[row, column] = weight
+                    self._weights = weights
+        return self._weights
+
+    def preferences(self, interests=(), skills=(), salaries=(), difficulties=()):
+        """0/1 vector over the matrix columns; unknown answers are ignored"""
+        import numpy as np
+        vector = np.zeros(len(self.columns), dtype=np.float64)
+        for question, answers in (('interest', interests), ('skill', skills),
+                                  ('salary', salaries), ('difficulty', difficulties)):
+            for answer in answers:
+                column = self.columns.get((question, answer))
+                if column is not None:
+                    vector[column] = 1
+        return vector
+
+    def top(self, interests=(), skills=(), salaries=(), difficulties=(), k=TOP_K):
+        """[(career key, score)] for the k best careers scoring above zero, best first
+
+        Equal scores keep the careers' display order.
+        """
+        import numpy as np
+        scores = self.weights @ self.preferences(interests, skills, salaries, difficulties)
+        matched = np.flatnonzero(scores > 0)
+        if len(matched) > k:
+            # Everything scoring at least k-th place, ties included, then an exact sort of those few
+            kth = matched[np.argpartition(-scores[matched], k - 1)[k - 1]]
+            matched = matched[scores[matched] >= scores[kth]]
+        ranked = matched[np.lexsort((matched, -scores[matched]))][:k]
+        return [(self.careers[i], float(scores[i])) for i in ranked]
@@ -0,0 +1,70 @@
+# Static content catalogs for the guidance pages
+# (stream options after 10th/12th, interview questions, salaries, colleges,
+# courses and videos)
+#
+# Each catalog is a data file in data/: NAME.json, or NAME.yaml / NAME.yml
+# when PyYAML is installed, so content can be edited without touching code.
+# Files are loaded once and frozen (dicts become read-only mappings, lists
+# become tuples), so every request shares the same objects instead of
+# rebuilding the literals. Edited files are picked up on the next restart.
+
+import json
+import os
+from types import MappingProxyType
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+DATA_EXTENSIONS = ('.json', '.yaml', '.yml')
+
+
+def freeze(value):
+    """Recursively turn dicts into read-only mappings and lists into tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def parse_data(path, raw):
+    """Parse the bytes of a JSON or YAML data file"""
+    if path.endswith('.json'):
+        return json.loads(raw.decode('utf-8-sig'))
+    try:
+        import yaml
+    except ImportError:
+        raise RuntimeError(f'{os.path.basename(path)} needs PyYAML: pip install pyyaml')
+    return yaml.safe_load(raw)
+
+
+def load_file(path):
+    """Load and freeze a single data file"""
+    with open(path, 'rb') as f:
+        return freeze(parse_data(path, f.read()))
+
+
+class Catalog:
+    """Frozen catalogs keyed by data file name, e.g. catalog['after_10th']"""
+
+    def __init__(self, directory=DATA_DIR):
+        self.directory = directory
+        self._data = {}
+        for filename in sorted(os.listdir(directory)):
+            name, ext = os.path.splitext(filename)
+            if ext not in DATA_EXTENSIONS:
+                continue
+            if name in self._data:
+                raise ValueError(f'Duplicate catalog {name!r} in {directory}')
+            self._data[name] = load_file(os.path.join(directory, filename))
+
+    def __getitem__(self, name):
+        return self._data[name]
+
+    def __contains__(self, name):
+        return name in self._data
+
+    def names(self):
+        return list(self._data)
+
+
+catalog = Catalog()
@@ -0,0 +1,82 @@
+# Chat session lifecycle for the chatbot
+# (create, attach messages, list for the sidebar, clear)
+#
+# Sessions are created explicitly - by "New Chat" or by the first message of
+# a user who has none - and each keeps a denormalized message_count and
+# last_message_at, updated in the same transaction as the message insert.
+# The sidebar is then one range scan of idx_chat_sessions_user_activity
+# (migration 0006) instead of a look at chat_messages.
+#
+# Functions that write take the connection first so they can be queued on
+# the database writer:  writer.submit_call(add_message, user_id, ...)
+
+# Sessions listed in the chat sidebar
+SIDEBAR_LIMIT = 10
+
+# Characters of the first message kept as the session title
+TITLE_LENGTH = 50
+
+
+class SessionNotFound(LookupError):
+    """The chat session does not exist or belongs to another user"""
+
+
+def create_session(conn, user_id, title=None):
+    """Start a new chat session and return its id
+
+    An untouched session (no messages yet) is reused, so repeated clicks on
+    "New Chat" don't fill the sidebar with empty conversations.
+    """
+    row = conn.execute('SELECT id FROM chat_sessions WHERE user_id = ? AND message_count = 0 '
+                       'ORDER BY last_message_at DESC, id DESC LIMIT 1', (user_id,)).fetchone()
+    if row:
+        conn.execute('UPDATE chat_sessions SET last_message_at = CURRENT_TIMESTAMP WHERE id = ?', (row[0],))
+        return row[0]
+    return conn.execute('INSERT INTO chat_sessions (user_id, title, message_count, last_message_at) '
+                        'VALUES (?, ?, 0, CURRENT_TIMESTAMP)', (user_id, title)).lastrowid
+
+
+def latest_session_id(conn, user_id):
+    """Id of the user's most recently active session, or None"""
+    row = conn.execute('SELECT id FROM chat_sessions WHERE user_id = ? '
+                       'ORDER BY last_message_at DESC, id DESC LIMIT 1', (user_id,)).fetchone()
+    return row[0] if row else None
+
+
+def session_exists(conn, user_id, session_id):
+    return conn.execute('SELECT 1 FROM chat_sessions WHERE id = ? AND user_id = ?',
+                        (session_id, user_id)).fetchone() is not None
+
+
+def add_message(conn, user_id, session_id, message, response):
+    """Save one exchange and bump the session's counters; returns the message id
+
+    With session_id None the exchange goes to the user's most recently
+    active session, or a new one if they have none.
+    """
+    if session_id is None:
+        session_id = latest_session_id(conn, user_id) or create_session(conn, user_id)
+
+    # The first message names an untitled session
+    updated = conn.execute('UPDATE chat_sessions SET message_count = message_count + 1, '
+                           'last_message_at = CURRENT_TIMESTAMP, title = COALESCE(title, ?) '
+                           'WHERE id = ? AND user_id = ?',
+                           (message[:TITLE_LENGTH], session_id, user_id)).rowcount
+    if not updated:
+        raise SessionNotFound(session_id)
+
+    return conn.execute('INSERT INTO chat_messages (user_id, session_id, message, response) VALUES (?, ?, ?, ?)',
+                        (user_id, session_id, message, response)).lastrowid
+
+
+def list_sessions(conn, user_id, limit=SIDEBAR_LIMIT):
+    """The user's sessions for the sidebar, most recently active first"""
+    rows = conn.execute('SELECT id, title, message_count, last_message_at FROM chat_sessions WHERE user_id = ? '
+                        'ORDER BY last_message_at DESC, id DESC LIMIT ?', (user_id, limit)).fetchall()
+    return [{'id': r[0], 'title': r[1], 'message_count': r[2], 'last_message_at': r[3]} for r in rows]
+
+
+def clear_sessions(conn, user_id):
+    """Delete all of a user's messages and the sessions that held them"""
+    conn.execute('DELETE FROM chat_messages WHERE user_id = ?', (user_id,))
+    conn.execute('DELETE FROM chat_sessions WHERE user_id = ?', (user_id,))
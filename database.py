@@ -0,0 +1,378 @@
+# Database connection management for the Career Guidance app
+# Routes share a small pool of SQLite connections instead of opening
+# a fresh connection (and re-warming the page cache) on every request.
+
+import atexit
+import os
+import queue
+import socket
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+from flask import g
+
+import metrics
+
+DATABASE = 'database.db'
+
+# Maximum number of open connections kept by the pool
+POOL_SIZE = 8
+
+# Seconds a request waits for a free connection before giving up
+POOL_TIMEOUT = 10
+
+# Writer queue: max statements grouped into one transaction, and how long
+# the writer waits for more work before committing a partial batch
+WRITE_BATCH_SIZE = 100
+WRITE_BATCH_WAIT = 0.005
+
+# Seconds the shutdown flush waits for queued writes to be committed
+WRITE_STOP_TIMEOUT = 10
+
+# Seconds a blocking write (write(), write_call(), flush()) waits for the
+# writer before raising TimeoutError
+WRITE_TIMEOUT = 30
+
+# Applied once when a connection is created, not per request
+PRAGMAS = [
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA mmap_size=268435456',  # 256MB
+    'PRAGMA cache_size=-16000',    # ~16MB page cache
+    'PRAGMA busy_timeout=5000',
+]
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that reports each statement's execution time to metrics"""
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            metrics.record_query(time.perf_counter() - started)
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            metrics.record_query(time.perf_counter() - started)
+
+    def executescript(self, sql_script):
+        started = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            metrics.record_query(time.perf_counter() - started)
+
+
+class TimedConnection(sqlite3.Connection):
+    """Connection whose cursors (and shortcut execute calls) are timed"""
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+def connect_db(database=DATABASE):
+    """Open a new SQLite connection with the app pragmas applied"""
+    conn = sqlite3.connect(database, timeout=POOL_TIMEOUT, check_same_thread=False, factory=TimedConnection)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+class ConnectionPool:
+    """Bounded pool of SQLite connections shared between requests"""
+
+    def __init__(self, database=DATABASE, size=POOL_SIZE):
+        self.database = database
+        self.size = size
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=POOL_TIMEOUT):
+        """Get an idle connection, opening a new one while under the limit"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+
+        if create:
+            try:
+                return connect_db(self.database)
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError('Timed out waiting for a database connection')
+
+    def release(self, conn):
+        """Return a connection to the pool, discarding any open transaction"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put_nowait(conn)
+        except (sqlite3.Error, queue.Full):
+            self._discard(conn)
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._created -= 1
+
+    def close_all(self):
+        """Close every idle connection (used on shutdown and in scripts)"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+
+pool = ConnectionPool()
+
+
+def get_db():
+    """Get the connection bound to the current app context"""
+    if 'db' not in g:
+        g.db = pool.acquire()
+    return g.db
+
+
+def close_db(exception=None):
+    """Return the app context's connection to the pool (teardown_appcontext)"""
+    conn = g.pop('db', None)
+    if conn is not None:
+        pool.release(conn)
+
+
+class WriteQueue:
+    """Single background writer that group-commits queued inserts
+
+    With WAL enabled, readers on pooled connections never wait for this
+    thread; writers never collide with each other because there is only one.
+    Callers that don't need the result can submit and move on (write-behind);
+    stats() counts what was committed and what failed.
+    """
+
+    def __init__(self, database=DATABASE, batch_size=WRITE_BATCH_SIZE, batch_wait=WRITE_BATCH_WAIT):
+        self.database = database
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self._jobs = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._counts = {'submitted': 0, 'committed': 0, 'failed': 0, 'batches': 0}
+        self._last_error = None
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='sqlite-writer', daemon=True)
+                self._thread.start()
+
+    def submit(self, sql, params=()):
+        """Queue a single statement; the future resolves to its lastrowid"""
+        return self.submit_call(lambda conn: conn.execute(sql, params).lastrowid)
+
+    def submit_call(self, func, *args):
+        """Queue func(conn, *args) to run inside the writer's transaction"""
+        future = Future()
+        with self._lock:
+            self._counts['submitted'] += 1
+        self._jobs.put((func, args, future))
+        self._start()
+        return future
+
+    def flush(self, timeout=WRITE_TIMEOUT):
+        """Block until everything queued so far has been committed"""
+        return self.submit_call(lambda conn: None).result(timeout)
+
+    def stop(self, timeout=WRITE_STOP_TIMEOUT):
+        """Flush pending writes and stop the writer thread (called at exit)"""
+        if self._thread is not None and self._thread.is_alive():
+            self._jobs.put(None)
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                print(f"Database writer still busy after {timeout}s; "
+                      f"{self._jobs.qsize()} queued writes may be lost")
+
+    def stats(self):
+        """Counters for monitoring: jobs submitted, committed, failed, pending"""
+        with self._lock:
+            stats = dict(self._counts)
+        stats['pending'] = self._jobs.qsize()
+        stats['last_error'] = self._last_error
+        return stats
+
+    def _record(self, committed=0, failed=0, error=None):
+        with self._lock:
+            self._counts['batches'] += 1
+            self._counts['committed'] += committed
+            self._counts['failed'] += failed
+            if error is not None:
+                self._last_error = f'{type(error).__name__}: {error}'
+
+    def _next_batch(self):
+        batch = [self._jobs.get()]
+        while len(batch) < self.batch_size and batch[-1] is not None:
+            try:
+                batch.append(self._jobs.get(timeout=self.batch_wait))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        conn = None
+        try:
+            while True:
+                batch = self._next_batch()
+                stopping = batch[-1] is None
+                jobs = [job for job in batch if job is not None]
+                if jobs:
+                    # Whatever goes wrong, every future in the batch is
+                    # resolved and the loop carries on with a fresh connection
+                    try:
+                        if conn is None:
+                            conn = connect_db(self.database)
+                            conn.isolation_level = None  # transactions are managed explicitly
+                        self._commit_batch(conn, jobs)
+                    except BaseException as e:
+                        self._fail(jobs, e)
+                        conn = self._discard(conn)
+                if stopping:
+                    break
+        finally:
+            self._discard(conn)
+
+    @staticmethod
+    def _discard(conn):
+        if conn is not None:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def _fail(self, jobs, error):
+        """Fail every future of the batch not already resolved"""
+        pending = [future for _, _, future in jobs if not future.done()]
+        self._record(failed=len(pending), error=error)
+        for future in pending:
+            future.set_exception(error)
+
+    def _commit_batch(self, conn, jobs):
+        results = []
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+        except sqlite3.Error as e:
+            self._fail(jobs, e)
+            return
+
+        try:
+            # Each job gets a savepoint so one bad statement doesn't sink the batch
+            for func, args, future in jobs:
+                conn.execute('SAVEPOINT job')
+                try:
+                    results.append((future, func(conn, *args), None))
+                    conn.execute('RELEASE job')
+                except Exception as e:
+                    conn.execute('ROLLBACK TO job')
+                    conn.execute('RELEASE job')
+                    results.append((future, None, e))
+            conn.execute('COMMIT')
+        except BaseException:
+            if conn.in_transaction:
+                try:
+                    conn.execute('ROLLBACK')
+                except sqlite3.Error:
+                    pass
+            raise
+
+        errors = [error for _, _, error in results if error is not None]
+        self._record(committed=len(results) - len(errors), failed=len(errors),
+                     error=errors[-1] if errors else None)
+        for future, value, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(value)
+
+
+writer = WriteQueue()
+atexit.register(writer.stop)
+
+
+def write(sql, params=()):
+    """Run an INSERT/UPDATE/DELETE through the writer queue and return the rowid"""
+    return writer.submit(sql, params).result(WRITE_TIMEOUT)
+
+
+def write_call(func, *args):
+    """Run func(conn, *args) on the writer and return its result"""
+    return writer.submit_call(func, *args).result(WRITE_TIMEOUT)
+
+
+class Lease:
+    """A named lease in scheduler_leases (migration 0008), held by one process at a time
+
+    acquire() takes the lease if it is free or expired, or renews it for
+    the process already holding it, through the writer; BEGIN IMMEDIATE
+    makes the check and the update atomic across processes.
+    """
+
+    def __init__(self, name, duration, write_queue=writer):
+        self.name = name
+        self.duration = duration
+        self._writer = write_queue
+
+    @staticmethod
+    def owner():
+        # Worked out per call: the lease object is created before gunicorn forks
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def acquire(self):
+        """True if this process holds the lease for the next duration seconds"""
+        owner = self.owner()
+
+        def take(conn):
+            now = time.time()
+            conn.execute('INSERT INTO scheduler_leases (name, owner, expires_at) VALUES (?, ?, ?) '
+                         'ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at '
+                         'WHERE scheduler_leases.owner = excluded.owner OR scheduler_leases.expires_at <= ?',
+                         (self.name, owner, now + self.duration, now))
+            return conn.execute('SELECT owner FROM scheduler_leases WHERE name = ?', (self.name,)).fetchone()[0] == owner
+        return self._writer.submit_call(take).result(WRITE_TIMEOUT)
+
+    def release(self):
+        """Give the lease up early if this process holds it"""
+        return self._writer.submit('DELETE FROM scheduler_leases WHERE name = ? AND owner = ?',
+                                   (self.name, self.owner())).result(WRITE_TIMEOUT)
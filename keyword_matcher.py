@@ -0,0 +1,84 @@
+# Multi-pattern keyword matcher for the chatbot
+# Builds an Aho-Corasick automaton over every knowledge base keyword once,
+# so a message is scanned in a single pass no matter how many entries exist.
+
+from collections import deque
+
+
+class KeywordMatcher:
+    """Find which knowledge base entry a message matches by keyword
+
+    Entries keep their knowledge base order as priority: when several
+    entries have keywords in the message, the earliest entry wins, exactly
+    like checking each entry's keywords in turn with `keyword in message`.
+    """
+
+    def __init__(self, entries):
+        """entries: iterable of (key, keywords) in priority order"""
+        self.keys = []
+        self._goto = [{}]        # node -> {char: node}
+        self._fail = [0]
+        self._best = [None]      # lowest entry index of any keyword ending here
+
+        for priority, (key, keywords) in enumerate(entries):
+            self.keys.append(key)
+            for keyword in keywords:
+                if keyword:
+                    self._add(keyword, priority)
+        self._link()
+
+    @classmethod
+    def from_knowledge_base(cls, knowledge_base):
+        return cls((key, data.get('keywords', [])) for key, data in knowledge_base.items())
+
+    def _add(self, keyword, priority):
+        node = 0
+        for ch in keyword:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._best.append(None)
+                self._goto[node][ch] = nxt
+            node = nxt
+        if self._best[node] is None or priority < self._best[node]:
+            self._best[node] = priority
+
+    def _link(self):
+        # Breadth-first so each node's failure target is finished before it
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+
+                # Keywords that are suffixes of this one also end here
+                inherited = self._best[self._fail[child]]
+                if inherited is not None and (self._best[child] is None or inherited < self._best[child]):
+                    self._best[child] = inherited
+
+    def match_index(self, text):
+        """Return the priority index of the best matching entry, or None"""
+        goto, fail, best_at = self._goto, self._fail, self._best
+        node = 0
+        best = None
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            hit = best_at[node]
+            if hit is not None and (best is None or hit < best):
+                best = hit
+                if best == 0:
+                    break
+        return best
+
+    def match(self, text):
+        """Return the key of the best matching entry, or None"""
+        index = self.match_index(text)
+        return None if index is None else self.keys[index]
@@ -0,0 +1,81 @@
+# Language detection benchmark
+# Usage:  python language_benchmark.py                (report)
+#         python language_benchmark.py --json         (machine-readable, for CI to track)
+#         python language_benchmark.py --number 500   (fewer calls per timing)
+#
+# Times detect_language against the original per-indicator implementation
+# on short, medium and long English, Marathi and Hindi messages (one
+# sentence repeated 1, 10 and 200 times). The original does one substring
+# search per indicator word, so its cost grows with message length times
+# the number of indicators; the compiled scan grows with length only.
+
+import argparse
+import json
+import timeit
+
+from language_detect import HINDI_INDICATORS, MARATHI_INDICATORS, detect_language
+
+SENTENCES = {
+    'en': 'What career should I choose after 12th science?',
+    'mr': 'मी दहावी नंतर काय करू?',
+    'hi': 'मुझे डॉक्टर बनना है, क्या करना होगा?',
+}
+
+# Times each sentence is repeated
+LENGTHS = (('short', 1), ('medium', 10), ('long', 200))
+
+
+def reference_detect(text):
+    """The original implementation: one `word in text` test per indicator"""
+    if not text:
+        return 'en'
+    text = text.strip()
+    devanagari_chars = len([c for c in text if '\u0900' <= c <= '\u097F'])
+    marathi_score = sum(1 for word in MARATHI_INDICATORS if word in text) + devanagari_chars // 3
+    hindi_score = sum(1 for word in HINDI_INDICATORS if word in text) + devanagari_chars // 4
+    if marathi_score > hindi_score and marathi_score > 0:
+        return 'mr'
+    elif hindi_score > marathi_score and hindi_score > 0:
+        return 'hi'
+    elif devanagari_chars > len(text) * 0.3:
+        return 'mr'
+    else:
+        return 'en'
+
+
+def run(number):
+    """[{length, language, chars, reference_us, detect_us, same}] per message"""
+    rows = []
+    for label, repeat in LENGTHS:
+        for language, sentence in SENTENCES.items():
+            message = ' '.join([sentence] * repeat)
+            before = timeit.timeit(lambda: reference_detect(message), number=number)
+            after = timeit.timeit(lambda: detect_language(message), number=number)
+            rows.append({'length': label, 'language': language, 'chars': len(message),
+                         'reference_us': before / number * 1e6, 'detect_us': after / number * 1e6,
+                         'same': detect_language(message) == reference_detect(message)})
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark detect_language against the original implementation')
+    parser.add_argument('--number', type=int, default=2000, help='Calls per timing (default: %(default)s)')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args(argv)
+
+    rows = run(args.number)
+    if args.json:
+        print(json.dumps([dict(row, reference_us=round(row['reference_us'], 2), detect_us=round(row['detect_us'], 2))
+                          for row in rows], indent=2))
+    else:
+        for row in rows:
+            print(f"{row['length']:6} {row['language']} {row['chars']:5} chars: {row['reference_us']:8.1f}us -> "
+                  f"{row['detect_us']:7.1f}us  ({row['reference_us'] / row['detect_us']:.1f}x)"
+                  + ('' if row['same'] else '  MISMATCH'))
+
+    if not all(row['same'] for row in rows):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+# Language detection for chatbot messages (English / Marathi / Hindi)
+# Benchmark against the original implementation:  python language_benchmark.py
+#
+# The indicator words are compiled once at import into a single trie-shaped
+# regex, so a message is scanned once for all of them instead of once per
+# word. Devanagari characters are counted from the UTF-8 encoding, and the
+# scan is skipped entirely when that count alone decides the language.
+
+import re
+
+# Common Marathi words
+MARATHI_INDICATORS = ('आहे', 'आहेत', 'मी', 'तू', 'का', 'कसा', 'काय', 'शी', 'ला', 'मध्ये',
+                      'वर', 'खाली', 'पासून', 'पर्यंत', 'हा', 'हे', 'ती', 'ते', 'कोण',
+                      'कुठे', 'किती', 'केव्हा', 'मग', 'पण', 'किंवा', 'आणि', 'नाही',
+                      'असे', 'अशी', 'जसे', 'जसा', 'करू', 'होऊ', 'द्यावे', 'घ्यावे',
+                      'बाबत', 'संबंधी', 'कारण', 'साठी', 'नंतर', 'आधी', 'वेळेला')
+
+# Common Hindi words
+HINDI_INDICATORS = ('है', 'हैं', 'मैं', 'तू', 'क्या', 'कैसा', 'कौन', 'कहाँ', 'कितना',
+                    'कब', 'फिर', 'लेकिन', 'या', 'और', 'नहीं', 'इस', 'उस', 'जो', 'वो',
+                    'होगा', 'करूंगा', 'दूंगा', 'लेना', 'देना', 'के लिए', 'में', 'पर',
+                    'से', 'तक', 'बाद', 'पहले', 'समय')
+
+# Devanagari block U+0900-U+097F is exactly the UTF-8 sequences E0 A4 xx and E0 A5 xx
+_DEVANAGARI_PREFIXES = (b'\xe0\xa4', b'\xe0\xa5')
+
+
+def _trie_pattern(words):
+    """Regex alternation for words, factored by common prefixes (longest match first)"""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def emit(node):
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        if len(branches) == 1 and '' not in node:
+            return branches[0]
+        return '(?:%s)%s' % ('|'.join(branches), '?' if '' in node else '')
+
+    return emit(trie)
+
+
+def _compile(marathi, hindi):
+    """Build the scanning regex and the Marathi/Hindi bitmasks implied by each match"""
+    words = sorted(set(marathi) | set(hindi))
+    bit = {word: 1 << i for i, word in enumerate(words)}
+    marathi_mask = sum(bit[w] for w in set(marathi))
+    hindi_mask = sum(bit[w] for w in set(hindi))
+
+    # The regex reports the longest indicator starting at each position;
+    # shorter indicators inside it (e.g. आहे in आहेत) are implied by it
+    implied = {}
+    for word in words:
+        mask = sum(bit[other] for other in words if other in word)
+        implied[word] = (mask & marathi_mask, mask & hindi_mask)
+
+    # Lookahead so overlapping indicators are all seen, like `word in text`
+    first_chars = ''.join(sorted({re.escape(w[0]) for w in words}))
+    pattern = re.compile('(?=[%s])(?=(%s))' % (first_chars, _trie_pattern(words)))
+    return pattern, implied
+
+
+_SCAN, _IMPLIED = _compile(MARATHI_INDICATORS, HINDI_INDICATORS)
+
+# Most distinct Hindi indicators a message can contain
+_MAX_HINDI_HITS = len(set(HINDI_INDICATORS))
+
+
+def count_devanagari(text):
+    """Number of characters in the Devanagari Unicode block"""
+    encoded = text.encode('utf-8', 'surrogatepass')
+    return sum(encoded.count(prefix) for prefix in _DEVANAGARI_PREFIXES)
+
+
+def detect_language(text):
+    """Detect if the user message is in Marathi, Hindi, or English"""
+    if not text:
+        return 'en'
+
+    text = text.strip()
+    if text.isascii():
+        return 'en'
+
+    # Every indicator is Devanagari, so without any there is nothing to score
+    devanagari_chars = count_devanagari(text)
+    if devanagari_chars == 0:
+        return 'en'
+
+    # The character weight favours Marathi (//3 vs //4); past this point no
+    # number of Hindi indicators can catch up, so the scan can't change the result
+    if devanagari_chars // 3 - devanagari_chars // 4 > _MAX_HINDI_HITS:
+        return 'mr'
+
+    marathi_hits = 0
+    hindi_hits = 0
+    for word in set(_SCAN.findall(text)):
+        marathi_bits, hindi_bits = _IMPLIED[word]
+        marathi_hits |= marathi_bits
+        hindi_hits |= hindi_bits
+
+    # Each distinct indicator counts once, plus a weight for Devanagari characters
+    marathi_score = bin(marathi_hits).count('1') + devanagari_chars // 3
+    hindi_score = bin(hindi_hits).count('1') + devanagari_chars // 4
+
+    if marathi_score > hindi_score and marathi_score > 0:
+        return 'mr'
+    elif hindi_score > marathi_score and hindi_score > 0:
+        return 'hi'
+    elif devanagari_chars > len(text) * 0.3:  # More than 30% Devanagari
+        return 'mr'
+    else:
+        return 'en'
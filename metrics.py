@@ -0,0 +1,227 @@
+# Request timing and Prometheus metrics for the Career Guidance app
+# Scrape:  GET /metrics   (Prometheus text format)
+#
+# init_app(app) times every request per endpoint, totals the SQL statements
+# each request runs and their execution time (database.py reports each
+# cursor execute to record_query) and times template rendering through
+# Flask's render signals. Chat pipeline stages are reported with
+# observe_stage(). Values live in process memory, so each worker process
+# is scraped as its own target.
+
+import threading
+import time
+
+from flask import g, has_request_context, request, before_render_template, template_rendered
+
+# Histogram bucket upper bounds
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Endpoint label for SQL run outside a request (database writer, migrations)
+BACKGROUND = '_background'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with fixed label names"""
+
+    type = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            yield self.name + _format_labels(self.labelnames, labels), value
+
+
+class Histogram:
+    """Cumulative-bucket histogram with fixed label names"""
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=SECONDS_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}  # labels -> [per-bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, labels=()):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            else:
+                series[-2] += 1
+            series[-1] += value
+
+    def snapshot(self):
+        """{labels: (cumulative bucket counts incl. +Inf, count, sum)}"""
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        result = {}
+        for labels, values in series.items():
+            cumulative = []
+            total = 0
+            for count in values[:-1]:
+                total += count
+                cumulative.append(total)
+            result[labels] = (cumulative, total, values[-1])
+        return result
+
+    def samples(self):
+        for labels, (cumulative, count, total) in sorted(self.snapshot().items()):
+            for bound, value in zip(self.buckets + ('+Inf',), cumulative):
+                yield self.name + '_bucket' + _format_labels(self.labelnames, labels, [('le', bound)]), value
+            yield self.name + '_count' + _format_labels(self.labelnames, labels), count
+            yield self.name + '_sum' + _format_labels(self.labelnames, labels), total
+
+
+REQUEST_SECONDS = Histogram('app_request_duration_seconds', 'Time to produce a response, by endpoint',
+                            ('endpoint', 'method'))
+REQUESTS = Counter('app_requests_total', 'Responses sent, by endpoint and status', ('endpoint', 'method', 'status'))
+REQUEST_SQL_QUERIES = Histogram('app_request_sql_queries', 'SQL statements run per request',
+                                ('endpoint', 'method'), QUERY_COUNT_BUCKETS)
+REQUEST_SQL_SECONDS = Histogram('app_request_sql_seconds', 'SQL execution time per request', ('endpoint', 'method'))
+SQL_QUERIES = Counter('app_sql_queries_total', 'SQL statements run, by endpoint', ('endpoint',))
+SQL_SECONDS = Counter('app_sql_seconds_total', 'SQL execution time, by endpoint', ('endpoint',))
+TEMPLATE_SECONDS = Histogram('app_template_render_seconds', 'Template render time', ('template',))
+CHAT_STAGE_SECONDS = Histogram('app_chat_stage_seconds', 'Chat pipeline stage time', ('stage',))
+
+METRICS = [REQUEST_SECONDS, REQUESTS, REQUEST_SQL_QUERIES, REQUEST_SQL_SECONDS,
+           SQL_QUERIES, SQL_SECONDS, TEMPLATE_SECONDS, CHAT_STAGE_SECONDS]
+
+# Callables returning [(name, type, help, [(labels dict, value)])] for
+# values owned elsewhere (writer queue, caches), read at scrape time
+_collectors = []
+
+
+def register_collector(func):
+    _collectors.append(func)
+    return func
+
+
+def record_query(seconds):
+    """Count one SQL statement against the current request (or the background)"""
+    stats = g.get('request_metrics') if has_request_context() else None
+    if stats is None:
+        SQL_QUERIES.inc((BACKGROUND,))
+        SQL_SECONDS.inc((BACKGROUND,), seconds)
+    else:
+        stats['sql_queries'] += 1
+        stats['sql_seconds'] += seconds
+
+
+def observe_stage(stage, seconds):
+    CHAT_STAGE_SECONDS.observe(seconds, (stage,))
+
+
+def _endpoint():
+    return request.endpoint or '_unmatched'
+
+
+def _start_request():
+    g.request_metrics = {'started': time.perf_counter(), 'sql_queries': 0, 'sql_seconds': 0.0, 'templates': []}
+
+
+def _finish_request(response):
+    stats = g.pop('request_metrics', None)
+    if stats is None:
+        return response
+    endpoint = _endpoint()
+    REQUEST_SECONDS.observe(time.perf_counter() - stats['started'], (endpoint, request.method))
+    REQUESTS.inc((endpoint, request.method, str(response.status_code)))
+    REQUEST_SQL_QUERIES.observe(stats['sql_queries'], (endpoint, request.method))
+    REQUEST_SQL_SECONDS.observe(stats['sql_seconds'], (endpoint, request.method))
+    SQL_QUERIES.inc((endpoint,), stats['sql_queries'])
+    SQL_SECONDS.inc((endpoint,), stats['sql_seconds'])
+    return response
+
+
+def _template_started(sender, template, context, **extra):
+    stats = g.get('request_metrics')
+    if stats is not None:
+        stats['templates'].append(time.perf_counter())
+
+
+def _template_finished(sender, template, context, **extra):
+    stats = g.get('request_metrics')
+    if stats is not None and stats['templates']:
+        TEMPLATE_SECONDS.observe(time.perf_counter() - stats['templates'].pop(), (template.name,))
+
+
+def init_app(app):
+    """Install the request timing hooks and template render signals"""
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    before_render_template.connect(_template_started, app)
+    template_rendered.connect(_template_finished, app)
+
+
+def render():
+    """Every metric in the Prometheus text exposition format"""
+    lines = []
+    for metric in METRICS:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.type}')
+        lines.extend(f'{name} {_format_value(value)}' for name, value in metric.samples())
+    for collect in _collectors:
+        for name, kind, documentation, samples in collect():
+            lines.append(f'# HELP {name} {documentation}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                lines.append(name + _format_labels(labels.keys(), labels.values()) + ' ' + _format_value(value))
+    return '\n'.join(lines) + '\n'
+
+
+def slowest_endpoints(limit=10):
+    """(endpoint, method) rows by mean response time, with request count, p95 bound and SQL per request"""
+    sql = {labels: (count, total) for labels, (_, count, total) in REQUEST_SQL_QUERIES.snapshot().items()}
+    rows = []
+    for (endpoint, method), (cumulative, count, total) in REQUEST_SECONDS.snapshot().items():
+        if not count:
+            continue
+        # Upper bound of the bucket holding the 95th percentile
+        rank = 0.95 * count
+        p95 = next((bound for bound, seen in zip(REQUEST_SECONDS.buckets, cumulative) if seen >= rank), None)
+        sql_count, sql_total = sql.get((endpoint, method), (0, 0))
+        rows.append({
+            'endpoint': endpoint,
+            'method': method,
+            'requests': count,
+            'mean_ms': total / count * 1000,
+            'p95_ms': p95 * 1000 if p95 is not None else None,
+            'sql_per_request': sql_total / sql_count if sql_count else 0,
+        })
+    rows.sort(key=lambda row: row['mean_ms'], reverse=True)
+    return rows[:limit]
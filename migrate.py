@@ -0,0 +1,187 @@
+# Versioned schema migrations for database.db
+# Run once per deploy:  python migrate.py          (apply pending migrations)
+#                       python migrate.py --status (list applied/pending)
+#                       python migrate.py --check-plans (verify hot queries use indexes)
+#
+# Migrations live in migrations/ as NNNN_name.sql or NNNN_name.py files and
+# are applied in version order. A .py migration defines upgrade(conn).
+# Applied versions are recorded in the schema_version table.
+
+import argparse
+import importlib.util
+import os
+import re
+import sqlite3
+
+from database import DATABASE, connect_db
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+MIGRATION_FILE = re.compile(r'^(\d+)_(\w+)\.(sql|py)$')
+
+# Per-user lookups issued by the routes; each must be answered from an index
+# (no full table SCAN, no temp B-tree for the ORDER BY)
+HOT_QUERIES = {
+    'result': "SELECT career, skills, courses, salary, future_scope FROM results WHERE user_id = ? ORDER BY id DESC LIMIT 1",
+    'salary_predict/colleges/courses': "SELECT career FROM results WHERE user_id = ? ORDER BY id DESC LIMIT 1",
+    'progress (career)': "SELECT career, skills, salary FROM results WHERE user_id = ? ORDER BY id DESC LIMIT 1",
+    'progress (personality)': "SELECT personality_type, strengths, weaknesses, suitable_careers FROM personality_tests WHERE user_id = ? ORDER BY id DESC LIMIT 1",
+    'progress (aptitude)': "SELECT overall_score, recommendation FROM aptitude_tests WHERE user_id = ? ORDER BY id DESC LIMIT 1",
+    'progress (tracking)': "SELECT * FROM progress WHERE user_id = ? ORDER BY date_updated DESC",
+    'resume_preview': "SELECT * FROM resumes WHERE user_id = ? ORDER BY id DESC LIMIT 1",
+    'certificates': "SELECT * FROM certificates WHERE user_id = ? ORDER BY issue_date DESC",
+    'chat (sessions)': "SELECT id, title, message_count, last_message_at FROM chat_sessions WHERE user_id = ? ORDER BY last_message_at DESC, id DESC LIMIT ?",
+    'chat (messages)': "SELECT id, message, response, created_at FROM chat_messages WHERE user_id = ? AND session_id = ? ORDER BY id DESC LIMIT ?",
+    'chat (older messages)': "SELECT id, message, response, created_at FROM chat_messages WHERE user_id = ? AND session_id = ? AND id < ? ORDER BY id DESC LIMIT ?",
+    'get (latest session)': "SELECT id FROM chat_sessions WHERE user_id = ? ORDER BY last_message_at DESC, id DESC LIMIT 1",
+    'new chat (empty session)': "SELECT id FROM chat_sessions WHERE user_id = ? AND message_count = 0 ORDER BY last_message_at DESC, id DESC LIMIT 1",
+}
+
+
+def discover_migrations(directory=MIGRATIONS_DIR):
+    """Return (version, name, path) for every migration file, in order"""
+    migrations = []
+    for filename in os.listdir(directory):
+        match = MIGRATION_FILE.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+    migrations.sort()
+
+    versions = [m[0] for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError('Duplicate migration version in ' + directory)
+    return migrations
+
+
+def split_statements(sql):
+    """Split a SQL script into complete statements"""
+    statements = []
+    current = ''
+    for line in sql.splitlines(keepends=True):
+        current += line
+        if sqlite3.complete_statement(current):
+            if current.strip():
+                statements.append(current.strip())
+            current = ''
+    remainder = '\n'.join(l for l in current.splitlines() if not l.strip().startswith('--')).strip()
+    if remainder:
+        raise ValueError('Incomplete SQL statement: ' + remainder[:60])
+    return statements
+
+
+def ensure_version_table(conn):
+    conn.execute('''CREATE TABLE IF NOT EXISTS schema_version
+                    (version INTEGER PRIMARY KEY,
+                     name TEXT NOT NULL,
+                     applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+
+
+def applied_versions(conn):
+    ensure_version_table(conn)
+    return {row[0] for row in conn.execute('SELECT version FROM schema_version')}
+
+
+def apply_migration(conn, version, name, path):
+    """Apply one migration and record it, all in a single transaction"""
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        # Another process may have applied it while we waited for the lock
+        if conn.execute('SELECT 1 FROM schema_version WHERE version = ?', (version,)).fetchone():
+            conn.execute('ROLLBACK')
+            return False
+
+        if path.endswith('.sql'):
+            with open(path, encoding='utf-8') as f:
+                for statement in split_statements(f.read()):
+                    conn.execute(statement)
+        else:
+            spec = importlib.util.spec_from_file_location(f'migration_{version:04d}', path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            module.upgrade(conn)
+
+        conn.execute('INSERT INTO schema_version (version, name) VALUES (?, ?)', (version, name))
+        conn.execute('COMMIT')
+        return True
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+
+
+def migrate(database=DATABASE, directory=MIGRATIONS_DIR):
+    """Apply all pending migrations; returns the names that were applied"""
+    conn = connect_db(database)
+    conn.isolation_level = None  # transactions are managed explicitly
+    try:
+        done = applied_versions(conn)
+        applied = []
+        for version, name, path in discover_migrations(directory):
+            if version not in done and apply_migration(conn, version, name, path):
+                applied.append(f'{version:04d}_{name}')
+        return applied
+    finally:
+        conn.close()
+
+
+def status(database=DATABASE, directory=MIGRATIONS_DIR):
+    """Return (version, name, applied) for every known migration"""
+    conn = connect_db(database)
+    try:
+        done = applied_versions(conn)
+        conn.commit()
+    finally:
+        conn.close()
+    return [(version, name, version in done) for version, name, _ in discover_migrations(directory)]
+
+
+def explain_query_plan(conn, sql):
+    """Return the EXPLAIN QUERY PLAN detail lines for a parameterized query"""
+    params = (None,) * sql.count('?')
+    return [row[3] for row in conn.execute('EXPLAIN QUERY PLAN ' + sql, params)]
+
+
+def check_query_plans(database=DATABASE, queries=HOT_QUERIES):
+    """Return {name: plan} for every hot query that scans or sorts"""
+    conn = connect_db(database)
+    try:
+        problems = {}
+        for name, sql in queries.items():
+            plan = explain_query_plan(conn, sql)
+            if any(step.startswith('SCAN') or 'TEMP B-TREE' in step for step in plan):
+                problems[name] = plan
+        return problems
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Apply database schema migrations')
+    parser.add_argument('--database', default=DATABASE, help='SQLite database file (default: %(default)s)')
+    parser.add_argument('--status', action='store_true', help='List migrations without applying them')
+    parser.add_argument('--check-plans', action='store_true', help='Fail if a hot query is not served by an index')
+    args = parser.parse_args(argv)
+
+    if args.check_plans:
+        problems = check_query_plans(args.database)
+        for name, plan in problems.items():
+            print(f"{name}: {' / '.join(plan)}")
+        if problems:
+            raise SystemExit(1)
+        print(f"All {len(HOT_QUERIES)} hot queries use an index")
+        return
+
+    if args.status:
+        for version, name, applied in status(args.database):
+            print(f"{'applied' if applied else 'pending'}  {version:04d}_{name}")
+        return
+
+    applied = migrate(args.database)
+    if applied:
+        for name in applied:
+            print(f"Applied {name}")
+    else:
+        print("Database schema is up to date")
+
+
+if __name__ == '__main__':
+    main()
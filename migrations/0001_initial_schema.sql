@@ -0,0 +1,51 @@
+-- Core tables created by the original init_db()
+
+CREATE TABLE IF NOT EXISTS users 
+    (id INTEGER PRIMARY KEY AUTOINCREMENT, 
+     name TEXT NOT NULL, 
+     email TEXT UNIQUE NOT NULL, 
+     password TEXT NOT NULL);
+
+CREATE TABLE IF NOT EXISTS results 
+    (id INTEGER PRIMARY KEY AUTOINCREMENT, 
+     user_id INTEGER, 
+     career TEXT, 
+     skills TEXT, 
+     courses TEXT, 
+     salary TEXT, 
+     future_scope TEXT,
+     FOREIGN KEY(user_id) REFERENCES users(id));
+
+CREATE TABLE IF NOT EXISTS resumes 
+    (id INTEGER PRIMARY KEY AUTOINCREMENT, 
+     user_id INTEGER, 
+     resume_data TEXT, 
+     career_target TEXT,
+     photo TEXT,
+     FOREIGN KEY(user_id) REFERENCES users(id));
+
+CREATE TABLE IF NOT EXISTS admins 
+    (id INTEGER PRIMARY KEY AUTOINCREMENT, 
+     username TEXT UNIQUE NOT NULL, 
+     password TEXT NOT NULL);
+
+CREATE TABLE IF NOT EXISTS mentors
+    (id INTEGER PRIMARY KEY AUTOINCREMENT,
+     name TEXT NOT NULL,
+     expertise TEXT,
+     available TEXT DEFAULT 'yes',
+     contact TEXT);
+
+CREATE TABLE IF NOT EXISTS certificates
+    (id INTEGER PRIMARY KEY AUTOINCREMENT,
+     user_id INTEGER,
+     course_name TEXT,
+     issue_date DATE,
+     certificate_id TEXT);
+
+CREATE TABLE IF NOT EXISTS progress
+    (id INTEGER PRIMARY KEY AUTOINCREMENT,
+     user_id INTEGER,
+     course_name TEXT,
+     completion_percentage INTEGER,
+     date_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
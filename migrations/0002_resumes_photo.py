@@ -0,0 +1,7 @@
+# Add the photo column to resumes tables created before photo uploads existed
+
+
+def upgrade(conn):
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(resumes)')]
+    if 'photo' not in columns:
+        conn.execute('ALTER TABLE resumes ADD COLUMN photo TEXT')
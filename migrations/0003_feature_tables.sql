@@ -0,0 +1,75 @@
+-- Tables used by the test, chat, feedback and admin features that were
+-- previously created lazily inside request handlers (or not at all)
+
+CREATE TABLE IF NOT EXISTS personality_tests 
+    (id INTEGER PRIMARY KEY AUTOINCREMENT,
+     user_id INTEGER,
+     personality_type TEXT,
+     strengths TEXT,
+     weaknesses TEXT,
+     suitable_careers TEXT,
+     score_data TEXT,
+     date_taken TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+     FOREIGN KEY(user_id) REFERENCES users(id));
+
+CREATE TABLE IF NOT EXISTS aptitude_tests
+    (id INTEGER PRIMARY KEY AUTOINCREMENT,
+     user_id INTEGER,
+     logical_score INTEGER,
+     verbal_score INTEGER,
+     numerical_score INTEGER,
+     spatial_score INTEGER,
+     overall_score INTEGER,
+     recommendation TEXT,
+     date_taken TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+     FOREIGN KEY(user_id) REFERENCES users(id));
+
+CREATE TABLE IF NOT EXISTS user_courses
+    (id INTEGER PRIMARY KEY AUTOINCREMENT,
+     user_id INTEGER,
+     course_name TEXT,
+     course_link TEXT,
+     video_link TEXT,
+     status TEXT DEFAULT 'in_progress',
+     completed_date TIMESTAMP,
+     date_added TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+     FOREIGN KEY(user_id) REFERENCES users(id));
+
+CREATE TABLE IF NOT EXISTS mentor_sessions
+    (id INTEGER PRIMARY KEY AUTOINCREMENT,
+     user_id INTEGER,
+     mentor_id INTEGER,
+     session_date TEXT,
+     session_time TEXT,
+     status TEXT DEFAULT 'scheduled',
+     FOREIGN KEY(user_id) REFERENCES users(id),
+     FOREIGN KEY(mentor_id) REFERENCES mentors(id));
+
+CREATE TABLE IF NOT EXISTS chat_history
+    (id INTEGER PRIMARY KEY AUTOINCREMENT,
+     user_id INTEGER,
+     user_message TEXT,
+     bot_response TEXT,
+     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+     FOREIGN KEY(user_id) REFERENCES users(id));
+
+CREATE TABLE IF NOT EXISTS feedback 
+    (id INTEGER PRIMARY KEY, 
+     user_id INTEGER, 
+     feedback_text TEXT, 
+     rating INTEGER, 
+     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+
+CREATE TABLE IF NOT EXISTS chat_sessions 
+    (id INTEGER PRIMARY KEY AUTOINCREMENT, 
+     user_id INTEGER, 
+     title TEXT, 
+     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+
+CREATE TABLE IF NOT EXISTS chat_messages 
+    (id INTEGER PRIMARY KEY AUTOINCREMENT, 
+     user_id INTEGER, 
+     session_id INTEGER, 
+     message TEXT, 
+     response TEXT, 
+     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
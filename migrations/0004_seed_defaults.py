@@ -0,0 +1,19 @@
+# Default admin account and sample mentors for a fresh database
+
+import hashlib
+
+
+def upgrade(conn):
+    if conn.execute("SELECT COUNT(*) FROM admins").fetchone()[0] == 0:
+        # Create default admin (username: admin, password: admin123)
+        default_password = hashlib.sha256('admin123'.encode()).hexdigest()
+        conn.execute("INSERT INTO admins (username, password) VALUES (?, ?)", ('admin', default_password))
+
+    if conn.execute("SELECT COUNT(*) FROM mentors").fetchone()[0] == 0:
+        mentors_data = [
+            ('Dr. Priya Sharma', 'Career Counseling', 'yes', 'priya@carrerai.com'),
+            ('Prof. Rajesh Kumar', 'Engineering Admissions', 'yes', 'rajesh@carrerai.com'),
+            ('Ms. Anita Desai', 'Medical Career Guide', 'yes', 'anita@carrerai.com'),
+            ('Mr. Suresh Jadhav', 'MPSC/UPSC Expert', 'yes', 'suresh@carrerai.com'),
+        ]
+        conn.executemany('INSERT INTO mentors (name, expertise, available, contact) VALUES (?, ?, ?, ?)', mentors_data)
@@ -0,0 +1,29 @@
+-- Indexes for the per-user "latest row" lookups
+-- (WHERE user_id = ? ORDER BY id DESC LIMIT 1) used by result, progress,
+-- salary_predict, colleges, courses, chat and the admin pages.
+-- The results index also carries career so the career-only lookups are
+-- answered from the index without touching the table.
+
+CREATE INDEX IF NOT EXISTS idx_results_user_latest
+    ON results (user_id, id DESC, career);
+
+CREATE INDEX IF NOT EXISTS idx_personality_tests_user_latest
+    ON personality_tests (user_id, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_aptitude_tests_user_latest
+    ON aptitude_tests (user_id, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_resumes_user_latest
+    ON resumes (user_id, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_chat_sessions_user_latest
+    ON chat_sessions (user_id, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_chat_messages_user_session
+    ON chat_messages (user_id, session_id, id);
+
+CREATE INDEX IF NOT EXISTS idx_certificates_user
+    ON certificates (user_id, issue_date DESC);
+
+CREATE INDEX IF NOT EXISTS idx_progress_user
+    ON progress (user_id, date_updated DESC);
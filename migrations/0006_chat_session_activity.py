@@ -0,0 +1,24 @@
+# Message counts and last activity on chat_sessions for the chat sidebar
+# The columns are kept current by chat_sessions.add_message; this fills
+# them in for existing sessions and indexes sessions per user by activity.
+# Sessions left empty by the old "clear" (which deleted only the messages)
+# are kept; create_session reuses an empty session before making a new one.
+
+
+def upgrade(conn):
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(chat_sessions)')]
+    if 'message_count' not in columns:
+        conn.execute('ALTER TABLE chat_sessions ADD COLUMN message_count INTEGER NOT NULL DEFAULT 0')
+    if 'last_message_at' not in columns:
+        conn.execute('ALTER TABLE chat_sessions ADD COLUMN last_message_at TIMESTAMP')
+
+    conn.execute('''UPDATE chat_sessions SET
+                        message_count = (SELECT COUNT(*) FROM chat_messages m
+                                         WHERE m.user_id = chat_sessions.user_id AND m.session_id = chat_sessions.id),
+                        last_message_at = COALESCE((SELECT MAX(m.created_at) FROM chat_messages m
+                                                    WHERE m.user_id = chat_sessions.user_id AND m.session_id = chat_sessions.id), created_at)''')
+
+    conn.execute('''CREATE INDEX IF NOT EXISTS idx_chat_sessions_user_activity
+                    ON chat_sessions (user_id, last_message_at DESC, id DESC)''')
+    # Every session lookup now orders by activity
+    conn.execute('DROP INDEX IF EXISTS idx_chat_sessions_user_latest')
@@ -0,0 +1,14 @@
+-- Persistent cache and quota ledger for the YouTube Data API client
+-- (youtube_client.py). Cached API results are keyed by query or video id
+-- and expire by fetched_at; quota units are summed per Pacific-time day,
+-- the day the API's quota resets on.
+
+CREATE TABLE IF NOT EXISTS youtube_cache
+    (cache_key TEXT PRIMARY KEY,
+     response TEXT NOT NULL,
+     fetched_at REAL NOT NULL);
+
+CREATE TABLE IF NOT EXISTS youtube_quota
+    (day TEXT PRIMARY KEY,
+     units INTEGER NOT NULL DEFAULT 0,
+     calls INTEGER NOT NULL DEFAULT 0);
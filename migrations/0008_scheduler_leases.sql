@@ -0,0 +1,9 @@
+-- Leases for background jobs that must run in one process only, such as
+-- the career video prefetch (video_feed.py): every gunicorn worker tries to
+-- take the lease, and only its current owner runs the job until the lease
+-- expires without being renewed.
+
+CREATE TABLE IF NOT EXISTS scheduler_leases
+    (name TEXT PRIMARY KEY,
+     owner TEXT NOT NULL,
+     expires_at REAL NOT NULL);
@@ -0,0 +1,73 @@
+# Full-page response cache for pages that are the same for every visitor
+# apart from the selected language (after 10th/12th, videos, mentors, ...)
+#
+# The rendered bytes are stored per (endpoint, language, view args, chosen
+# query args) with a strong ETag and a Last-Modified time, so repeat visits
+# skip rendering and revalidations are answered with 304 Not Modified.
+# The content these pages come from (catalog data files, translations) is
+# loaded once per process, so entries only expire by ttl or eviction.
+
+import functools
+import hashlib
+import time
+from datetime import datetime, timezone
+
+from flask import current_app, request, session
+
+from cache import LRUCache
+
+
+class PageCache:
+    """Cache rendered pages keyed by endpoint, language and selected args"""
+
+    def __init__(self, maxsize=256):
+        self._cache = LRUCache(maxsize=maxsize)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        return self._cache.stats()
+
+    def cached(self, args=(), ttl=None, bypass=None):
+        """Decorator for a view whose output depends only on language and args
+
+        args:   query string parameters that change the page
+        ttl:    seconds before the page is rendered again (for database content)
+        bypass: callable; when it returns True the view runs uncached, e.g.
+                to let a login check redirect
+        """
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*view_args, **view_kwargs):
+                if request.method not in ('GET', 'HEAD') or (bypass is not None and bypass()):
+                    return view(*view_args, **view_kwargs)
+
+                key = (request.endpoint, session.get('lang', 'en'),
+                       tuple(sorted(view_kwargs.items())),
+                       tuple(request.args.get(name) for name in args))
+                entry = self._cache.get(key)
+                if entry is None or (ttl is not None and time.monotonic() - entry['stored_at'] > ttl):
+                    response = current_app.make_response(view(*view_args, **view_kwargs))
+                    if response.status_code != 200 or response.direct_passthrough:
+                        return response
+                    body = response.get_data()
+                    entry = {
+                        'body': body,
+                        'mimetype': response.mimetype,
+                        'etag': hashlib.sha1(body).hexdigest(),
+                        'last_modified': datetime.now(timezone.utc).replace(microsecond=0),
+                        'stored_at': time.monotonic(),
+                    }
+                    self._cache.set(key, entry)
+
+                response = current_app.response_class(entry['body'], mimetype=entry['mimetype'])
+                response.set_etag(entry['etag'])
+                response.last_modified = entry['last_modified']
+                # The page follows the visitor's language, so shared caches
+                # must not store it and browsers revalidate each time
+                response.cache_control.private = True
+                response.cache_control.no_cache = True
+                return response.make_conditional(request)
+            return wrapper
+        return decorator
@@ -0,0 +1,98 @@
+# Worker cold-start benchmark
+# Usage:  python startup_benchmark.py                (report, best of 3 runs)
+#         python startup_benchmark.py --json         (machine-readable, for CI to track)
+#         python startup_benchmark.py --max-import-ms 800
+#                                                    (exit 1 if `import app` is slower)
+#
+# Each run starts a fresh interpreter with `python -X importtime`, imports
+# the app, serves /healthz through the test client and then waits for the
+# chat model. The report lists the three timings and the modules with the
+# largest cumulative import time.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Runs inside the child interpreter; prints timings (ms) as JSON on stdout
+PROBE = '''
+import json, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+app.app.test_client().get('/healthz')
+first_request = time.perf_counter()
+app.tfidf_model.get_model(app.KNOWLEDGE_BASE)
+model_ready = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'first_request_ms': (first_request - started) * 1000,
+    'chat_ready_ms': (model_ready - started) * 1000,
+}))
+'''
+
+
+def parse_importtime(stderr):
+    """Return [(module, depth, cumulative_us)] from -X importtime output"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line.split('|')
+        # Names are indented by two spaces per level of nesting
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((name.strip(), depth, int(cumulative_us)))
+    return modules
+
+
+def run_once():
+    env = dict(os.environ, CHAT_WARMUP='0')  # measure the model load on its own
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', PROBE],
+                            cwd=APP_DIR, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(result.stderr[-2000:])
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings['modules'] = parse_importtime(result.stderr)
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure worker cold-start time')
+    parser.add_argument('--runs', type=int, default=3, help='Fresh interpreters to start (default: %(default)s)')
+    parser.add_argument('--top', type=int, default=15, help='Slowest modules to list (default: %(default)s)')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    parser.add_argument('--max-import-ms', type=float, help='Fail if importing the app takes longer')
+    args = parser.parse_args(argv)
+
+    best = min((run_once() for _ in range(args.runs)), key=lambda r: r['import_ms'])
+    # Modules imported directly by the app (or by the probe itself), so one
+    # slow dependency tree is listed once rather than once per submodule
+    direct = [(name, us) for name, depth, us in best['modules'] if depth <= 1 and name != 'app']
+    top = sorted(direct, key=lambda item: item[1], reverse=True)[:args.top]
+
+    if args.json:
+        print(json.dumps({
+            'import_ms': round(best['import_ms'], 1),
+            'first_request_ms': round(best['first_request_ms'], 1),
+            'chat_ready_ms': round(best['chat_ready_ms'], 1),
+            'modules_ms': {name: round(us / 1000, 1) for name, us in top},
+        }, indent=2))
+    else:
+        print(f"import app           {best['import_ms']:8.1f} ms")
+        print(f"first request served {best['first_request_ms']:8.1f} ms")
+        print(f"chat model ready     {best['chat_ready_ms']:8.1f} ms")
+        print()
+        print('Slowest imports (cumulative):')
+        for name, us in top:
+            print(f"  {us / 1000:8.1f} ms  {name}")
+
+    if args.max_import_ms is not None and best['import_ms'] > args.max_import_ms:
+        print(f"import app took {best['import_ms']:.1f} ms (limit {args.max_import_ms} ms)", file=sys.stderr)
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# Shared pytest setup: run from the repository root (python -m pytest) or
+# from anywhere else, the app's flat top-level modules must be importable.
+# Also a local stand-in for the YouTube Data API and a client wired to it,
+# and the `timing` marker for the few speed comparisons.
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'timing: compares wall-clock times; deselect on loaded '
+                                       'machines with -m "not timing"')
+
+
+@pytest.fixture
+def youtube_api():
+    """(server, hits): fails the first search with 503, records every hit as (path, params)
+
+    Video ids are "<first word of the query>-<n>"; every call takes
+    server.latency seconds, and searches starting with "slow" are held until
+    server.hold is set, so they always miss a caller's deadline.
+    """
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = parse_qs(url.query)
+            hits.append((url.path, params))
+            time.sleep(self.server.latency)
+            if params.get('q', [''])[0].startswith('slow'):
+                self.server.hold.wait(10)
+            if url.path == '/search' and len([h for h in hits if h[0] == '/search']) == 1:
+                self.send_response(503)
+                self.end_headers()
+                return
+            if url.path == '/search':
+                slug = params['q'][0].split()[0].lower()
+                items = [{'id': {'videoId': f'{slug}-{i}'},
+                          'snippet': {'title': f'Video {i}', 'channelTitle': 'Stub', 'description': 'd',
+                                      'thumbnails': {'high': {'url': f'https://img/{i}'}}}}
+                         for i in range(int(params['maxResults'][0]))]
+            else:
+                items = [{'id': video_id,
+                          'snippet': {'title': f'Video {video_id}', 'channelTitle': 'Stub'},
+                          'contentDetails': {'duration': 'PT1H2M3S'}}
+                         for video_id in params['id'][0].split(',')]
+            body = json.dumps({'items': items}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.latency = 0
+    server.hold = threading.Event()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server, hits
+    server.hold.set()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def write_queue(tmp_path):
+    """A WriteQueue for a freshly migrated database"""
+    from database import WriteQueue
+    from migrate import migrate
+
+    database = str(tmp_path / 'app.db')
+    migrate(database)
+    queue = WriteQueue(database)
+    yield queue
+    queue.stop()
+
+
+@pytest.fixture
+def youtube(write_queue, youtube_api):
+    """A YouTubeClient for the stub API, caching through write_queue"""
+    from youtube_client import YouTubeCache, YouTubeClient
+
+    server, _ = youtube_api
+    client = YouTubeClient('stub-key', base_url=f'http://127.0.0.1:{server.server_port}',
+                           cache=YouTubeCache(write_queue.database, write_queue))
+    yield client
+    client.cache.close()
@@ -0,0 +1,89 @@
+# CareerMatcher must rank careers exactly like the per-career loop the
+# /career-suggestions route used before it
+
+import itertools
+import random
+import time
+
+import pytest
+
+from career_matcher import TOP_K, CareerMatcher
+
+CAREERS = [f'career{i}' for i in range(200)]
+
+
+def loop_scores(careers, interests, skills, salaries, difficulties, answers):
+    """The route's original per-career loop, for a single answer per question"""
+    interest, skill, salary, difficulty = answers
+    career_scores = {}
+    for key in careers:
+        score = 0
+        if interest in interests and key in interests[interest]:
+            score += 5
+        if skill in skills and key in skills[skill]:
+            score += 4
+        if salary in salaries and key in salaries[salary]:
+            score += 3
+        if difficulty in difficulties and key in difficulties[difficulty]:
+            score += 2
+        if score > 0:
+            career_scores[key] = score
+    return sorted(career_scores.items(), key=lambda x: x[1], reverse=True)[:TOP_K]
+
+
+@pytest.fixture(scope='module')
+def options():
+    rng = random.Random(3)
+
+    def sample(names, per_option):
+        return {name: rng.sample(CAREERS, per_option) for name in names}
+
+    return (sample(['tech', 'medical', 'business', 'creative', 'science', 'teaching', 'law', 'marketing'], 24),
+            sample(['coding', 'creative', 'communication', 'analytical', 'medical', 'legal'], 32),
+            sample(['low', 'medium', 'high'], 60),
+            sample(['easy', 'medium', 'hard', 'very_hard'], 48))
+
+
+@pytest.fixture(scope='module')
+def matcher(options):
+    return CareerMatcher(CAREERS, *options)
+
+
+@pytest.fixture(scope='module')
+def combinations(options):
+    """Every single-answer form, blanks included"""
+    return list(itertools.product(*([''] + list(answers) for answers in options)))
+
+
+def test_single_answers_rank_like_the_loop(matcher, options, combinations):
+    for answers in combinations:
+        expected = [(key, float(score)) for key, score in loop_scores(CAREERS, *options, answers)]
+        assert matcher.top(*([answer] for answer in answers)) == expected, answers
+
+
+def test_multi_select_adds_up_every_answer(matcher, options):
+    interests, skills, _, _ = options
+    ranked = matcher.top(['tech', 'medical'], ['coding'], k=len(CAREERS))
+    expected = {key: 5 * (key in interests['tech']) + 5 * (key in interests['medical'])
+                + 4 * (key in skills['coding']) for key in CAREERS}
+
+    assert all(expected[key] == score for key, score in ranked)
+    assert len(ranked) == sum(1 for score in expected.values() if score)
+
+
+def test_unknown_answers_match_nothing(matcher):
+    assert matcher.top(['astrology'], ['juggling']) == []
+
+
+@pytest.mark.timing
+def test_faster_than_the_loop(matcher, options, combinations):
+    """About 5x faster on an idle machine, so only a heavily loaded one can tip it"""
+    started = time.perf_counter()
+    for answers in combinations:
+        matcher.top(*([answer] for answer in answers))
+    vector = time.perf_counter() - started
+    started = time.perf_counter()
+    for answers in combinations:
+        loop_scores(CAREERS, *options, answers)
+    loop = time.perf_counter() - started
+    assert vector < loop
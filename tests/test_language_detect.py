@@ -0,0 +1,53 @@
+# detect_language against a labelled corpus and against the original
+# per-indicator implementation it replaced (kept in language_benchmark.py)
+
+import random
+
+import pytest
+
+from language_benchmark import reference_detect
+from language_detect import HINDI_INDICATORS, MARATHI_INDICATORS, detect_language
+
+# Known misclassification: longer Hindi sentences tip to Marathi because the
+# Devanagari character weight favours Marathi (//3 vs //4)
+HINDI_AS_MARATHI = pytest.mark.xfail(reason='character weight favours Marathi', strict=True)
+
+SAMPLES = [
+    ('What career should I choose after 12th science?', 'en'),
+    ('How much does a software engineer earn in India', 'en'),
+    ('Tell me about MBBS and NEET preparation', 'en'),
+    ('Best café management course? 🎓', 'en'),
+    ('', 'en'),
+    ('   ', 'en'),
+    ('मी दहावी नंतर काय करू?', 'mr'),
+    ('इंजिनिअरिंग साठी कोणते कॉलेज चांगले आहेत', 'mr'),
+    ('माझ्या मुलासाठी कोणता कोर्स चांगला आहे?', 'mr'),
+    ('डॉक्टर होण्यासाठी किती वर्षे लागतात आणि खर्च किती आहे', 'mr'),
+    ('career मध्ये काय scope आहे', 'mr'),
+    ('आर्ट्स', 'mr'),
+    ('मुझे डॉक्टर बनना है, क्या करना होगा?', 'hi'),
+    ('इंजीनियरिंग के लिए सबसे अच्छा कॉलेज कौन सा है', 'hi'),
+    ('क्या है', 'hi'),
+    ('salary कितना है?', 'hi'),
+    pytest.param('बारहवीं के बाद कौन सा कोर्स करें', 'hi', marks=HINDI_AS_MARATHI),
+    pytest.param('मैं डेटा साइंटिस्ट कैसे बन सकता हूँ', 'hi', marks=HINDI_AS_MARATHI),
+]
+
+
+@pytest.mark.parametrize('text, language', SAMPLES)
+def test_labelled_samples(text, language):
+    assert detect_language(text) == language
+
+
+@pytest.mark.parametrize('text', [sample.values[0] if hasattr(sample, 'values') else sample[0]
+                                  for sample in SAMPLES])
+def test_same_as_reference_on_samples(text):
+    assert detect_language(text) == reference_detect(text)
+
+
+def test_same_as_reference_on_generated_messages():
+    rng = random.Random(11)
+    words = list(MARATHI_INDICATORS + HINDI_INDICATORS) + ['career', 'salary', 'कॉलेज', 'डॉक्टर', '?', '🎓', 'é']
+    for _ in range(3000):
+        text = rng.choice(['', ' ']).join(rng.choice(words) for _ in range(rng.randint(0, 40)))
+        assert detect_language(text) == reference_detect(text), text
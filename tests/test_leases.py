@@ -0,0 +1,41 @@
+# database.Lease: one holder at a time across processes, taken over on expiry
+
+import time
+
+import pytest
+
+from database import Lease
+
+
+@pytest.fixture
+def leases(write_queue, monkeypatch):
+    """Two leases on the same name, as seen from two worker processes"""
+    def make(owner, duration=60):
+        lease = Lease('job', duration, write_queue)
+        monkeypatch.setattr(lease, 'owner', lambda: owner)
+        return lease
+    return make
+
+
+def test_one_holder_at_a_time(leases):
+    first, second = leases('worker-1'), leases('worker-2')
+    assert first.acquire()
+    assert not second.acquire()
+    assert first.acquire()  # renewed by its holder
+
+
+def test_expired_lease_is_taken_over(leases):
+    first, second = leases('worker-1', duration=0.05), leases('worker-2')
+    assert first.acquire()
+    time.sleep(0.1)
+    assert second.acquire()
+    assert not first.acquire()
+
+
+def test_release_frees_the_lease(leases):
+    first, second = leases('worker-1'), leases('worker-2')
+    assert first.acquire()
+    second.release()  # not the holder: no effect
+    assert not second.acquire()
+    first.release()
+    assert second.acquire()
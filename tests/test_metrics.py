@@ -0,0 +1,32 @@
+# Request metrics: per-request SQL figures follow the same (endpoint, method)
+# rows as the latency they are reported next to
+
+import pytest
+from flask import Flask, request
+
+import metrics
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    metrics.init_app(app)
+
+    @app.route('/form', methods=['GET', 'POST'])
+    def form():
+        for _ in range(1 if request.method == 'GET' else 5):
+            metrics.record_query(0.001)
+        return 'ok'
+
+    return app.test_client()
+
+
+def test_sql_per_request_is_reported_per_method(client):
+    client.get('/form')
+    client.post('/form')
+    client.post('/form')
+
+    rows = {(row['endpoint'], row['method']): row for row in metrics.slowest_endpoints(limit=100)}
+    assert rows['form', 'GET']['requests'] == 1 and rows['form', 'GET']['sql_per_request'] == 1
+    assert rows['form', 'POST']['requests'] == 2 and rows['form', 'POST']['sql_per_request'] == 5
+    assert 'app_request_sql_queries_count{endpoint="form",method="POST"} 2' in metrics.render()
@@ -0,0 +1,27 @@
+# Data-preserving behaviour of the migrations
+
+import sqlite3
+
+from database import connect_db
+from migrate import MIGRATIONS_DIR, apply_migration, discover_migrations, ensure_version_table, migrate
+
+
+def test_chat_session_activity_keeps_empty_sessions(tmp_path):
+    database = str(tmp_path / 'sessions.db')
+    conn = connect_db(database)
+    conn.isolation_level = None
+    ensure_version_table(conn)
+    # Everything before 0006, then some sessions, one of them emptied by the old "clear"
+    for version, name, path in discover_migrations(MIGRATIONS_DIR):
+        if version < 6:
+            apply_migration(conn, version, name, path)
+    conn.execute("INSERT INTO chat_sessions (id, user_id, title) VALUES (1, 7, 'kept'), (2, 7, 'emptied')")
+    conn.execute("INSERT INTO chat_messages (user_id, session_id, message, response) VALUES (7, 1, 'q', 'a')")
+    conn.close()
+
+    migrate(database)
+
+    conn = sqlite3.connect(database)
+    rows = conn.execute('SELECT id, message_count FROM chat_sessions ORDER BY id').fetchall()
+    conn.close()
+    assert rows == [(1, 1), (2, 0)]
@@ -0,0 +1,31 @@
+# Every hot per-user query must be answered from an index on a freshly
+# migrated database: no full table SCAN, no temp B-tree for the ORDER BY.
+
+import pytest
+
+from database import connect_db
+from migrate import HOT_QUERIES, explain_query_plan, migrate
+
+
+@pytest.fixture(scope='module')
+def conn(tmp_path_factory):
+    database = str(tmp_path_factory.mktemp('plans') / 'plans.db')
+    assert migrate(database), 'no migrations were applied'
+    conn = connect_db(database)
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize('name', sorted(HOT_QUERIES))
+def test_hot_query_uses_index(conn, name):
+    plan = explain_query_plan(conn, HOT_QUERIES[name])
+    assert not any(step.startswith('SCAN') for step in plan), plan
+    assert not any('TEMP B-TREE' in step for step in plan), plan
+    assert any('USING INDEX' in step or 'USING COVERING INDEX' in step
+               or 'USING INTEGER PRIMARY KEY' in step for step in plan), plan
+
+
+def test_migrations_are_idempotent(tmp_path):
+    database = str(tmp_path / 'twice.db')
+    assert migrate(database)
+    assert migrate(database) == []
@@ -0,0 +1,27 @@
+# Importing the app must stay cheap: the heavy numeric libraries are loaded
+# on first use (chat model, career suggestions, video recommendations), not
+# by `import app`, so workers start serving at once
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ('numpy', 'scipy', 'sklearn')
+
+PROBE = '''
+import json, sys
+import app
+print(json.dumps([name for name in %r if name in sys.modules]))
+''' % (HEAVY_MODULES,)
+
+
+def test_import_app_leaves_numeric_libraries_unloaded(tmp_path):
+    # A fresh interpreter, in a scratch directory so the app's database.db is created there
+    env = dict(os.environ, PYTHONPATH=ROOT, CHAT_WARMUP='0', VIDEO_PREFETCH='0')
+    result = subprocess.run([sys.executable, '-c', PROBE], cwd=tmp_path, env=env,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr[-2000:]
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
@@ -0,0 +1,33 @@
+# TfidfModel.top_k ordering, including ties across the k-th place
+
+import numpy as np
+
+from tfidf_model import TfidfModel
+
+
+def model_with_scores(rows):
+    model = TfidfModel(None, None, [f'entry{i}' for i in range(len(rows[0]))], 'test')
+    model.scores = lambda texts: np.array(rows, dtype=np.float64)
+    return model
+
+
+def test_best_first():
+    indices, scores = model_with_scores([[0.1, 0.9, 0.5, 0.3]]).top_k(['q'], 2)
+    assert indices.tolist() == [[1, 2]]
+    assert scores.tolist() == [[0.9, 0.5]]
+
+
+def test_ties_at_the_cut_keep_the_earliest_entries():
+    rows = [[0.2] * 50 + [0.7], [0.0] * 51, [0.3, 0.1] * 25 + [0.3]]
+    indices, _ = model_with_scores(rows).top_k(['a', 'b', 'c'], 3)
+    assert indices.tolist() == [[50, 0, 1], [0, 1, 2], [0, 2, 4]]
+
+
+def test_ties_match_a_stable_full_sort():
+    rng = np.random.default_rng(5)
+    rows = rng.integers(0, 4, size=(200, 40)) / 4  # few distinct values: ties everywhere
+    model = model_with_scores(rows)
+    for k in (1, 3, 10, 39, 40, 60):
+        indices, _ = model.top_k(['q'] * len(rows), k)
+        expected = np.argsort(-rows, axis=1, kind='stable')[:, :min(k, rows.shape[1])]
+        assert indices.tolist() == expected.tolist()
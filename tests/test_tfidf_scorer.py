@@ -0,0 +1,68 @@
+# TfidfScorer must reproduce scikit-learn's TfidfVectorizer.transform, and
+# the chatbot model must warn when it has to fall back to fitting
+
+import logging
+
+import numpy as np
+import pytest
+
+import tfidf_model
+from knowledge_base import KNOWLEDGE_BASE
+
+sklearn_text = pytest.importorskip('sklearn.feature_extraction.text')
+
+
+def regression_queries(knowledge_base):
+    """Messages to compare against scikit-learn: keywords, answers and edge cases"""
+    queries = ['', '   ', 'a', 'the and of', 'C++ vs C#', 'MBBS!!! NEET??', 'ड्रॉइंग आर्टिस्ट',
+               'What is the salary of a data scientist in India?',
+               'how to become a doctor after 12th science',
+               'Career options after 10th: science, commerce or arts?']
+    for data in knowledge_base.values():
+        keywords = data.get('keywords', [])
+        queries.append(' '.join(keywords))
+        queries.extend(keywords[:3])
+        queries.append(data.get('en', '')[:300])
+        queries.append(data.get('en', '').upper()[:120])
+    return queries
+
+
+@pytest.fixture(scope='module')
+def models():
+    _, texts = tfidf_model.knowledge_corpus(KNOWLEDGE_BASE)
+    reference = sklearn_text.TfidfVectorizer(**tfidf_model.VECTORIZER_PARAMS).fit(texts)
+    return tfidf_model.fit(KNOWLEDGE_BASE), reference, texts
+
+
+def test_transform_matches_sklearn(models):
+    model, reference, _ = models
+    queries = regression_queries(KNOWLEDGE_BASE)
+    difference = model.vectorizer.transform(queries) - reference.transform(queries)
+    assert (abs(difference).max() if difference.nnz else 0.0) <= 1e-12
+
+
+def test_rankings_match_sklearn(models):
+    model, reference, texts = models
+    queries = regression_queries(KNOWLEDGE_BASE)
+    ours = (model.vectorizer.transform(queries) @ model.matrix.T).toarray()
+    theirs = (reference.transform(queries) @ reference.transform(texts).T).toarray()
+    assert (np.argsort(-ours, axis=1, kind='stable')[:, :5]
+            == np.argsort(-theirs, axis=1, kind='stable')[:, :5]).all()
+
+
+def test_saved_artifact_scores_like_the_fitted_model(models, tmp_path):
+    model = models[0]
+    tfidf_model.build(KNOWLEDGE_BASE, str(tmp_path))
+    loaded = tfidf_model.load(KNOWLEDGE_BASE, str(tmp_path))
+    queries = regression_queries(KNOWLEDGE_BASE)[:50]
+    assert loaded is not None
+    assert np.allclose(loaded.scores(queries), model.scores(queries), atol=1e-12)
+
+
+def test_missing_artifact_is_logged(monkeypatch, caplog):
+    monkeypatch.setattr(tfidf_model, '_model', None)
+    monkeypatch.setattr(tfidf_model, 'load', lambda knowledge_base: None)
+    monkeypatch.setattr(tfidf_model, 'fit', lambda knowledge_base: 'fitted')
+    with caplog.at_level(logging.WARNING, logger='tfidf_model'):
+        assert tfidf_model.get_model(KNOWLEDGE_BASE) == 'fitted'
+    assert 'python tfidf_model.py' in caplog.text
@@ -0,0 +1,68 @@
+# Locale catalogs merged over TRANSLATIONS, and the .mo reader checked
+# against the standard library's gettext
+
+import gettext
+import struct
+
+import pytest
+
+import translations
+
+
+def write_mo(path, messages, charset='UTF-8', byteorder='<'):
+    """Compile {msgid: text} into a .mo file (msgid '' is added as the header)"""
+    header = f'Content-Type: text/plain; charset={charset}\n'
+    entries = sorted([('', header)] + list(messages.items()))
+    ids = [key.encode(charset) for key, _ in entries]
+    strs = [text.encode(charset) for _, text in entries]
+    start = 7 * 4 + 16 * len(entries)
+    offsets = []
+    blob = b''
+    for value in ids + strs:
+        offsets.append((len(value), start + len(blob)))
+        blob += value + b'\0'
+    tables = b''.join(struct.pack(byteorder + '2I', *pair) for pair in offsets)
+    head = struct.pack(byteorder + '7I', 0x950412de, 0, len(entries), 28, 28 + 8 * len(entries), 0, 0)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(head + tables + blob)
+
+
+MESSAGES = {'welcome': 'स्वागत', 'login': 'लॉगिन', 'plural\0plurals': 'एक\0अनेक', 'menu\x04home': 'घर',
+            'quote': 'a "quoted"\nline'}
+
+
+@pytest.mark.parametrize('byteorder', ['<', '>'])
+def test_mo_catalog_matches_gettext(tmp_path, byteorder):
+    path = tmp_path / 'messages.mo'
+    write_mo(path, MESSAGES, byteorder=byteorder)
+    catalog = translations.load_mo_catalog(str(path))
+    assert catalog == {'welcome': 'स्वागत', 'login': 'लॉगिन', 'quote': 'a "quoted"\nline'}
+    with open(path, 'rb') as f:
+        reference = gettext.GNUTranslations(f)
+    assert all(reference.gettext(key) == text for key, text in catalog.items())
+
+
+def test_mo_catalog_honours_charset(tmp_path):
+    path = tmp_path / 'messages.mo'
+    write_mo(path, {'cafe': 'café'}, charset='latin-1')
+    assert translations.load_mo_catalog(str(path)) == {'cafe': 'café'}
+
+
+def test_not_a_mo_file(tmp_path):
+    path = tmp_path / 'messages.mo'
+    path.write_bytes(b'not a catalog at all')
+    with pytest.raises(ValueError):
+        translations.load_mo_catalog(str(path))
+
+
+def test_locale_files_merge_over_builtin_tables(tmp_path):
+    (tmp_path / 'mr.json').write_text('{"welcome": "नमस्कार"}', encoding='utf-8')
+    write_mo(tmp_path / 'ta' / 'LC_MESSAGES' / 'messages.mo', {'welcome': 'வணக்கம்'})
+    sources = translations.load_sources(translations.locale_files(str(tmp_path)))
+    tables = translations.compile_tables(sources)
+
+    assert tables['mr']['welcome'] == 'नमस्कार'
+    assert tables['ta']['welcome'] == 'வணக்கம்'
+    # Keys a language lacks fall back to English when the table is built
+    assert tables['ta']['login'] == translations.TRANSLATIONS['en']['login']
+    assert 'login' in translations.find_missing_keys(sources)['ta']
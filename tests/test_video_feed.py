@@ -0,0 +1,129 @@
+# CareerVideoFeed against a local stub API: stale-while-revalidate and
+# batched background refreshes
+
+import threading
+import time
+from concurrent.futures import wait
+
+import pytest
+
+from video_feed import CareerVideoFeed
+
+CAREERS = ['Data Scientist', 'Doctor / Medical Professional', 'Teacher / Educator']
+
+
+@pytest.fixture
+def feed(youtube):
+    feed = CareerVideoFeed(youtube, lambda: CAREERS, fresh_for=3600)
+    yield feed
+    feed._executor.shutdown(wait=True)
+
+
+def settle(feed):
+    while feed.stats()['pending']:
+        time.sleep(0.01)
+
+
+def test_cold_get_falls_back_and_queues_a_refresh(feed):
+    assert feed.get('Data Scientist') is None
+    settle(feed)
+    assert feed.stats()['refreshed'] == 1
+    assert len(feed.get('Data Scientist')) == 8
+
+
+def test_prefetch_refreshes_due_careers_in_one_batch(feed, youtube_api):
+    _, hits = youtube_api
+    wait(feed.prefetch())
+
+    assert feed.stats()['refreshed'] == len(CAREERS)
+    assert all(len(feed.get(career)) == 8 for career in CAREERS)
+    assert [path for path, _ in hits].count('/videos') == 1
+
+
+def test_cached_gets_make_no_api_calls(feed, youtube_api):
+    _, hits = youtube_api
+    wait(feed.prefetch())
+    calls = len(hits)
+    for _ in range(100):
+        feed.get('Doctor / Medical Professional')
+    assert len(hits) == calls
+
+
+def test_stale_list_is_served_then_refreshed(feed):
+    wait(feed.prefetch())
+    warm = feed.get('Data Scientist')
+    feed.fresh_for = 0  # everything is stale now
+
+    assert feed.get('Data Scientist') == warm
+    settle(feed)
+    assert feed.stats()['refreshed'] == len(CAREERS) + 1
+
+
+def test_scheduler_prefetches_only_while_holding_the_lease(youtube, youtube_api, write_queue, monkeypatch):
+    from database import Lease
+
+    _, hits = youtube_api
+    other = Lease('video-prefetch', 60, write_queue)
+    monkeypatch.setattr(other, 'owner', lambda: 'another-worker')
+    assert other.acquire()
+    feed = CareerVideoFeed(youtube, lambda: CAREERS, lease=Lease('video-prefetch', 60, write_queue))
+
+    feed.start(interval=0.05)
+    time.sleep(0.2)
+    assert feed.stats()['prefetch_runs'] == 0 and feed.stats()['prefetch_skipped'] >= 2
+    assert hits == []
+
+    other.release()
+    deadline = time.monotonic() + 5
+    while feed.stats()['refreshed'] < len(CAREERS) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    feed.stop()
+    feed._thread.join(5)  # releases the lease on its way out
+    assert feed.stats()['prefetch_runs'] >= 1
+    assert feed.stats()['refreshed'] == len(CAREERS)
+
+
+def test_get_many_fetches_missing_careers_together_within_the_deadline(feed, youtube, youtube_api):
+    server, hits = youtube_api
+    youtube.search('warm up')  # takes the stub's one 503
+    before = len(hits)
+    found = feed.get_many(CAREERS + ['slowpoke'], timeout=2)
+
+    # The held career was given up on at the deadline and left out
+    assert list(found) == CAREERS
+    assert [path for path, _ in hits[before:]].count('/videos') == 1
+    assert feed.stats()['refresh_failed'] == 1
+
+    # Once the API answers, the late career is refreshed in the background
+    server.hold.set()
+    settle(feed)
+    assert list(feed.get_many(CAREERS + ['slowpoke'], timeout=0)) == CAREERS + ['slowpoke']
+
+
+def test_get_many_serves_cached_lists_without_calls(feed, youtube_api):
+    _, hits = youtube_api
+    wait(feed.prefetch())
+    calls = len(hits)
+    assert list(feed.get_many(reversed(CAREERS))) == list(reversed(CAREERS))
+    assert len(hits) == calls
+
+
+def test_concurrent_starts_run_one_scheduler(youtube):
+    feed = CareerVideoFeed(youtube, lambda: [])
+    barrier = threading.Barrier(16)
+
+    def start():
+        barrier.wait()
+        feed.start(interval=60)
+
+    callers = [threading.Thread(target=start) for _ in range(16)]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join()
+    feed.stop()
+    for thread in threading.enumerate():
+        if thread.name == 'video-prefetch':
+            thread.join(5)
+    # Every scheduler thread runs once before its first wait
+    assert feed.stats()['prefetch_runs'] == 1
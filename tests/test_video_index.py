@@ -0,0 +1,106 @@
+# VideoIndex: BM25 ranking against a brute-force reference, and the JSON
+# pages of /api/recommend-videos
+
+import math
+import random
+
+import pytest
+
+from video_index import B, K1, POPULAR_COUNT, VideoIndex
+
+VIDEOS = [{'title': f'{topic} course {i}', 'video_id': f'{topic}-{i}', 'category': category,
+           'keywords': [topic]}
+          for i in range(6) for topic, category in (('python', 'programming'), ('figma', 'design'))]
+INTERESTS = {'coding': 'programming', 'figma': 'design'}
+
+
+@pytest.fixture(scope='module')
+def index():
+    return VideoIndex(VIDEOS, INTERESTS)
+
+
+@pytest.mark.parametrize('offset', [0, 2, 4, 10, 100])
+def test_category_is_the_best_match_on_every_page(index, offset):
+    page = index.recommend('python', 'figma', offset=offset, limit=2)
+    assert page['category'] == 'programming'
+    assert page['categories'] == ['design']
+
+
+def test_pages_continue_each_other(index):
+    pages = [index.recommend('python', 'figma', offset=offset, limit=5) for offset in (0, 5, 10)]
+    ids = [video['video_id'] for page in pages for video in page['videos']]
+    assert len(ids) == len(set(ids)) == pages[0]['total'] == 12
+    assert [page['next_offset'] for page in pages] == [5, 10, None]
+
+
+def brute_force(index, interest, skills):
+    """[(score, video position)] best first, scoring every video directly from its terms"""
+    documents = [index._terms(video) for video in index.videos]
+    lengths = [sum(terms.values()) for terms in documents]
+    average = sum(lengths) / len(lengths)
+    frequency = {}
+    for terms in documents:
+        for term in terms:
+            frequency[term] = frequency.get(term, 0) + 1
+    scores = []
+    for doc, terms in enumerate(documents):
+        score = 0.0
+        for term, weight in index.query_terms(interest, skills).items():
+            tf = terms.get(term, 0)
+            if tf:
+                idf = math.log(1 + (len(documents) - frequency[term] + 0.5) / (frequency[term] + 0.5))
+                score += weight * idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * lengths[doc] / average))
+        if score:
+            scores.append((-score, doc))
+    return [(-score, doc) for score, doc in sorted(scores)]
+
+
+@pytest.fixture(scope='module')
+def library():
+    """A few thousand generated videos over five categories, plus filler words"""
+    rng = random.Random(7)
+    keywords = {'programming': ['python', 'java', 'coding', 'algorithms'],
+                'data_science': ['machine learning', 'statistics', 'python', 'deep learning'],
+                'design': ['figma', 'ui', 'ux', 'user experience'],
+                'finance': ['investment', 'stocks', 'accounting', 'banking'],
+                'marketing': ['seo', 'social media', 'branding', 'digital marketing']}
+    filler = [f'word{i}' for i in range(500)]
+    videos = []
+    for i in range(3000):
+        category = rng.choice(list(keywords))
+        chosen = rng.sample(keywords[category], 2) + rng.sample(filler, 2)
+        videos.append({'title': f"{' '.join(rng.sample(chosen, 2))} course {i}",
+                       'video_id': f'v{i}', 'category': category, 'keywords': chosen})
+    interests = {'coding': 'programming', 'machine learning': 'data_science', 'ai': 'data_science',
+                 'figma': 'design', 'stocks': 'finance', 'social media': 'marketing'}
+    return VideoIndex(videos, interests)
+
+
+def ranking(page):
+    """Rounded so summation order can't reorder equal scores"""
+    return sorted((-round(score, 9), int(video['video_id'][1:])) for score, video in page)
+
+
+def expected(reference, start, end):
+    return sorted((-round(score, 9), doc) for score, doc in reference)[start:end]
+
+
+@pytest.mark.parametrize('query', [('machine learning', 'python'), ('I like coding and AI', ''),
+                                   ('figma', 'seo stocks'), ('word12 word400', '')])
+def test_pages_rank_like_brute_force(library, query):
+    reference = brute_force(library, *query)
+    first, total, _ = library.search(*query, offset=0, limit=20)
+    second, _, _ = library.search(*query, offset=20, limit=20)
+
+    assert total == len(reference)
+    assert ranking(first) == expected(reference, 0, 20)
+    assert ranking(second) == expected(reference, 20, 40)
+
+
+def test_interest_phrase_adds_its_category(library):
+    assert library.search('I like coding and AI')[2] == ['programming', 'data_science']
+
+
+def test_unknown_words_fall_back_to_popular_videos(library):
+    assert library.search('nothing here')[1] == 0
+    assert library.recommend('nothing here')['videos'] == library.videos[:POPULAR_COUNT]
@@ -0,0 +1,76 @@
+# WriteQueue failure handling: every future resolves and the writer keeps going
+
+import os
+import threading
+
+import pytest
+
+import database
+from database import WriteQueue
+
+
+class Abort(BaseException):
+    """A BaseException that isn't KeyboardInterrupt/SystemExit, so pytest isn't stopped by it"""
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = WriteQueue(str(tmp_path / 'writer.db'))
+    q.submit_call(lambda conn: conn.execute('CREATE TABLE t (v TEXT)')).result(5)
+    yield q
+    q.stop()
+
+
+def abort(conn):
+    raise Abort()
+
+
+def test_failing_job_only_fails_itself(queue):
+    bad = queue.submit('INSERT INTO missing (v) VALUES (?)', ('x',))
+    good = queue.submit('INSERT INTO t (v) VALUES (?)', ('y',))
+    with pytest.raises(Exception):
+        bad.result(5)
+    assert good.result(5) == 1
+
+
+def test_base_exception_fails_the_batch_and_writer_survives(queue):
+    blocker = threading.Event()
+    first = queue.submit_call(lambda conn: blocker.wait(5))
+    # Queued behind the blocker so they land in one batch with the aborting job
+    before = queue.submit('INSERT INTO t (v) VALUES (?)', ('a',))
+    aborted = queue.submit_call(abort)
+    after = queue.submit('INSERT INTO t (v) VALUES (?)', ('b',))
+    blocker.set()
+
+    for future in (first, before, after):
+        future.exception(5)  # resolved one way or the other, never left hanging
+    with pytest.raises(Abort):
+        aborted.result(5)
+
+    # The thread is still serving, on a fresh connection
+    assert queue.submit('INSERT INTO t (v) VALUES (?)', ('c',)).result(5)
+    assert queue.stats()['failed'] >= 1
+    assert 'Abort' in queue.stats()['last_error']
+
+
+def test_unopenable_database_fails_futures(tmp_path):
+    q = WriteQueue(str(tmp_path / 'no' / 'such' / 'dir.db'))
+    future = q.submit('INSERT INTO t (v) VALUES (?)', ('x',))
+    with pytest.raises(Exception):
+        future.result(5)
+    os.makedirs(tmp_path / 'no' / 'such')
+    q.submit_call(lambda conn: conn.execute('CREATE TABLE t (v TEXT)')).result(5)
+    assert q.submit('INSERT INTO t (v) VALUES (?)', ('y',)).result(5) == 1
+    q.stop()
+
+
+def test_blocking_write_times_out(queue, monkeypatch):
+    monkeypatch.setattr(database, 'writer', queue)
+    monkeypatch.setattr(database, 'WRITE_TIMEOUT', 0.1)
+    release = threading.Event()
+    queue.submit_call(lambda conn: release.wait(5))
+    try:
+        with pytest.raises(TimeoutError):
+            database.write('INSERT INTO t (v) VALUES (?)', ('late',))
+    finally:
+        release.set()
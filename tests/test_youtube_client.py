@@ -0,0 +1,99 @@
+# YouTubeClient against a local stub API: retries, caching, quota and
+# parallel searches
+
+import os
+import threading
+
+from youtube_client import SEARCH_COST, VIDEOS_COST, YouTubeCache
+
+
+def test_search_is_retried_then_cached(youtube, write_queue, youtube_api):
+    _, hits = youtube_api
+    first = youtube.search('Data Scientist career guide', max_results=8)
+    write_queue.flush()
+    again = youtube.search('  data scientist   CAREER guide')
+
+    assert [path for path, _ in hits] == ['/search', '/search']  # 503, then the retry
+    assert len(first) == 8
+    assert again == first
+
+
+def test_video_details_fetch_only_unseen_ids(youtube, write_queue, youtube_api):
+    _, hits = youtube_api
+    first = youtube.search('Data Scientist career guide')
+    details = youtube.video_details([video['video_id'] for video in first])
+    write_queue.flush()
+    subset = youtube.video_details(['data-3', 'data-1', 'x-60'])
+
+    assert [d['video_id'] for d in details] == [f'data-{i}' for i in range(8)]
+    assert details[0]['duration'] == '1:02:03'
+    assert hits[-1][1]['id'] == ['x-60']
+    assert [d['video_id'] for d in subset] == ['data-3', 'data-1', 'x-60']
+
+
+def test_quota_is_recorded_and_enforced(youtube, write_queue, youtube_api):
+    _, hits = youtube_api
+    youtube.daily_quota = 250
+    youtube.video_details([video['video_id'] for video in youtube.search('Data Scientist career guide')])
+    used = youtube.quota_used()  # before the writer has caught up
+    refused = youtube.search('another query')  # would take the day past 250 units
+    write_queue.flush()
+
+    # Both search attempts are charged, the 503 included
+    assert used == youtube.quota_used() == 2 * SEARCH_COST + VIDEOS_COST
+    assert refused is None and youtube.stats()['quota_refusals'] == 1
+    assert len(hits) == 3
+
+
+def test_concurrent_charges_never_overspend(youtube, write_queue):
+    cache = youtube.cache
+    release = threading.Event()
+    write_queue.submit_call(lambda conn: release.wait(5))  # nothing reaches the database yet
+    results = []
+
+    def charge():
+        results.append(cache.charge_quota(SEARCH_COST, limit=1000))
+
+    threads = [threading.Thread(target=charge) for _ in range(25)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results.count(True) == 10
+    assert cache.quota_used() == 1000
+
+    release.set()
+    write_queue.flush()
+    assert cache.quota_used() == 1000
+    assert not cache.charge_quota(1, limit=1000)
+
+
+def test_cache_connection_is_opened_per_process(write_queue, monkeypatch):
+    cache = YouTubeCache(write_queue.database, write_queue)
+    assert cache._conn is None  # nothing opened when the app module is imported
+    cache.quota_used()
+    parent = cache._conn
+
+    monkeypatch.setattr(os, 'getpid', lambda: -1)  # as seen from a forked worker
+    cache.quota_used()
+    assert cache._conn is not parent
+    cache.close()
+    monkeypatch.undo()
+    parent.execute('SELECT 1')  # the parent's connection was left alone
+    parent.close()
+
+
+def test_search_many_runs_in_parallel_within_the_deadline(youtube, youtube_api):
+    server, hits = youtube_api
+    youtube.search('warm up')  # takes the stub's one 503
+    # Answered only if the searches run side by side: one after the other
+    # they'd take 1.8s of the 1.2s the deadline leaves for searching
+    server.latency = 0.6
+    before = len(hits)
+    found = youtube.search_many(['alpha guide', 'beta guide', 'gamma guide', 'slow guide'],
+                                max_results=8, timeout=2.4)
+
+    # The held search was given up on at the deadline instead of waited for
+    assert sorted(found) == ['alpha guide', 'beta guide', 'gamma guide']
+    assert [path for path, _ in hits[before:]].count('/videos') == 1
+    assert [video['video_id'] for video in found['beta guide']] == [f'beta-{i}' for i in range(8)]
@@ -0,0 +1,219 @@
+# Persisted TF-IDF model for the chatbot's semantic matching
+# Build once per deploy:  python tfidf_model.py
+#
+# The fitted vocabulary, idf vector and knowledge base matrix are written to
+# models/tfidf/<hash>/, where <hash> covers the knowledge base text, the
+# vectorizer settings and ARTIFACT_VERSION. Workers load the arrays lazily
+# with numpy memory-mapping, so every process shares the same pages instead
+# of fitting (and holding) its own copy. If no artifact matches the current
+# knowledge base the model is fitted in memory as before, with a warning in
+# the log: every deploy should run the build step.
+#
+# Messages are scored with tfidf_scorer.TfidfScorer, which needs only
+# NumPy/SciPy; scikit-learn is used to fit the model (build, or fallback
+# when no artifact matches) and is never imported when an artifact exists.
+# All of these are imported on first use, not at import time, so workers
+# start serving pages (and health checks) right away; warm_up() loads the
+# model in a background thread ahead of the first chat.
+
+import hashlib
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Bump when the artifact layout or the way texts are built changes
+ARTIFACT_VERSION = 2
+
+ARTIFACT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'tfidf')
+
+VECTORIZER_PARAMS = {'stop_words': 'english', 'ngram_range': (1, 2)}
+
+# Characters of each English answer used alongside the keywords
+RESPONSE_CHARS = 500
+
+
+def knowledge_corpus(knowledge_base):
+    """Return (keys, texts) used to fit the model, in knowledge base order"""
+    keys = []
+    texts = []
+    for key, data in knowledge_base.items():
+        keywords_text = ' '.join(data.get('keywords', []))
+        response_text = data.get('en', '')[:RESPONSE_CHARS]
+        texts.append(keywords_text + ' ' + response_text)
+        keys.append(key)
+    return keys, texts
+
+
+def corpus_hash(keys, texts):
+    """Stable hash identifying the artifact for this corpus and configuration"""
+    payload = json.dumps({
+        'version': ARTIFACT_VERSION,
+        'params': VECTORIZER_PARAMS,
+        'keys': keys,
+        'texts': texts,
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class TfidfModel:
+    """Scorer plus the knowledge base matrix it was fitted on"""
+
+    def __init__(self, vectorizer, matrix, keys, fingerprint):
+        self.vectorizer = vectorizer
+        self.matrix = matrix
+        self.keys = keys
+        self.fingerprint = fingerprint
+
+    def transform(self, texts):
+        return self.vectorizer.transform(texts)
+
+    def scores(self, texts):
+        """Cosine similarity of each text against every knowledge base entry
+
+        Rows from the vectorizer and the stored matrix are already
+        L2-normalized, so one sparse product gives the cosines for all texts.
+        """
+        return (self.transform(texts) @ self.matrix.T).toarray()
+
+    def top_k(self, texts, k=5):
+        """Return (indices, scores) arrays of shape (len(texts), k), best first"""
+        import numpy as np
+
+        scores = self.scores(texts)
+        n_entries = scores.shape[1]
+        k = max(1, min(k, n_entries))
+        if k < n_entries:
+            candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            # argpartition picks arbitrarily among entries tied with the k-th
+            # score; in those rows keep every tied entry and take the earliest
+            kth = np.take_along_axis(scores, candidates, axis=1).min(axis=1)
+            for row in np.flatnonzero((scores >= kth[:, None]).sum(axis=1) > k):
+                tied = np.flatnonzero(scores[row] >= kth[row])
+                candidates[row] = tied[np.lexsort((tied, -scores[row, tied]))][:k]
+        else:
+            candidates = np.broadcast_to(np.arange(n_entries), scores.shape)
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+
+        # Highest score first; ties go to the earlier entry, like np.argmax
+        order = np.lexsort((candidates, -candidate_scores), axis=1)
+        indices = np.take_along_axis(candidates, order, axis=1)
+        return indices, np.take_along_axis(scores, indices, axis=1)
+
+
+def fit(knowledge_base):
+    """Fit a model in memory (needs scikit-learn)"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from tfidf_scorer import TfidfScorer
+
+    keys, texts = knowledge_corpus(knowledge_base)
+    vectorizer = TfidfVectorizer(**VECTORIZER_PARAMS)
+    matrix = vectorizer.fit_transform(texts).tocsr()
+    return TfidfModel(TfidfScorer.from_vectorizer(vectorizer), matrix, keys, corpus_hash(keys, texts))
+
+
+def build(knowledge_base, directory=ARTIFACT_DIR):
+    """Fit the model and write it to directory/<hash>/; returns that path"""
+    import numpy as np
+
+    model = fit(knowledge_base)
+    path = os.path.join(directory, model.fingerprint)
+    tmp_path = path + '.tmp'
+    os.makedirs(tmp_path, exist_ok=True)
+
+    matrix = model.matrix
+    np.save(os.path.join(tmp_path, 'data.npy'), matrix.data)
+    np.save(os.path.join(tmp_path, 'indices.npy'), matrix.indices)
+    np.save(os.path.join(tmp_path, 'indptr.npy'), matrix.indptr)
+    np.save(os.path.join(tmp_path, 'idf.npy'), model.vectorizer.idf)
+    with open(os.path.join(tmp_path, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': ARTIFACT_VERSION,
+            'fingerprint': model.fingerprint,
+            'params': VECTORIZER_PARAMS,
+            'shape': list(matrix.shape),
+            'keys': model.keys,
+            'vocabulary': {term: int(i) for term, i in model.vectorizer.vocabulary.items()},
+            'stop_words': sorted(model.vectorizer.stop_words),
+        }, f, ensure_ascii=False)
+
+    # Swap the finished directory into place so readers never see half of it
+    if os.path.isdir(path):
+        for name in os.listdir(path):
+            os.remove(os.path.join(path, name))
+        os.rmdir(path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load(knowledge_base, directory=ARTIFACT_DIR):
+    """Load the artifact matching knowledge_base, or None if there isn't one"""
+    import numpy as np
+    from scipy.sparse import csr_matrix
+    from tfidf_scorer import TfidfScorer
+
+    keys, texts = knowledge_corpus(knowledge_base)
+    fingerprint = corpus_hash(keys, texts)
+    path = os.path.join(directory, fingerprint)
+    meta_file = os.path.join(path, 'meta.json')
+    if not os.path.exists(meta_file):
+        return None
+
+    with open(meta_file, encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get('version') != ARTIFACT_VERSION or meta.get('fingerprint') != fingerprint:
+        return None
+
+    def array(name):
+        return np.load(os.path.join(path, name), mmap_mode='r')
+
+    matrix = csr_matrix((array('data.npy'), array('indices.npy'), array('indptr.npy')),
+                        shape=tuple(meta['shape']), copy=False)
+    vectorizer = TfidfScorer(meta['vocabulary'], array('idf.npy'), meta['stop_words'],
+                             VECTORIZER_PARAMS['ngram_range'])
+    return TfidfModel(vectorizer, matrix, meta['keys'], fingerprint)
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_model(knowledge_base):
+    """Return the shared model, loading (or fitting) it on first use"""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                model = load(knowledge_base)
+                if model is None:
+                    logger.warning('No TF-IDF artifact in %s matches the knowledge base; fitting with '
+                                   'scikit-learn in this process. Run "python tfidf_model.py" when deploying.',
+                                   ARTIFACT_DIR)
+                    model = fit(knowledge_base)
+                _model = model
+    return _model
+
+
+def is_loaded():
+    return _model is not None
+
+
+def warm_up(knowledge_base):
+    """Load the shared model in a background thread; returns the thread"""
+    def run():
+        try:
+            get_model(knowledge_base)
+        except Exception as e:
+            # The first chat request will retry and report the error
+            print(f"TF-IDF warm-up failed: {e}")
+
+    thread = threading.Thread(target=run, name='tfidf-warm-up', daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == '__main__':
+    from knowledge_base import KNOWLEDGE_BASE
+    print(f"Wrote {build(KNOWLEDGE_BASE)}")
@@ -0,0 +1,67 @@
+# Lightweight TF-IDF transform for the chatbot's serving path
+# Regression test against scikit-learn:  tests/test_tfidf_scorer.py
+#
+# Reproduces TfidfVectorizer.transform for the settings the chatbot uses
+# (lowercase, default token pattern, stop word list, word n-grams, raw
+# counts, smooth idf, L2 norm) with NumPy/SciPy only, from the vocabulary,
+# idf vector and stop words persisted in the model artifact. Workers can
+# then score messages without importing scikit-learn at all.
+
+import re
+from collections import Counter
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+# TfidfVectorizer's default token_pattern
+TOKEN_PATTERN = re.compile(r'(?u)\b\w\w+\b')
+
+
+class TfidfScorer:
+    """Drop-in replacement for a fitted TfidfVectorizer's transform()"""
+
+    def __init__(self, vocabulary, idf, stop_words=(), ngram_range=(1, 1)):
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.stop_words = frozenset(stop_words)
+        self.ngram_range = tuple(ngram_range)
+
+    @classmethod
+    def from_vectorizer(cls, vectorizer):
+        """Copy the fitted state out of a scikit-learn TfidfVectorizer"""
+        return cls(vectorizer.vocabulary_, vectorizer.idf_,
+                   vectorizer.get_stop_words() or (), vectorizer.ngram_range)
+
+    def analyze(self, text):
+        """Lowercase, tokenize, drop stop words and emit word n-grams"""
+        tokens = [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in self.stop_words]
+        min_n, max_n = self.ngram_range
+        terms = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), max_n + 1):
+            terms.extend(map(' '.join, zip(*(tokens[i:] for i in range(n)))))
+        return terms
+
+    def transform(self, texts):
+        """L2-normalized TF-IDF rows (CSR) for texts, one row per text"""
+        vocabulary = self.vocabulary
+        indptr = [0]
+        indices = []
+        counts = []
+        for text in texts:
+            row = sorted((vocabulary[term], count)
+                         for term, count in Counter(self.analyze(text)).items() if term in vocabulary)
+            indices.extend(column for column, _ in row)
+            counts.extend(count for _, count in row)
+            indptr.append(len(indices))
+
+        indices = np.asarray(indices, dtype=np.int32)
+        indptr = np.asarray(indptr, dtype=np.int32)
+        data = np.asarray(counts, dtype=np.float64) * self.idf[indices]
+
+        # Divide each row by its Euclidean norm; empty rows stay empty
+        rows = np.repeat(np.arange(len(texts)), np.diff(indptr))
+        norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=len(texts)))
+        norms[norms == 0] = 1
+        data /= norms[rows]
+
+        return csr_matrix((data, indices, indptr), shape=(len(texts), len(self.idf)))
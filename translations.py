@@ -1,6 +1,11 @@
 # Translation dictionary for English, Marathi, and Hindi
 # This file contains all text translations for the website
 
+import json
+import os
+import struct
+from types import MappingProxyType
+
 TRANSLATIONS = {
     'en': {
         # General
@@ -477,10 +482,128 @@ TRANSLATIONS = {
     }
 }
 
+# ==================== COMPILED TABLES ====================
+# Extra languages or updated texts can be added without code changes:
+#   locales/<lang>.json                      {"key": "text", ...}
+#   locales/<lang>/LC_MESSAGES/messages.mo   gettext catalog, msgid = key
+# Files are merged over TRANSLATIONS, then every language is merged over
+# English once, so a missing key already falls back to English when the
+# table is built instead of on each lookup. Tables are read-only mappings,
+# built once per process; edited files take effect on restart.
+
+DEFAULT_LANGUAGE = 'en'
+
+LOCALE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'locales')
+
+MO_DOMAIN = 'messages'
+
+# First word of a .mo file, as written on little- and big-endian machines
+MO_MAGIC = {0x950412de: '<', 0xde120495: '>'}
+
+
+def load_json_catalog(path):
+    """Read a {key: text} JSON catalog"""
+    with open(path, encoding='utf-8-sig') as f:
+        return {str(key): str(text) for key, text in json.load(f).items()}
+
+
+def load_mo_catalog(path):
+    """Read a compiled gettext catalog whose msgids are translation keys
+
+    The .mo layout is parsed directly: a header, then two tables of
+    (length, offset) pairs for the original and translated strings. The
+    empty msgid holds the header with the charset; plural entries (NUL in
+    the msgid) and msgctxt entries (EOT in the msgid) are skipped, as keys
+    never have either.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < 20:
+        raise ValueError(f'{path} is not a .mo file')
+    order = MO_MAGIC.get(struct.unpack('<I', data[:4])[0])
+    if order is None:
+        raise ValueError(f'{path} is not a .mo file')
+    _, count, originals, translated = struct.unpack(order + '4I', data[4:20])
+
+    def string(table, i):
+        length, offset = struct.unpack_from(order + '2I', data, table + 8 * i)
+        if offset + length > len(data):
+            raise ValueError(f'{path} is truncated')
+        return data[offset:offset + length]
+
+    entries = [(string(originals, i), string(translated, i)) for i in range(count)]
+    charset = 'utf-8'
+    for msgid, text in entries:
+        if not msgid:
+            for line in text.decode('ascii', 'replace').splitlines():
+                if line.lower().startswith('content-type:') and 'charset=' in line:
+                    charset = line.split('charset=', 1)[1].strip()
+    return {msgid.decode(charset): text.decode(charset) for msgid, text in entries
+            if msgid and b'\0' not in msgid and b'\x04' not in msgid}
+
+
+def locale_files(directory=LOCALE_DIR):
+    """Return [(lang, path)] for every catalog file, JSON before .mo"""
+    files = []
+    if not os.path.isdir(directory):
+        return files
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if name.endswith('.json'):
+            files.append((name[:-5], path))
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name, 'LC_MESSAGES', MO_DOMAIN + '.mo')
+        if os.path.isfile(path):
+            files.append((name, path))
+    return files
+
+
+def load_sources(files):
+    """TRANSLATIONS with every locale file merged over it, per language"""
+    sources = {lang: dict(texts) for lang, texts in TRANSLATIONS.items()}
+    for lang, path in files:
+        loader = load_json_catalog if path.endswith('.json') else load_mo_catalog
+        sources.setdefault(lang, {}).update(loader(path))
+    return sources
+
+
+def compile_tables(sources, default=DEFAULT_LANGUAGE):
+    """Per-language read-only tables with the default language filled in"""
+    base = sources[default]
+    return {lang: MappingProxyType({**base, **texts}) for lang, texts in sources.items()}
+
+
+def find_missing_keys(sources, default=DEFAULT_LANGUAGE):
+    """{lang: sorted keys present in the default language but not translated}"""
+    base = set(sources[default])
+    return {lang: sorted(base - set(texts)) for lang, texts in sources.items() if lang != default}
+
+
+_sources = load_sources(locale_files())
+_tables = compile_tables(_sources)
+_missing = find_missing_keys(_sources)
+
+
+def languages():
+    """Codes of every language with a table"""
+    return list(_tables)
+
+
+def missing_keys():
+    """Keys each language falls back to English for"""
+    return _missing
+
+
 def get_text(key, lang='en'):
     """Get translated text for a given key and language"""
-    return TRANSLATIONS.get(lang, TRANSLATIONS['en']).get(key, key)
+    return _tables.get(lang, _tables[DEFAULT_LANGUAGE]).get(key, key)
+
 
 def get_all_texts(lang='en'):
     """Get all translated texts for a given language"""
-    return TRANSLATIONS.get(lang, TRANSLATIONS['en'])
+    return _tables.get(lang, _tables[DEFAULT_LANGUAGE])
+
+
+if __name__ == '__main__':
+    for lang, keys in missing_keys().items():
+        print(f"{lang}: {len(keys)} missing" + (': ' + ', '.join(keys) if keys else ''))
@@ -0,0 +1,226 @@
+# Career video lists for /courses, kept warm in the background
+# Tests against a local stub API:  tests/test_video_feed.py
+#
+# Each career's list (a search plus the videos' details, via
+# youtube_client.py) is stored in youtube_cache under its own key. get()
+# answers from that cache at once, fresh or stale, and hands missing or
+# stale careers to a small background pool to refresh (stale-while-
+# revalidate), so a page view never waits on googleapis.com. get_many()
+# does the same for several careers but fetches the missing ones on the spot,
+# all in parallel and within a deadline the caller sets. start() adds a
+# scheduler thread that refreshes every known career before it goes stale;
+# given a database.Lease, only the process holding it prefetches, so N
+# gunicorn workers make one set of scheduled calls, not N.
+# Careers refreshed together go through YouTubeClient.search_many: their
+# searches run in parallel and their videos' details share one videos.list
+# call per 50 ids, all within REFRESH_TIMEOUT.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from youtube_client import SEARCH_COST, VIDEOS_COST
+
+# Search used for a career's videos
+QUERY = '{career} career guide tutorial'
+MAX_RESULTS = 8
+
+# Seconds before a career's list is refreshed
+FRESH_FOR = 12 * 3600
+
+# How often (seconds) the scheduler looks for careers to refresh
+PREFETCH_INTERVAL = 15 * 60
+
+# Seconds the prefetch lease lasts unless renewed: the holder renews it on
+# every run, and if its worker dies another takes over once it expires
+PREFETCH_LEASE = 2 * PREFETCH_INTERVAL
+
+# Quota units the scheduler leaves for on-demand refreshes each day
+QUOTA_RESERVE = 1000
+
+# Seconds a batch of refreshes may take; careers not answered by then are
+# left as they are and retried on the next get() or prefetch
+REFRESH_TIMEOUT = 20
+
+# Seconds get_many() may spend fetching careers with nothing cached
+REQUEST_TIMEOUT = 2.0
+
+# Background refreshes running at once
+WORKERS = 2
+
+
+class CareerVideoFeed:
+    """Per-career video lists served from cache and refreshed off the request path"""
+
+    def __init__(self, client, careers, fresh_for=FRESH_FOR, max_results=MAX_RESULTS, workers=WORKERS,
+                 refresh_timeout=REFRESH_TIMEOUT, lease=None):
+        self.client = client
+        self.careers = careers  # callable returning the career names to prefetch
+        self.lease = lease  # database.Lease shared by the processes running start(), or None
+        self.fresh_for = fresh_for
+        self.max_results = max_results
+        self.refresh_timeout = refresh_timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='video-refresh')
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._counts = {'fresh': 0, 'stale': 0, 'missing': 0, 'refreshed': 0, 'refresh_failed': 0,
+                        'prefetch_runs': 0, 'prefetch_skipped': 0}
+
+    def _key(self, career):
+        return f"career:{self.max_results}:{' '.join(career.lower().split())}"
+
+    def _count(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def _entry(self, career):
+        """(videos, fetched_at) from the cache, or None"""
+        key = self._key(career)
+        return self.client.cache.get_many([key]).get(key)
+
+    def get(self, career):
+        """Cached videos for career (possibly stale) or None; never calls the API itself"""
+        if not self.client.api_key or not self.client.cache:
+            return None
+
+        entry = self._entry(career)
+        if entry is None:
+            self._count('missing')
+            self.refresh_async([career])
+            return None
+        if time.time() - entry[1] >= self.fresh_for:
+            self._count('stale')
+            self.refresh_async([career])
+        else:
+            self._count('fresh')
+        return entry[0]
+
+    def get_many(self, careers, timeout=REQUEST_TIMEOUT):
+        """{career: videos} for careers, fetching those with nothing cached within timeout seconds
+
+        Cached lists are served as get() serves them. The missing careers'
+        searches run in parallel with their details merged, through
+        search_many, so the call takes about timeout seconds at most;
+        careers not answered by then are left out and refreshed in the
+        background instead.
+        """
+        if not self.client.api_key or not self.client.cache:
+            return {}
+
+        careers = list(dict.fromkeys(careers))
+        keys = {career: self._key(career) for career in careers}
+        entries = self.client.cache.get_many(list(keys.values()))
+        now = time.time()
+        found, stale, missing = {}, [], []
+        for career in careers:
+            entry = entries.get(keys[career])
+            if entry is None:
+                self._count('missing')
+                missing.append(career)
+                continue
+            found[career] = entry[0]
+            if now - entry[1] >= self.fresh_for:
+                self._count('stale')
+                stale.append(career)
+            else:
+                self._count('fresh')
+        if stale:
+            self.refresh_async(stale)
+
+        if missing:
+            fetched = self._fetch(missing, timeout)
+            found.update(fetched)
+            late = [career for career in missing if career not in fetched]
+            if late:
+                self.refresh_async(late)
+        return {career: found[career] for career in careers if career in found}
+
+    def refresh_async(self, careers):
+        """Queue one background refresh for the careers not already queued; returns its future or None"""
+        with self._lock:
+            careers = [c for c in dict.fromkeys(careers) if c not in self._pending]
+            if not careers:
+                return None
+            self._pending.update(careers)
+        return self._executor.submit(self._refresh, careers)
+
+    def _fetch(self, careers, timeout):
+        """Search careers together and cache their lists; returns {career: videos} for those answered"""
+        queries = {QUERY.format(career=career): career for career in careers}
+        try:
+            results = self.client.search_many(list(queries), max_results=self.max_results, timeout=timeout)
+        except Exception as e:
+            results = {}
+            print(f"Fetching videos for {len(careers)} careers failed: {e}")
+        lists = {queries[query]: videos for query, videos in results.items() if videos}
+        if lists:
+            self.client.cache.set_many({self._key(career): videos for career, videos in lists.items()})
+        with self._lock:
+            self._counts['refreshed'] += len(lists)
+            self._counts['refresh_failed'] += len(careers) - len(lists)
+        return lists
+
+    def _refresh(self, careers):
+        try:
+            self._fetch(careers, self.refresh_timeout)
+        finally:
+            with self._lock:
+                self._pending.difference_update(careers)
+
+    def prefetch(self):
+        """Queue one refresh for every career whose list is missing or stale; returns the futures"""
+        if not self.client.api_key or not self.client.cache:
+            return []
+        careers = list(self.careers())
+        keys = {career: self._key(career) for career in careers}
+        entries = self.client.cache.get_many(list(keys.values()))
+        now = time.time()
+        due = [c for c in careers if keys[c] not in entries or now - entries[keys[c]][1] >= self.fresh_for]
+
+        # Each career costs at most a search and its share of a videos.list call
+        affordable = (self.client.daily_quota - self.client.quota_used() - QUOTA_RESERVE) // (SEARCH_COST + VIDEOS_COST)
+        due = due[:max(affordable, 0)]
+        future = self.refresh_async(due) if due else None
+        return [future] if future is not None else []
+
+    def start(self, interval=PREFETCH_INTERVAL):
+        """Run prefetch() now and then every interval seconds in a daemon thread
+
+        With a lease, each run first takes or renews it and is skipped by
+        every process but the one holding it. Safe to call from every
+        request: only the first call starts the thread.
+        """
+        def run():
+            while True:
+                try:
+                    if self.lease is None or self.lease.acquire():
+                        self._count('prefetch_runs')
+                        self.prefetch()
+                    else:
+                        self._count('prefetch_skipped')
+                except Exception as e:
+                    print(f"Video prefetch failed: {e}")
+                if self._stop.wait(interval):
+                    break
+            if self.lease is not None:
+                try:
+                    self.lease.release()
+                except Exception as e:
+                    print(f"Releasing the video prefetch lease failed: {e}")
+
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=run, name='video-prefetch', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counts)
+            stats['pending'] = len(self._pending)
+        return stats
@@ -0,0 +1,181 @@
+# Ranked video recommendations for /api/recommend-videos
+# Tested against brute-force BM25:  tests/test_video_index.py
+#
+# Built once at startup from the video library and the interest -> category
+# map. Each video's title, keywords and category become terms (single words
+# plus multi-word keywords such as "machine learning" as one term), and each
+# term keeps a posting array of (video, precomputed BM25 weight). Interest
+# and skills phrases that name a category add that category as a term too.
+# A query then sums a handful of posting arrays with np.bincount and takes
+# the top of the page with a partial sort (np.partition), so its cost follows
+# the postings it touches rather than the size of the library.
+#
+# NumPy is imported and the postings built on the first query, not when the
+# app is imported, so workers keep their fast cold start (see tfidf_model.py).
+
+import math
+import re
+import threading
+
+# Words: letters and digits, so "data_science" and "UI/UX" split apart
+TOKEN_PATTERN = re.compile(r'[^\W_]+')
+
+# Words that carry no interest of their own ("I want to learn ...")
+STOP_WORDS = frozenset("""
+    a an and are as at be by for from how i in into is it learn like me my of on or the to want with
+    """.split())
+
+# Longest phrase (in words) looked up as a single term
+MAX_PHRASE = 3
+
+# BM25 term frequency saturation and length normalization
+K1 = 1.2
+B = 0.75
+
+# Query term weights by where the user typed them
+INTEREST_WEIGHT = 1.0
+SKILLS_WEIGHT = 0.5
+
+# Results per page, and the videos shown when nothing matches
+PAGE_SIZE = 12
+POPULAR_COUNT = 6
+
+CATEGORY_PREFIX = 'category:'
+
+
+def tokenize(text):
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def phrases(tokens, max_len=MAX_PHRASE):
+    """Every run of 1..max_len consecutive tokens, joined by spaces"""
+    for n in range(1, max_len + 1):
+        for start in range(len(tokens) - n + 1):
+            yield ' '.join(tokens[start:start + n])
+
+
+class VideoIndex:
+    """Inverted index over a video library with BM25 scoring"""
+
+    def __init__(self, videos, interest_categories, k1=K1, b=B):
+        self.videos = list(videos)
+        # Interest phrase -> category, with the phrase normalized like a query
+        self.interest_categories = {' '.join(tokenize(phrase)): category
+                                    for phrase, category in interest_categories.items()}
+        self.k1 = k1
+        self.b = b
+        self._postings = None
+        self._lock = threading.Lock()
+
+    @property
+    def postings(self):
+        """{term: (video positions, BM25 weights)}, built on first use"""
+        if self._postings is None:
+            with self._lock:
+                if self._postings is None:
+                    self._postings = self._build()
+        return self._postings
+
+    def _build(self):
+        import numpy as np
+
+        documents = [self._terms(video) for video in self.videos]
+        lengths = np.array([sum(terms.values()) for terms in documents], dtype=np.float64)
+        average = lengths.mean() if len(lengths) else 1.0
+
+        postings = {}
+        for doc, terms in enumerate(documents):
+            for term, tf in terms.items():
+                postings.setdefault(term, []).append((doc, tf))
+
+        count = len(self.videos)
+        k1, b = self.k1, self.b
+        built = {}
+        for term, entries in postings.items():
+            docs = np.array([doc for doc, _ in entries], dtype=np.int64)
+            tf = np.array([tf for _, tf in entries], dtype=np.float64)
+            idf = math.log(1 + (count - len(entries) + 0.5) / (len(entries) + 0.5))
+            weights = idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths[docs] / average))
+            built[term] = (docs, weights)
+        return built
+
+    @staticmethod
+    def _terms(video):
+        """{term: frequency} for one video"""
+        terms = {}
+        fields = [video.get('title', '')] + list(video.get('keywords', ()))
+        for text in fields:
+            for token in tokenize(text):
+                terms[token] = terms.get(token, 0) + 1
+        for keyword in video.get('keywords', ()):
+            words = tokenize(keyword)
+            if len(words) > 1:
+                phrase = ' '.join(words)
+                terms[phrase] = terms.get(phrase, 0) + 1
+        category = video.get('category')
+        if category:
+            for token in tokenize(category):
+                terms[token] = terms.get(token, 0) + 1
+            terms[CATEGORY_PREFIX + category] = 1
+        return terms
+
+    def query_terms(self, interest='', skills=''):
+        """{term: weight} for the indexed terms and categories the text mentions"""
+        weights = {}
+        for text, weight in ((skills, SKILLS_WEIGHT), (interest, INTEREST_WEIGHT)):
+            for phrase in phrases(tokenize(text or '')):
+                category = self.interest_categories.get(phrase)
+                candidates = [phrase] + ([CATEGORY_PREFIX + category] if category else [])
+                for term in candidates:
+                    if term in self.postings:
+                        weights[term] = max(weights.get(term, 0), weight)
+        return weights
+
+    def search(self, interest='', skills='', offset=0, limit=PAGE_SIZE):
+        """(page of (score, video) best first, total matching videos, matched categories)"""
+        import numpy as np
+        terms = self.query_terms(interest, skills)
+        categories = [term[len(CATEGORY_PREFIX):] for term in terms if term.startswith(CATEGORY_PREFIX)]
+        if not terms:
+            return [], 0, categories
+
+        docs = np.concatenate([self.postings[term][0] for term in terms])
+        weights = np.concatenate([self.postings[term][1] * weight for term, weight in terms.items()])
+        scores = np.bincount(docs, weights=weights, minlength=len(self.videos))
+        matched = np.flatnonzero(scores)
+        total = len(matched)
+
+        end = min(offset + limit, total)
+        if offset >= end:
+            return [], total, categories
+        candidates = matched
+        if end < total:
+            # Everything scoring at least the last place on the page, ties included
+            cutoff = -np.partition(-scores[matched], end - 1)[end - 1]
+            candidates = matched[scores[matched] >= cutoff]
+        # Best score first; equal scores keep library order
+        ranked = candidates[np.lexsort((candidates, -scores[candidates]))][offset:end]
+        return [(float(scores[doc]), self.videos[doc]) for doc in ranked], total, categories
+
+    def recommend(self, interest='', skills='', offset=0, limit=PAGE_SIZE):
+        """JSON-ready page of recommendations; popular videos when nothing matches"""
+        page, total, categories = self.search(interest, skills, offset, limit)
+        if not total:
+            popular = self.videos[:POPULAR_COUNT]
+            return {'videos': popular, 'category': 'general', 'categories': [], 'total': len(popular),
+                    'offset': 0, 'limit': limit, 'next_offset': None}
+
+        # The category of the best match, the same on every page, as the
+        # dashboard labels the cards with it
+        best = page if offset == 0 else self.search(interest, skills, 0, 1)[0]
+        next_offset = offset + limit if offset + limit < total else None
+        return {
+            'videos': [dict(video, score=round(score, 4)) for score, video in page],
+            'category': (best[0][1].get('category') if best else None)
+                        or (categories[0] if categories else 'general'),
+            'categories': categories,
+            'total': total,
+            'offset': offset,
+            'limit': limit,
+            'next_offset': next_offset,
+        }
@@ -0,0 +1,365 @@
+# YouTube Data API client for the course and video pages
+# Tests against a local stub API:  tests/test_youtube_client.py
+#
+# One pooled requests.Session (kept-alive HTTPS connections), bounded
+# retries with exponential backoff for connection errors, 429 and 5xx, and a
+# persistent cache in the app database (youtube_cache, migration 0007):
+# search results per query and video details per video id, each with a TTL,
+# so repeat page views cost neither a round trip nor quota. Quota units are
+# recorded per Pacific-time day in youtube_quota, and calls stop once the
+# daily budget is spent. A call claims its units in process memory before it
+# is made and the database is updated afterwards, so parallel calls can't
+# all pass the check on the same, not yet updated, total.
+
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from cache import LRUCache
+from database import DATABASE, connect_db, writer
+
+API_BASE_URL = 'https://www.googleapis.com/youtube/v3'
+
+# Quota units charged per call, and the default daily allowance of a project
+SEARCH_COST = 100
+VIDEOS_COST = 1
+DAILY_QUOTA = 10000
+
+# Seconds a cached search result / video's details stay fresh
+SEARCH_TTL = 6 * 3600
+DETAILS_TTL = 24 * 3600
+
+# Cached rows older than this are deleted (checked at most once a day)
+CACHE_MAX_AGE = 7 * 24 * 3600
+
+# Recently stored results also kept in process memory
+MEMORY_CACHE_SIZE = 512
+
+# videos.list accepts at most this many ids per call
+MAX_IDS_PER_CALL = 50
+
+# HTTP settings: kept-alive connections (also the number of calls made in
+# parallel), retries after the first attempt, backoff factor (seconds,
+# doubling per retry) and (connect, read) timeouts
+POOL_SIZE = 8
+RETRIES = 2
+BACKOFF = 0.5
+TIMEOUT = (3.05, 10)
+
+# The API's quota resets at midnight Pacific time
+try:
+    from zoneinfo import ZoneInfo
+    QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
+except Exception:  # no time zone database available
+    QUOTA_TIMEZONE = timezone(timedelta(hours=-8))
+
+
+def quota_day():
+    return datetime.now(QUOTA_TIMEZONE).strftime('%Y-%m-%d')
+
+
+def parse_youtube_duration(iso_duration):
+    """Parse YouTube ISO 8601 duration to human readable format"""
+    match = re.match(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?', iso_duration)
+    if not match:
+        return '0:00'
+
+    hours, minutes, seconds = (int(value) if value else 0 for value in match.groups())
+    if hours > 0:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+class YouTubeCache:
+    """API results and quota spend in SQLite
+
+    Reads use a private connection, with an in-memory LRU in front; writes
+    go through the database writer queue like every other write in the app,
+    so they never block a request. The connection is opened on first use
+    and again in each forked worker, never shared between processes.
+    """
+
+    def __init__(self, database=DATABASE, write_queue=writer, memory_size=MEMORY_CACHE_SIZE):
+        self.database = database
+        self._conn = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._writer = write_queue
+        self._memory = LRUCache(maxsize=memory_size)
+        self._pruned_at = 0
+        # Quota units charged by this process but not yet committed, per day
+        self._quota_lock = threading.Lock()
+        self._unsaved_quota = {}
+
+    def _execute(self, sql, params=()):
+        """Rows of a read on this process's own connection"""
+        with self._lock:
+            if self._pid != os.getpid():
+                # Opened before a fork, the parent's connection isn't ours to use (or close)
+                self._conn = connect_db(self.database)
+                self._pid = os.getpid()
+            return self._conn.execute(sql, params).fetchall()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = self._pid = None
+
+    def get_many(self, keys):
+        """{key: (value, fetched_at)} for those keys that are cached, fresh or not"""
+        found = {}
+        for key in keys:
+            entry = self._memory.get(key)
+            if entry is not None:
+                found[key] = entry
+        missing = [key for key in keys if key not in found]
+        if not missing:
+            return found
+
+        rows = self._execute('SELECT cache_key, response, fetched_at FROM youtube_cache WHERE cache_key IN (%s)'
+                             % ','.join('?' * len(missing)), missing)
+        for key, response, fetched_at in rows:
+            found[key] = (json.loads(response), fetched_at)
+            self._memory.set(key, found[key])
+        return found
+
+    def set_many(self, items):
+        """Store {key: value} as fetched now (in memory at once, on disk via the writer)"""
+        now = time.time()
+        for key, value in items.items():
+            self._memory.set(key, (value, now))
+        rows = [(key, json.dumps(value), now) for key, value in items.items()]
+        prune = now - self._pruned_at > 24 * 3600
+        if prune:
+            self._pruned_at = now
+
+        def store(conn):
+            conn.executemany('INSERT OR REPLACE INTO youtube_cache (cache_key, response, fetched_at) VALUES (?, ?, ?)', rows)
+            if prune:
+                conn.execute('DELETE FROM youtube_cache WHERE fetched_at < ?', (now - CACHE_MAX_AGE,))
+        return self._writer.submit_call(store)
+
+    def charge_quota(self, units, limit=None, calls=1):
+        """Add units to today's spend, unless that would take it past limit; True if charged
+
+        The units count in quota_used() at once and are added to
+        youtube_quota through the writer; the check and the charge happen
+        under one lock, so concurrent callers can't overspend between them.
+        """
+        day = quota_day()
+        with self._quota_lock:
+            if limit is not None and self._saved_quota(day) + self._unsaved_quota.get(day, 0) + units > limit:
+                return False
+            self._unsaved_quota[day] = self._unsaved_quota.get(day, 0) + units
+
+        def saved(future):
+            # Committed (or failed): either way no longer ours to count
+            with self._quota_lock:
+                left = self._unsaved_quota.pop(day, 0) - units
+                if left:
+                    self._unsaved_quota[day] = left
+
+        future = self._writer.submit('INSERT INTO youtube_quota (day, units, calls) VALUES (?, ?, ?) '
+                                     'ON CONFLICT(day) DO UPDATE SET units = units + excluded.units, '
+                                     'calls = calls + excluded.calls', (day, units, calls))
+        future.add_done_callback(saved)
+        return True
+
+    def _saved_quota(self, day):
+        rows = self._execute('SELECT units FROM youtube_quota WHERE day = ?', (day,))
+        return rows[0][0] if rows else 0
+
+    def quota_used(self, day=None):
+        """Units spent on day (today): committed by any process, plus this process's unsaved charges"""
+        day = day or quota_day()
+        with self._quota_lock:
+            return self._saved_quota(day) + self._unsaved_quota.get(day, 0)
+
+
+class YouTubeClient:
+    """search() and video_details() for the YouTube Data API v3, cached and quota-aware"""
+
+    def __init__(self, api_key='', base_url=API_BASE_URL, cache=None, daily_quota=DAILY_QUOTA,
+                 pool_size=POOL_SIZE, retries=RETRIES, timeout=TIMEOUT):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.cache = cache
+        self.daily_quota = daily_quota
+        self.timeout = timeout
+
+        retry = Retry(total=retries, backoff_factor=BACKOFF, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=frozenset(['GET']), raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Bounded like the connection pool, so parallel calls never queue for a socket
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='youtube')
+
+        self._counts = {'api_calls': 0, 'api_errors': 0, 'cache_hits': 0, 'cache_misses': 0, 'quota_refusals': 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counts[name] += amount
+
+    def quota_used(self):
+        return self.cache.quota_used() if self.cache else 0
+
+    def _call(self, resource, params, cost):
+        """GET one API resource; returns the decoded JSON, or None on any failure"""
+        if self.cache and not self.cache.charge_quota(cost, self.daily_quota):
+            self._count('quota_refusals')
+            print(f"YouTube API daily quota used up; skipping {resource} call")
+            return None
+
+        self._count('api_calls')
+        try:
+            response = self.session.get(f"{self.base_url}/{resource}", params=dict(params, key=self.api_key),
+                                        timeout=self.timeout)
+        except requests.RequestException as e:
+            # The units stay charged: a timed-out request may still have been answered
+            self._count('api_errors')
+            print(f"YouTube API Error: {str(e)}")
+            return None
+
+        # The API charges for every request it answers, failed or not,
+        # including the attempts that were retried after a 429/5xx
+        history = getattr(getattr(response.raw, 'retries', None), 'history', ())
+        retried = sum(1 for attempt in history if attempt.status is not None)
+        if self.cache and retried:
+            self.cache.charge_quota(cost * retried, calls=0)
+        if response.status_code != 200:
+            self._count('api_errors')
+            print(f"YouTube API Error: {response.status_code}")
+            return None
+        return response.json()
+
+    def _lookup(self, keys, ttl):
+        """Fresh cached values for keys, as {key: value}"""
+        if not self.cache:
+            return {}
+        now = time.time()
+        found = {key: value for key, (value, fetched_at) in self.cache.get_many(keys).items()
+                 if now - fetched_at < ttl}
+        self._count('cache_hits', len(found))
+        self._count('cache_misses', len(keys) - len(found))
+        return found
+
+    def search(self, query, max_results=8):
+        """Videos matching query as dicts (title, channel, video_id, description, thumbnail); None on failure"""
+        if not self.api_key:
+            return None
+
+        key = f"search:{max_results}:{' '.join(query.lower().split())}"
+        cached = self._lookup([key], SEARCH_TTL)
+        if key in cached:
+            return cached[key]
+
+        data = self._call('search', {'part': 'snippet', 'q': query, 'type': 'video', 'maxResults': max_results},
+                          SEARCH_COST)
+        if data is None:
+            return None
+
+        videos = []
+        for item in data.get('items', []):
+            snippet = item['snippet']
+            thumbnails = snippet['thumbnails']
+            videos.append({
+                'title': snippet['title'],
+                'channel': snippet['channelTitle'],
+                'video_id': item['id']['videoId'],
+                'description': snippet.get('description', '')[:100],
+                'thumbnail': thumbnails['high']['url'] if 'high' in thumbnails else thumbnails['medium']['url'],
+            })
+        if self.cache:
+            self.cache.set_many({key: videos})
+        return videos
+
+    def video_details(self, video_ids):
+        """Details (title, channel, video_id, duration, link) for video_ids, in the same order
+
+        Each video is cached on its own, so only ids not seen recently are
+        fetched, up to MAX_IDS_PER_CALL per videos.list call.
+        """
+        if not self.api_key or not video_ids:
+            return []
+
+        ids = list(dict.fromkeys(video_ids))
+        cached = self._lookup(['video:' + video_id for video_id in ids], DETAILS_TTL)
+        details = {key[len('video:'):]: value for key, value in cached.items()}
+        missing = [video_id for video_id in ids if video_id not in details]
+
+        for start in range(0, len(missing), MAX_IDS_PER_CALL):
+            batch = missing[start:start + MAX_IDS_PER_CALL]
+            data = self._call('videos', {'part': 'contentDetails,snippet', 'id': ','.join(batch)}, VIDEOS_COST)
+            if data is None:
+                continue
+            fetched = {}
+            for item in data.get('items', []):
+                snippet = item['snippet']
+                fetched[item['id']] = {
+                    'title': snippet['title'],
+                    'channel': snippet['channelTitle'],
+                    'video_id': item['id'],
+                    'duration': parse_youtube_duration(item['contentDetails'].get('duration', 'PT0M0S')),
+                    'link': f"https://www.youtube.com/watch?v={item['id']}",
+                }
+            details.update(fetched)
+            if self.cache and fetched:
+                self.cache.set_many({'video:' + video_id: value for video_id, value in fetched.items()})
+
+        return [details[video_id] for video_id in ids if video_id in details]
+
+    def search_many(self, queries, max_results=8, timeout=None):
+        """Search several queries in parallel and fetch all their videos' details together
+
+        Returns {query: [video details]} in each query's result order. The
+        video ids of every search are merged, so N queries cost one
+        videos.list call per MAX_IDS_PER_CALL ids instead of one per query.
+        timeout is the budget in seconds for the whole operation, half of it
+        for the searches and the rest for the details: queries not answered
+        in time are left out of the result (their calls finish in the
+        background and are cached for next time).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def remaining():
+            return None if deadline is None else max(deadline - time.monotonic(), 0)
+
+        searches = {self._executor.submit(self.search, query, max_results): query for query in dict.fromkeys(queries)}
+        done, _ = wait(searches, timeout=None if deadline is None else remaining() / 2)
+        found = {}
+        for future in done:
+            if future.exception() is not None:
+                print(f"YouTube search failed: {future.exception()}")
+            elif future.result():
+                found[searches[future]] = future.result()
+
+        ids = list(dict.fromkeys(video['video_id'] for videos in found.values() for video in videos))
+        batches = [self._executor.submit(self.video_details, ids[start:start + MAX_IDS_PER_CALL])
+                   for start in range(0, len(ids), MAX_IDS_PER_CALL)]
+        done, _ = wait(batches, timeout=remaining())
+        details = {}
+        for future in done:
+            if future.exception() is None:
+                details.update((video['video_id'], video) for video in future.result())
+
+        return {query: [details[video['video_id']] for video in videos if video['video_id'] in details]
+                for query, videos in found.items()}
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counts)
+        stats['quota_used_today'] = self.quota_used()
+        stats['daily_quota'] = self.daily_quota
+        return stats